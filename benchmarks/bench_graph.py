@@ -0,0 +1,162 @@
+"""Ingestion benchmarks for TaskGraph and GraphStore.
+
+Run with:
+    uv run python benchmarks/bench_graph.py
+    uv run python benchmarks/bench_graph.py --members 50000 --roots 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from stemtrace.core.events import TaskEvent, TaskState
+from stemtrace.core.graph import TaskGraph
+from stemtrace.server.store import GraphStore
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+_BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--members", type=int, default=50_000)
+    parser.add_argument("--roots", type=int, default=100_000)
+    return parser.parse_args()
+
+
+def wide_group_events(
+    members: int, *, parent_id: str | None = None
+) -> Iterator[TaskEvent]:
+    """Yield PENDING/STARTED/SUCCESS for every member of one wide group."""
+    for state_idx, state in enumerate(
+        (TaskState.PENDING, TaskState.STARTED, TaskState.SUCCESS)
+    ):
+        for idx in range(members):
+            yield TaskEvent(
+                task_id=f"member-{idx}",
+                name="bench.tasks.member",
+                state=state,
+                timestamp=_BASE_TIME
+                + timedelta(microseconds=state_idx * members + idx),
+                # PENDING (task_sent) doesn't know the parent; later events do.
+                parent_id=None if state == TaskState.PENDING else parent_id,
+                group_id="wide-group",
+            )
+
+
+def root_events(roots: int) -> Iterator[TaskEvent]:
+    """Yield one SUCCESS event for each of `roots` independent root tasks."""
+    for idx in range(roots):
+        yield TaskEvent(
+            task_id=f"root-{idx}",
+            name="bench.tasks.root",
+            state=TaskState.SUCCESS,
+            timestamp=_BASE_TIME + timedelta(microseconds=idx),
+        )
+
+
+def _timed(label: str, count: int, func: Callable[[], None]) -> None:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else float("inf")
+    print(f"{label:<44} {count:>9} events {elapsed:>9.3f}s {rate:>12,.0f} ev/s")
+
+
+def bench_wide_group(members: int) -> None:
+    """Fan-out group without a parent (GROUP node becomes a root)."""
+    events = list(wide_group_events(members))
+    graph = TaskGraph()
+
+    def run() -> None:
+        for event in events:
+            graph.add_event(event)
+
+    _timed(f"wide group ({members} members)", len(events), run)
+
+
+def bench_wide_group_with_parent(members: int) -> None:
+    """Fan-out group whose members learn their real parent on STARTED."""
+    parent = TaskEvent(
+        task_id="parent",
+        name="bench.tasks.parent",
+        state=TaskState.STARTED,
+        timestamp=_BASE_TIME,
+    )
+    events = [parent, *wide_group_events(members, parent_id="parent")]
+    graph = TaskGraph()
+
+    def run() -> None:
+        for event in events:
+            graph.add_event(event)
+
+    _timed(f"wide group under parent ({members} members)", len(events), run)
+
+
+def bench_many_roots(roots: int) -> None:
+    """Many independent roots in a bare graph."""
+    events = list(root_events(roots))
+    graph = TaskGraph()
+
+    def run() -> None:
+        for event in events:
+            graph.add_event(event)
+
+    _timed(f"independent roots ({roots})", len(events), run)
+
+
+def bench_many_roots_with_eviction(roots: int) -> None:
+    """Many independent roots through a store that keeps evicting."""
+    events = list(root_events(roots))
+    store = GraphStore(max_nodes=max(roots // 10, 1))
+
+    def run() -> None:
+        for event in events:
+            store.add_event(event)
+
+    _timed(f"roots with eviction (max_nodes={roots // 10})", len(events), run)
+
+
+def bench_bulk_build(members: int) -> None:
+    """Rebuild a graph (wide group plus plain roots) incrementally and in bulk."""
+    parent = TaskEvent(
+        task_id="parent",
+        name="bench.tasks.parent",
+        state=TaskState.STARTED,
+        timestamp=_BASE_TIME,
+    )
+    events = [
+        parent,
+        *wide_group_events(members, parent_id="parent"),
+        *root_events(members),
+    ]
+
+    def incremental() -> None:
+        graph = TaskGraph()
+        for event in events:
+            graph.add_event(event)
+
+    def bulk() -> None:
+        TaskGraph.from_events(events)
+
+    _timed("replay: add_event", len(events), incremental)
+    _timed("replay: TaskGraph.from_events", len(events), bulk)
+
+
+def main() -> None:
+    """Run all graph ingestion benchmarks and print a summary table."""
+    args = _parse_args()
+    bench_wide_group(args.members)
+    bench_wide_group_with_parent(args.members)
+    bench_many_roots(args.roots)
+    bench_many_roots_with_eviction(args.roots)
+    bench_bulk_build(args.members)
+
+
+if __name__ == "__main__":
+    main()
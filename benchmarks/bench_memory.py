@@ -0,0 +1,127 @@
+"""Memory and throughput benchmarks for the in-memory graph store.
+
+Reports bytes retained per node (via tracemalloc) next to the store's own
+estimate (GraphStore.estimated_bytes), and ingest events/sec.
+Events are generated lazily, the way a consumer deserializes them, so the
+figure covers everything the store keeps alive: nodes, events and strings.
+
+Run with:
+    uv run python benchmarks/bench_memory.py
+    uv run python benchmarks/bench_memory.py --tasks 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from stemtrace.core.events import TaskEvent, TaskState
+from stemtrace.server.store import GraphStore
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+_BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_LIFECYCLE = (TaskState.PENDING, TaskState.STARTED, TaskState.SUCCESS)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--tasks",
+        type=int,
+        nargs="+",
+        default=[100_000],
+        help="Task counts to benchmark (1M tasks needs several GB of RAM)",
+    )
+    parser.add_argument(
+        "--fanout",
+        type=int,
+        default=10,
+        help="Children per root workflow (0 for independent roots)",
+    )
+    return parser.parse_args()
+
+
+def workflow_events(tasks: int, fanout: int) -> Iterator[TaskEvent]:
+    """Yield a PENDING/STARTED/SUCCESS lifecycle for `tasks` tasks.
+
+    Every `fanout + 1` tasks form a workflow: one root and `fanout` children.
+    Each event gets its own copy of every string, like events deserialized
+    from a transport.
+    """
+    tick = 0
+    for idx in range(tasks):
+        workflow = idx // (fanout + 1)
+        is_root = idx % (fanout + 1) == 0
+        kind = "root" if is_root else "child"
+        for state in _LIFECYCLE:
+            tick += 1
+            root_id = f"{workflow:08d}-0000-4000-8000-000000000000"
+            task_id = (
+                root_id if is_root else f"{workflow:08d}-{idx:04d}-4000-8000-{idx:012d}"
+            )
+            yield TaskEvent(
+                task_id=task_id,
+                name=f"bench.tasks.{kind}",
+                state=state,
+                timestamp=_BASE_TIME + timedelta(microseconds=tick),
+                parent_id=None if is_root else root_id,
+                root_id=root_id,
+                args=[idx] if state == TaskState.PENDING else None,
+                result=idx if state == TaskState.SUCCESS else None,
+            )
+
+
+def measure_bytes_per_node(tasks: int, fanout: int) -> tuple[float, float]:
+    """Return (tracemalloc-measured, store-estimated) bytes per node."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        store = GraphStore(max_nodes=tasks * 2)
+        before, _ = tracemalloc.get_traced_memory()
+        for event in workflow_events(tasks, fanout):
+            store.add_event(event)
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    nodes = max(store.node_count, 1)
+    return (after - before) / nodes, store.estimated_bytes / nodes
+
+
+def measure_ingest_rate(tasks: int, fanout: int) -> tuple[int, float]:
+    """Return (event count, events/sec) for ingesting into a fresh store.
+
+    Only time spent in `add_event` is counted, not event generation.
+    """
+    store = GraphStore(max_nodes=tasks * 2)
+    gc.collect()
+    count = 0
+    elapsed = 0.0
+    for event in workflow_events(tasks, fanout):
+        start = time.perf_counter()
+        store.add_event(event)
+        elapsed += time.perf_counter() - start
+        count += 1
+    return count, count / elapsed if elapsed else float("inf")
+
+
+def main() -> None:
+    """Run memory/throughput benchmarks and print a summary."""
+    args = _parse_args()
+    for tasks in args.tasks:
+        events, rate = measure_ingest_rate(tasks, args.fanout)
+        print(f"tasks={tasks} events={events} fanout={args.fanout}")
+        measured, estimated = measure_bytes_per_node(tasks, args.fanout)
+        print(f"bytes/node       {measured:>12,.0f}")
+        print(f"estimated/node   {estimated:>12,.0f}")
+        print(f"ingest events/s  {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
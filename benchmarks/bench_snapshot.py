@@ -0,0 +1,80 @@
+"""Startup benchmark: replaying the transport vs restoring a store snapshot.
+
+Replay parses every event's JSON into a validated TaskEvent and applies it
+with ``GraphStore.add_event``, as the consumer does after a restart. Restore
+reads a snapshot file and rebuilds the store's indexes from its records.
+Also reports how long capturing a snapshot holds the store lock.
+
+Run with:
+    uv run python benchmarks/bench_snapshot.py
+    uv run python benchmarks/bench_snapshot.py --workflows 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from bench_sqlite_store import workflow_events
+
+from stemtrace.core.events import TaskEvent
+from stemtrace.server.snapshot import (
+    capture_snapshot,
+    read_snapshot,
+    restore_snapshot,
+    write_snapshot,
+)
+from stemtrace.server.store import GraphStore
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workflows", type=int, default=10_000)
+    parser.add_argument("--children", type=int, default=3)
+    return parser.parse_args()
+
+
+def _timed(label: str, start: float) -> float:
+    elapsed = time.perf_counter() - start
+    print(f"{label:<36} {elapsed * 1000:>10.1f} ms")
+    return elapsed
+
+
+def main() -> None:
+    """Build a store, snapshot it, and compare the two ways back."""
+    args = _parse_args()
+    events = workflow_events(args.workflows, args.children)
+    payloads = [event.model_dump_json() for event in events]
+    max_nodes = len(payloads)
+    print(f"{len(payloads)} events\n")
+
+    start = time.perf_counter()
+    store = GraphStore(max_nodes=max_nodes)
+    for payload in payloads:
+        store.add_event(TaskEvent.model_validate_json(payload))
+    replay = _timed("replay (validate + add_event)", start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "store.snapshot"
+        start = time.perf_counter()
+        snapshot = capture_snapshot(store, checkpoint="0-0")
+        _timed("capture (store lock held)", start)
+        start = time.perf_counter()
+        write_snapshot(snapshot, path)
+        _timed("write (lock not held)", start)
+        size = path.stat().st_size
+
+        start = time.perf_counter()
+        restored = GraphStore(max_nodes=max_nodes)
+        restore_snapshot(read_snapshot(path), restored)
+        restore = _timed("restore (read + rebuild indexes)", start)
+
+    assert restored.node_count == store.node_count
+    print(f"\nsnapshot size: {size / 1024**2:.1f} MiB")
+    print(f"restore speedup over replay: {replay / restore:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
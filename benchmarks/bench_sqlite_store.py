@@ -0,0 +1,125 @@
+"""Ingestion and read benchmarks: in-memory GraphStore vs SqliteGraphStore.
+
+The SQLite store keeps every workflow on disk and only --cache nodes in
+memory, so reads for old workflows are served from the database.
+
+Run with:
+    uv run python benchmarks/bench_sqlite_store.py
+    uv run python benchmarks/bench_sqlite_store.py --workflows 50000 --cache 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from stemtrace.core.events import TaskEvent, TaskState
+from stemtrace.server.sqlite_store import SqliteGraphStore
+from stemtrace.server.store import GraphStore
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+_BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+_NAMES = [f"bench.tasks.task_{idx}" for idx in range(20)]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workflows", type=int, default=20_000)
+    parser.add_argument("--children", type=int, default=3)
+    parser.add_argument("--cache", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+def workflow_events(workflows: int, children: int) -> list[TaskEvent]:
+    """STARTED/SUCCESS (every tenth FAILURE) for a root and its children."""
+    events = []
+    clock = 0
+    for wf in range(workflows):
+        root = f"wf-{wf}"
+        tasks = [(root, None), *((f"{root}-{c}", root) for c in range(children))]
+        for idx, (task_id, parent_id) in enumerate(tasks):
+            outcome = TaskState.FAILURE if (wf + idx) % 10 == 0 else TaskState.SUCCESS
+            for state in (TaskState.STARTED, outcome):
+                clock += 1
+                events.append(
+                    TaskEvent(
+                        task_id=task_id,
+                        name=_NAMES[(wf + idx) % len(_NAMES)],
+                        state=state,
+                        timestamp=_BASE_TIME + timedelta(milliseconds=clock),
+                        parent_id=parent_id,
+                        root_id=root,
+                    )
+                )
+    return events
+
+
+def _ingest(label: str, store: GraphStore, events: list[TaskEvent]) -> None:
+    start = time.perf_counter()
+    for event in events:
+        store.add_event(event)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<32} {len(events):>9} events {elapsed:>8.3f}s "
+        f"{len(events) / elapsed:>10,.0f} ev/s"
+    )
+
+
+def _read(label: str, repeat: int, calls: list[Callable[[], object]]) -> None:
+    cells = []
+    for call in calls:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            call()
+        cells.append(f"{(time.perf_counter() - start) / repeat * 1000:>10.2f}")
+    print(f"{label:<32} {' '.join(cells)}")
+
+
+def main() -> None:
+    """Ingest the same workload into both stores and time common reads."""
+    args = _parse_args()
+    events = workflow_events(args.workflows, args.children)
+    memory = GraphStore(max_nodes=len(events))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        disk = SqliteGraphStore(Path(tmp) / "bench.db", max_nodes=args.cache)
+        _ingest("GraphStore (everything)", memory, events)
+        _ingest(f"SqliteGraphStore (cache {args.cache})", disk, events)
+        disk.flush()
+
+        old_root = "wf-0"
+        old_child = f"{old_root}-0"
+        mid = _BASE_TIME + timedelta(milliseconds=len(events) // 2)
+        print(f"\n{'ms per call':<32} {'GraphStore':>10} {'SQLite':>10}")
+        stores: list[GraphStore] = [memory, disk]
+        queries: list[tuple[str, Callable[[GraphStore], object]]] = [
+            ("tasks: first page", lambda s: s.get_nodes(limit=100)),
+            ("tasks: page at offset 10000", lambda s: s.get_nodes(offset=10_000)),
+            ("tasks: state=FAILURE", lambda s: s.get_nodes(state=TaskState.FAILURE)),
+            ("tasks: name_contains", lambda s: s.get_nodes(name_contains="task_1")),
+            ("tasks: before (old cursor)", lambda s: s.get_nodes(before=(mid, ""))),
+            ("graphs: first page", lambda s: s.get_root_nodes()),
+            ("get_node (old task)", lambda s: s.get_node(old_child)),
+            ("get_graph_from_root (old)", lambda s: s.get_graph_from_root(old_root)),
+            ("task name stats", lambda s: s.get_task_name_stats()),
+        ]
+        for label, query in queries:
+            _read(
+                label,
+                args.repeat,
+                [lambda s=store, q=query: q(s) for store in stores],
+            )
+        disk.close()
+        size = sum(f.stat().st_size for f in Path(tmp).iterdir())
+        print(f"\ndatabase size: {size / 1024**2:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
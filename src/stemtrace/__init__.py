@@ -151,6 +151,16 @@ def init_app(
     prefix: str = "/stemtrace",
     ttl: int = 86400,
     max_nodes: int = 10000,
+    max_events_per_node: int | None = None,
+    compact_event_history: bool = False,
+    protect_active_workflows: bool = False,
+    max_memory_bytes: int | None = None,
+    retention_seconds: float | None = None,
+    payload_dir: str | None = None,
+    max_payload_bytes: int | None = None,
+    store_path: str | None = None,
+    snapshot_path: str | None = None,
+    snapshot_interval: float = 60.0,
     embedded_consumer: bool = True,
     serve_ui: bool = True,
     auth_dependency: Any = None,
@@ -171,6 +181,36 @@ def init_app(
         prefix: Mount path for stemtrace routes (default: "/stemtrace").
         ttl: Event TTL in seconds (default: 24 hours).
         max_nodes: Maximum number of nodes in memory store (default: 10000).
+        max_events_per_node: Cap on events kept per task node (minimum 3). None
+            (default) keeps the full history.
+        compact_event_history: Strip payloads from intermediate events, keeping
+            arguments on the first event that has them and results/exceptions
+            on terminal events (default: False).
+        protect_active_workflows: Keep workflows that still have unfinished
+            tasks when evicting; the store may then exceed max_nodes
+            (default: False).
+        max_memory_bytes: Memory budget for the in-memory store; the oldest
+            workflows are evicted when its estimated size exceeds it, and the
+            estimate is reported by /api/health (default: None, node count only).
+        retention_seconds: Drop workflows from the in-memory store once their
+            latest event is older than this; unlike ttl, which applies to the
+            transport (default: None, keep until capacity eviction).
+        payload_dir: Directory for append-only, memory-mapped segment files
+            holding event payloads (args, kwargs, results, tracebacks); nodes
+            keep only references, so resident memory follows the payloads
+            being viewed. Each process writes to its own subdirectory, which
+            is deleted on shutdown; payloads there do not survive a restart.
+            Not combinable with store_path (default: None).
+        max_payload_bytes: Drop the oldest payload segments once they hold
+            more than this; older events lose their payloads (default: None).
+        store_path: SQLite file keeping the full event history on disk; the
+            in-memory store then acts as a cache of recent workflows and
+            listings cover the whole history (default: None, memory only).
+        snapshot_path: File the embedded consumer periodically snapshots the
+            in-memory store to; on startup the store is restored from it and
+            the transport resumes after the snapshot instead of being
+            replayed. Not combinable with store_path (default: None).
+        snapshot_interval: Seconds between snapshots (default: 60).
         embedded_consumer: Run event consumer in FastAPI process (default: True).
         serve_ui: Serve React dashboard (default: True).
         auth_dependency: Optional FastAPI dependency for authentication.
@@ -236,6 +276,16 @@ def init_app(
         prefix=prefix,
         ttl=ttl,
         max_nodes=max_nodes,
+        max_events_per_node=max_events_per_node,
+        compact_event_history=compact_event_history,
+        protect_active_workflows=protect_active_workflows,
+        max_memory_bytes=max_memory_bytes,
+        retention_seconds=retention_seconds,
+        payload_dir=payload_dir,
+        max_payload_bytes=max_payload_bytes,
+        store_path=store_path,
+        snapshot_path=snapshot_path,
+        snapshot_interval=snapshot_interval,
         auth_dependency=auth_dependency,
         form_auth_config=form_auth_config,
         node_alias_from_arguments=node_alias_from_arguments,
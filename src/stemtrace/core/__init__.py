@@ -2,11 +2,12 @@
 
 from stemtrace.core.events import TaskEvent, TaskState
 from stemtrace.core.exceptions import ConfigurationError, StemtraceError
-from stemtrace.core.graph import NodeType, TaskGraph, TaskNode
+from stemtrace.core.graph import NodeType, OrderedIdSet, TaskGraph, TaskNode
 
 __all__ = [
     "ConfigurationError",
     "NodeType",
+    "OrderedIdSet",
     "StemtraceError",
     "TaskEvent",
     "TaskGraph",
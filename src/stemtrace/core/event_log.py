@@ -0,0 +1,555 @@
+"""Columnar storage for a task node's event history."""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, MutableSequence, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, ClassVar, Protocol, overload
+
+from pydantic_core import core_schema
+
+from stemtrace.core.events import TaskEvent, TaskState
+
+if TYPE_CHECKING:
+    from pydantic import GetCoreSchemaHandler
+
+# Fields most events leave empty; stored per row only when one is set.
+PAYLOAD_FIELDS = ("args", "kwargs", "result", "exception", "traceback")
+
+_STATES = tuple(TaskState)
+_STATE_CODES = {state: code for code, state in enumerate(_STATES)}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = _EPOCH.replace(tzinfo=None)
+
+# (task_id, name, parent_id, root_id, group_id, chord_id, chord_callback_id,
+#  trace_id, tzinfo) - identical for most events of a task, so rows share it.
+_Links = tuple[Any, ...]
+# Leading links fields holding a task name or ID, interned when stored.
+_INTERNED_LINKS = 7
+_Payload = tuple[Any, ...]
+
+# Per-row column cost: state (1) + timestamp (8) + retries (8) + payload size
+# (4) + links and payload pointers (16).
+_ROW_BYTES = 37
+# TaskEvent.retries is an unbounded int; the column holds signed 64-bit values.
+_RETRIES_MIN = -(2**63)
+_RETRIES_MAX = 2**63 - 1
+_LINKS_BYTES = sys.getsizeof((None,) * 9)
+_PAYLOAD_BYTES = sys.getsizeof((None,) * 5)
+
+# Payload nesting deeper than this is counted by its container size only.
+_MAX_SIZE_DEPTH = 8
+
+# CPython caches these ints, so payloads holding them share one object.
+_SMALL_INT_MIN = -5
+_SMALL_INT_MAX = 256
+
+
+class PayloadStore(Protocol):
+    """Keeps payloads moved out of event logs (see ``EventLog.spill_payload``)."""
+
+    def store_payload(self, payload: _Payload) -> SpilledPayload:
+        """Take a payload tuple and return a reference to it."""
+        ...
+
+    def load_payload(self, ref: SpilledPayload) -> _Payload | None:
+        """Return the referenced payload, or None if it has been dropped."""
+        ...
+
+
+class SpilledPayload:
+    """Reference to a payload held by a PayloadStore instead of an EventLog.
+
+    Keeps whether the payload has args/kwargs, so argument lookups (history
+    compaction, node aliases) don't have to load it. Pickles as the loaded
+    payload tuple, so pickled logs don't depend on the store.
+    """
+
+    __slots__ = ("has_arguments", "length", "offset", "segment", "store")
+
+    def __init__(
+        self,
+        store: PayloadStore,
+        segment: int,
+        offset: int,
+        length: int,
+        *,
+        has_arguments: bool,
+    ) -> None:
+        self.store = store
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+        self.has_arguments = has_arguments
+
+    def load(self) -> _Payload | None:
+        """Return the payload tuple, or None if its store dropped it."""
+        return self.store.load_payload(self)
+
+    def __repr__(self) -> str:
+        """Return a debug representation of the location."""
+        return (
+            f"{type(self).__name__}(segment={self.segment}, "
+            f"offset={self.offset}, length={self.length})"
+        )
+
+
+# Estimated size of a row's payload once spilled: the reference object.
+_SPILLED_BYTES = SpilledPayload.__basicsize__ + 16
+
+
+class EventLog(MutableSequence[TaskEvent]):
+    """Event history stored as parallel columns instead of TaskEvent models.
+
+    Each row keeps a state code, an epoch-microsecond timestamp and a retry
+    count in compact arrays, a reference to a links tuple (IDs, name and
+    tzinfo) shared with the previous row when equal, and a payload tuple that
+    is None for events without args/kwargs/result/exception/traceback. A row
+    costs roughly 30 bytes plus its payload, against ~1 KB for a TaskEvent.
+
+    Indexing rebuilds TaskEvent objects on demand. ``state()``,
+    ``timestamp()`` and ``timestamp_us()`` read a single column without
+    building the event.
+
+    ``nbytes`` is a running estimate of the memory the log holds: updated in
+    O(1) on append and ``clear_payload``, recounted from the columns on other
+    edits.
+    """
+
+    __slots__ = (
+        "_links",
+        "_nbytes",
+        "_payload_sizes",
+        "_payloads",
+        "_retries",
+        "_states",
+        "_timestamps",
+    )
+
+    __hash__: ClassVar[None]  # type: ignore[assignment]
+
+    def __init__(self, events: Iterable[TaskEvent] = ()) -> None:
+        self._states = bytearray()
+        self._timestamps = array("q")
+        self._retries = array("q")
+        self._links: list[_Links] = []
+        self._payloads: list[_Payload | SpilledPayload | None] = []
+        self._payload_sizes = array("I")
+        self._nbytes = 0
+        self.extend(events)
+
+    def __len__(self) -> int:
+        """Return the number of events."""
+        return len(self._states)
+
+    @overload
+    def __getitem__(self, index: int) -> TaskEvent: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[TaskEvent]: ...
+
+    def __getitem__(self, index: int | slice) -> TaskEvent | list[TaskEvent]:
+        """Rebuild the event (or list of events) at index."""
+        if isinstance(index, slice):
+            return [self._event(i) for i in range(*index.indices(len(self)))]
+        return self._event(self._row(index))
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        """Replace the event at an integer index."""
+        if isinstance(index, slice):
+            raise TypeError("EventLog does not support slice assignment")
+        row = self._row(index)
+        links, payload = self._split(value, neighbour=row - 1)
+        self._states[row] = _STATE_CODES[value.state]
+        self._timestamps[row] = epoch_us(value.timestamp)
+        self._retries[row] = _retry_count(value.retries)
+        self._links[row] = links
+        self._payloads[row] = payload
+        self._payload_sizes[row] = _payload_size(payload)
+        self._nbytes = self._count_bytes()
+
+    def __delitem__(self, index: int | slice) -> None:
+        """Delete the event(s) at index."""
+        del self._states[index]
+        del self._timestamps[index]
+        del self._retries[index]
+        del self._links[index]
+        del self._payloads[index]
+        del self._payload_sizes[index]
+        self._nbytes = self._count_bytes()
+
+    def __iter__(self) -> Iterator[TaskEvent]:
+        """Yield rebuilt events in order."""
+        for row in range(len(self)):
+            yield self._event(row)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare event-by-event with another EventLog, list or tuple."""
+        if isinstance(other, EventLog | list | tuple):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other, strict=True)
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Return a debug representation listing the events."""
+        return f"{type(self).__name__}({list(self)!r})"
+
+    def insert(self, index: int, value: TaskEvent) -> None:
+        """Insert an event before index."""
+        size = len(self)
+        row = max(size + index, 0) if index < 0 else min(index, size)
+        links, payload = self._split(value, neighbour=row - 1)
+        self._states.insert(row, _STATE_CODES[value.state])
+        self._timestamps.insert(row, epoch_us(value.timestamp))
+        self._retries.insert(row, _retry_count(value.retries))
+        self._links.insert(row, links)
+        self._payloads.insert(row, payload)
+        self._payload_sizes.insert(row, _payload_size(payload))
+        self._nbytes = self._count_bytes()
+
+    def append(self, value: TaskEvent) -> None:
+        """Append an event."""
+        links, payload = self._split(value, neighbour=len(self) - 1)
+        size = _payload_size(payload)
+        self._nbytes += _ROW_BYTES + size
+        if not self._links or links is not self._links[-1]:
+            self._nbytes += _LINKS_BYTES
+        self._states.append(_STATE_CODES[value.state])
+        self._timestamps.append(epoch_us(value.timestamp))
+        self._retries.append(_retry_count(value.retries))
+        self._links.append(links)
+        self._payloads.append(payload)
+        self._payload_sizes.append(size)
+
+    def extend(self, values: Iterable[TaskEvent]) -> None:
+        """Append events, building each column in one step instead of per row."""
+        previous = self._links[-1] if self._links else None
+        states = bytearray()
+        timestamps: list[int] = []
+        retries: list[int] = []
+        links_column: list[_Links] = []
+        payloads: list[_Payload | None] = []
+        sizes: list[int] = []
+        distinct_links = 0
+        for event in values:
+            links, payload = self._split(event)
+            if links == previous:
+                links = previous
+            else:
+                distinct_links += 1
+                links = previous = _intern_links(links)
+            states.append(_STATE_CODES[event.state])
+            timestamps.append(epoch_us(event.timestamp))
+            retries.append(_retry_count(event.retries))
+            links_column.append(links)
+            payloads.append(payload)
+            sizes.append(_payload_size(payload))
+        self._states += states
+        self._timestamps.fromlist(timestamps)
+        self._retries.fromlist(retries)
+        self._links += links_column
+        self._payloads += payloads
+        self._payload_sizes.fromlist(sizes)
+        self._nbytes += (
+            len(states) * _ROW_BYTES + distinct_links * _LINKS_BYTES + sum(sizes)
+        )
+
+    def clear(self) -> None:
+        """Remove all events."""
+        del self[:]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle the columns as raw bytes (native byte order).
+
+        Much faster than the generic per-slot state, which matters when a
+        whole store is written to a snapshot. Spilled payloads are loaded and
+        pickled inline.
+        """
+        payloads: Sequence[_Payload | SpilledPayload | None] = self._payloads
+        sizes = self._payload_sizes
+        nbytes = self._nbytes
+        if any(isinstance(payload, SpilledPayload) for payload in payloads):
+            loaded = [
+                payload.load() if isinstance(payload, SpilledPayload) else payload
+                for payload in payloads
+            ]
+            payloads = loaded
+            sizes = array("I", map(_payload_size, loaded))
+            nbytes += sum(sizes) - sum(self._payload_sizes)
+        return (
+            _unpickle_event_log,
+            (
+                bytes(self._states),
+                self._timestamps.tobytes(),
+                self._retries.tobytes(),
+                self._links,
+                payloads,
+                sizes.tobytes(),
+                nbytes,
+            ),
+        )
+
+    def copy(self) -> EventLog:
+        """Return an independent copy; columns are copied, row tuples shared."""
+        clone = EventLog.__new__(EventLog)
+        clone._states = self._states[:]
+        clone._timestamps = self._timestamps[:]
+        clone._retries = self._retries[:]
+        clone._links = self._links[:]
+        clone._payloads = self._payloads[:]
+        clone._payload_sizes = self._payload_sizes[:]
+        clone._nbytes = self._nbytes
+        return clone
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated bytes held by the log's columns, tuples and payloads."""
+        return self._nbytes
+
+    def state(self, index: int) -> TaskState:
+        """Return the state of the event at index."""
+        return _STATES[self._states[index]]
+
+    def timestamp_us(self, index: int) -> int:
+        """Return the event timestamp at index as microseconds since the epoch.
+
+        Naive timestamps are treated as UTC, so values are always comparable.
+        """
+        return self._timestamps[index]
+
+    def timestamp(self, index: int) -> datetime:
+        """Return the event timestamp at index, with its original tzinfo."""
+        return _from_epoch_us(self._timestamps[index], self._links[index][-1])
+
+    def has_arguments(self, index: int) -> bool:
+        """Return whether the event at index carries args or kwargs."""
+        payload = self._payloads[index]
+        if payload is None:
+            return False
+        if isinstance(payload, SpilledPayload):
+            return payload.has_arguments
+        return payload[0] is not None or payload[1] is not None
+
+    def has_payload(self, index: int) -> bool:
+        """Return whether the event at index carries any payload field."""
+        return self._payloads[index] is not None
+
+    def spill_payload(self, index: int, store: PayloadStore) -> None:
+        """Move the payload at index into store, keeping a reference.
+
+        No-op for rows without a payload or already spilled. The payload is
+        loaded from the store whenever the event is rebuilt.
+        """
+        payload = self._payloads[index]
+        if payload is None or isinstance(payload, SpilledPayload):
+            return
+        self._payloads[index] = store.store_payload(payload)
+        self._nbytes += _SPILLED_BYTES - self._payload_sizes[index]
+        self._payload_sizes[index] = _SPILLED_BYTES
+
+    def clear_payload(self, index: int) -> None:
+        """Drop the payload of the event at index, keeping state/timestamp/retries."""
+        self._payloads[index] = None
+        self._nbytes -= self._payload_sizes[index]
+        self._payload_sizes[index] = 0
+
+    def _count_bytes(self) -> int:
+        """Recompute ``nbytes`` from the columns (O(rows))."""
+        links = self._links
+        distinct_links = sum(
+            1
+            for row in range(len(links))
+            if row == 0 or links[row] is not links[row - 1]
+        )
+        return (
+            len(links) * _ROW_BYTES
+            + distinct_links * _LINKS_BYTES
+            + sum(self._payload_sizes)
+        )
+
+    def _row(self, index: int) -> int:
+        size = len(self)
+        row = index + size if index < 0 else index
+        if not 0 <= row < size:
+            raise IndexError("EventLog index out of range")
+        return row
+
+    def _split(
+        self, event: TaskEvent, *, neighbour: int | None = None
+    ) -> tuple[_Links, _Payload | None]:
+        """Links and payload of an event.
+
+        Links equal to those of row neighbour (-1: none) reuse its tuple;
+        others get their name and IDs interned. With neighbour None the
+        caller shares and interns them.
+        """
+        links = (
+            event.task_id,
+            event.name,
+            event.parent_id,
+            event.root_id,
+            event.group_id,
+            event.chord_id,
+            event.chord_callback_id,
+            event.trace_id,
+            event.timestamp.tzinfo,
+        )
+        if neighbour is not None:
+            if neighbour >= 0 and self._links[neighbour] == links:
+                links = self._links[neighbour]
+            else:
+                links = _intern_links(links)
+        args, kwargs, result = event.args, event.kwargs, event.result
+        exception, traceback = event.exception, event.traceback
+        if (
+            args is None
+            and kwargs is None
+            and result is None
+            and exception is None
+            and traceback is None
+        ):
+            return links, None
+        return links, (args, kwargs, result, exception, traceback)
+
+    def _event(self, row: int) -> TaskEvent:
+        (
+            task_id,
+            name,
+            parent_id,
+            root_id,
+            group_id,
+            chord_id,
+            chord_callback_id,
+            trace_id,
+            tz,
+        ) = self._links[row]
+        fields: dict[str, Any] = {}
+        payload = self._payloads[row]
+        if isinstance(payload, SpilledPayload):
+            payload = payload.load()
+        if payload is not None:
+            fields = {
+                key: value
+                for key, value in zip(PAYLOAD_FIELDS, payload, strict=True)
+                if value is not None
+            }
+        return TaskEvent(
+            task_id=task_id,
+            name=name,
+            state=_STATES[self._states[row]],
+            timestamp=_from_epoch_us(self._timestamps[row], tz),
+            parent_id=parent_id,
+            root_id=root_id,
+            group_id=group_id,
+            chord_id=chord_id,
+            chord_callback_id=chord_callback_id,
+            trace_id=trace_id,
+            retries=self._retries[row],
+            **fields,
+        )
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        """Validate from a list of events and serialize back to a list."""
+        events_schema = core_schema.list_schema(handler.generate_schema(TaskEvent))
+        from_list = core_schema.no_info_after_validator_function(cls, events_schema)
+        return core_schema.json_or_python_schema(
+            json_schema=from_list,
+            python_schema=core_schema.union_schema(
+                [core_schema.is_instance_schema(cls), from_list]
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                list, return_schema=events_schema
+            ),
+        )
+
+
+def intern_id(value: str | None) -> str | None:
+    """The interned copy of a task name or ID, so equal IDs share one string."""
+    return None if value is None else sys.intern(value)
+
+
+def _intern_links(links: _Links) -> _Links:
+    """Links with the task name and IDs interned."""
+    return (
+        *map(intern_id, links[:_INTERNED_LINKS]),
+        *links[_INTERNED_LINKS:],
+    )
+
+
+def epoch_us(value: datetime) -> int:
+    """Microseconds since the Unix epoch, treating naive datetimes as UTC."""
+    delta = value - (_NAIVE_EPOCH if value.tzinfo is None else _EPOCH)
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _retry_count(value: int) -> int:
+    """A retry count clamped to the range of the retries column."""
+    return min(max(value, _RETRIES_MIN), _RETRIES_MAX)
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate bytes held by a JSON-like value and everything it contains.
+
+    Sums ``sys.getsizeof`` over dicts, lists, tuples and sets recursively;
+    nesting beyond a fixed depth is counted by container size only. None,
+    booleans and small ints are process-wide singletons and count as zero.
+    """
+    if value is None or isinstance(value, bool):
+        return 0
+    if isinstance(value, int) and _SMALL_INT_MIN <= value <= _SMALL_INT_MAX:
+        return 0
+    size = sys.getsizeof(value)
+    if _depth >= _MAX_SIZE_DEPTH:
+        return size
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key, _depth + 1) + estimate_size(item, _depth + 1)
+    elif isinstance(value, list | tuple | set | frozenset):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    return size
+
+
+def _unpickle_event_log(
+    states: bytes,
+    timestamps: bytes,
+    retries: bytes,
+    links: list[_Links],
+    payloads: list[_Payload | SpilledPayload | None],
+    payload_sizes: bytes,
+    nbytes: int,
+) -> EventLog:
+    """Rebuild an EventLog pickled by ``EventLog.__reduce__``."""
+    log = EventLog.__new__(EventLog)
+    log._states = bytearray(states)
+    log._timestamps = array("q", timestamps)
+    log._retries = array("q", retries)
+    log._links = links
+    log._payloads = payloads
+    log._payload_sizes = array("I", payload_sizes)
+    log._nbytes = nbytes
+    return log
+
+
+def _payload_size(payload: _Payload | None) -> int:
+    """Estimated bytes of a payload tuple and its non-None fields."""
+    if payload is None:
+        return 0
+    return _PAYLOAD_BYTES + sum(
+        estimate_size(value) for value in payload if value is not None
+    )
+
+
+def _from_epoch_us(value: int, tz: Any) -> datetime:
+    """Inverse of ``epoch_us``: rebuild a datetime in the given tzinfo."""
+    if tz is None:
+        return _NAIVE_EPOCH + timedelta(microseconds=value)
+    utc = _EPOCH + timedelta(microseconds=value)
+    return utc if tz is timezone.utc else utc.astimezone(tz)
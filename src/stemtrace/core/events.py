@@ -20,6 +20,12 @@ class TaskState(str, Enum):
     RETRY = "RETRY"
 
 
+# States after which a task emits no further lifecycle events.
+TERMINAL_STATES: frozenset[TaskState] = frozenset(
+    {TaskState.SUCCESS, TaskState.FAILURE, TaskState.REVOKED, TaskState.REJECTED}
+)
+
+
 class WorkerEventType(str, Enum):
     """Worker lifecycle event types."""
 
@@ -125,6 +131,7 @@ class WorkerEvent(BaseModel):
 
 
 __all__ = [
+    "TERMINAL_STATES",
     "RegisteredTaskDefinition",
     "TaskEvent",
     "TaskState",
@@ -1,11 +1,23 @@
 """Task graph models for representing task execution flows."""
 
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from collections.abc import Collection, Iterable, Iterator, MutableSet
+from dataclasses import dataclass, field
 from enum import Enum
+from itertools import islice
+from typing import Any, ClassVar, TypeVar
 
-from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from pydantic import BaseModel, ConfigDict, Field, GetCoreSchemaHandler, PrivateAttr
+from pydantic_core import core_schema
 
+from stemtrace.core.event_log import EventLog, intern_id
 from stemtrace.core.events import TaskEvent, TaskState
 
+_K = TypeVar("_K")
+
 
 class NodeType(str, Enum):
     """Type of node in the task graph."""
@@ -15,6 +27,107 @@ class NodeType(str, Enum):
     CHORD = "CHORD"
 
 
+class OrderedIdSet(MutableSet[str]):
+    """Insertion-ordered set of node IDs, backed by a dict.
+
+    Membership, insertion and removal are O(1). Keeps the list surface the
+    graph used to expose (``append``, ``remove``, indexing, equality with
+    lists) and serializes as a plain list, so API payloads are unchanged.
+    """
+
+    __slots__ = ("_items",)
+
+    __hash__: ClassVar[None]  # type: ignore[assignment]
+
+    def __init__(self, items: Iterable[str] = ()) -> None:
+        self._items: dict[str, None] = dict.fromkeys(items)
+
+    def __contains__(self, item: object) -> bool:
+        """Return whether the ID is present."""
+        return item in self._items
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate IDs in insertion order."""
+        return iter(self._items)
+
+    def __reversed__(self) -> Iterator[str]:
+        """Iterate IDs in reverse insertion order."""
+        return reversed(self._items)
+
+    def __len__(self) -> int:
+        """Return the number of IDs."""
+        return len(self._items)
+
+    def __getitem__(self, index: int) -> str:
+        """Positional access (O(index); intended for first/last lookups)."""
+        size = len(self._items)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("OrderedIdSet index out of range")
+        if index == size - 1:
+            return next(reversed(self._items))
+        return next(islice(self._items, index, None))
+
+    def __eq__(self, other: object) -> bool:
+        """Order-sensitive comparison with another OrderedIdSet, list or tuple."""
+        if isinstance(other, OrderedIdSet):
+            return list(self._items) == list(other._items)
+        if isinstance(other, (list, tuple)):
+            return list(self._items) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        """Return a debug representation listing the IDs."""
+        return f"{type(self).__name__}({list(self._items)!r})"
+
+    def add(self, value: str) -> None:
+        """Add an ID (no-op if already present; keeps original position)."""
+        self._items[value] = None
+
+    def discard(self, value: str) -> None:
+        """Remove an ID if present."""
+        self._items.pop(value, None)
+
+    def append(self, value: str) -> None:
+        """List-compatible alias for ``add``."""
+        self._items[value] = None
+
+    def remove(self, value: str) -> None:
+        """Remove an ID. Raises ValueError if missing, like ``list.remove``."""
+        try:
+            del self._items[value]
+        except KeyError:
+            raise ValueError(f"{value!r} not in OrderedIdSet") from None
+
+    def clear(self) -> None:
+        """Remove all IDs."""
+        self._items.clear()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle as the list of IDs."""
+        return (OrderedIdSet, (list(self._items),))
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        """Validate from any list of strings and serialize back to a list."""
+        from_list = core_schema.no_info_after_validator_function(
+            cls, core_schema.list_schema(core_schema.str_schema())
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_list,
+            python_schema=core_schema.union_schema(
+                [core_schema.is_instance_schema(cls), from_list]
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                list,
+                return_schema=core_schema.list_schema(core_schema.str_schema()),
+            ),
+        )
+
+
 class TaskNode(BaseModel):
     """Mutable node in the task graph. Tracks event history and child relationships."""
 
@@ -28,57 +141,345 @@ class TaskNode(BaseModel):
     chord_id: str | None = None
     chord_callback_id: str | None = None
     events: list[TaskEvent] = Field(default_factory=list)
-    children: list[str] = Field(default_factory=list)
+    children: OrderedIdSet = Field(default_factory=OrderedIdSet)
     parent_id: str | None = None
+    root_id: str | None = None
+
+
+@dataclass(slots=True, eq=False)
+class NodeRecord:
+    """Internal mutable node stored in a TaskGraph.
+
+    Mirrors TaskNode's fields as a plain slotted object, so attribute writes
+    on the ingestion hot path skip Pydantic validation and per-instance model
+    overhead, and keeps its events in a columnar ``EventLog``. Convert with
+    ``to_model()`` wherever a node leaves the store.
+    """
+
+    task_id: str
+    name: str
+    state: TaskState
+    node_type: NodeType = NodeType.TASK
+    group_id: str | None = None
+    chord_id: str | None = None
+    chord_callback_id: str | None = None
+    events: EventLog = field(default_factory=EventLog)
+    children: OrderedIdSet = field(default_factory=OrderedIdSet)
+    parent_id: str | None = None
+    root_id: str | None = None
+
+    def to_model(self) -> TaskNode:
+        """Return a detached TaskNode snapshot of this record."""
+        return TaskNode.model_construct(
+            task_id=self.task_id,
+            name=self.name,
+            state=self.state,
+            node_type=self.node_type,
+            group_id=self.group_id,
+            chord_id=self.chord_id,
+            chord_callback_id=self.chord_callback_id,
+            events=list(self.events),
+            children=OrderedIdSet(self.children),
+            parent_id=self.parent_id,
+            root_id=self.root_id,
+        )
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle as constructor arguments (cheaper than the slots state)."""
+        return (
+            NodeRecord,
+            (
+                self.task_id,
+                self.name,
+                self.state,
+                self.node_type,
+                self.group_id,
+                self.chord_id,
+                self.chord_callback_id,
+                self.events,
+                self.children,
+                self.parent_id,
+                self.root_id,
+            ),
+        )
+
+    def copy(self) -> NodeRecord:
+        """Return a detached copy that later writes to this record won't touch.
+
+        Copying the columns is much cheaper than ``to_model()``, so readers
+        can copy under a lock and build models after releasing it.
+        """
+        return NodeRecord(
+            task_id=self.task_id,
+            name=self.name,
+            state=self.state,
+            node_type=self.node_type,
+            group_id=self.group_id,
+            chord_id=self.chord_id,
+            chord_callback_id=self.chord_callback_id,
+            events=self.events.copy(),
+            children=OrderedIdSet(self.children),
+            parent_id=self.parent_id,
+            root_id=self.root_id,
+        )
+
+    @classmethod
+    def from_model(cls, node: TaskNode) -> NodeRecord:
+        """Build a record from a (validated) TaskNode."""
+        return cls(
+            task_id=node.task_id,
+            name=node.name,
+            state=node.state,
+            node_type=node.node_type,
+            group_id=node.group_id,
+            chord_id=node.chord_id,
+            chord_callback_id=node.chord_callback_id,
+            events=EventLog(node.events),
+            children=OrderedIdSet(node.children),
+            parent_id=node.parent_id,
+            root_id=node.root_id,
+        )
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        """Validate and serialize records through the TaskNode schema."""
+        node_schema = handler.generate_schema(TaskNode)
+        from_model = core_schema.no_info_after_validator_function(
+            cls.from_model, node_schema
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_model,
+            python_schema=core_schema.union_schema(
+                [core_schema.is_instance_schema(cls), from_model]
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls.to_model, return_schema=node_schema
+            ),
+        )
+
+
+class _GroupAggregate:
+    """Member counters for one group, updated in O(1) per member transition.
+
+    ``states`` counts members per state. ``real_parents`` counts members per
+    parent_id, ignoring members with no parent or parented to the group's own
+    synthetic node (those don't know their real parent yet).
+    """
+
+    __slots__ = ("real_parents", "states")
+
+    def __init__(self) -> None:
+        self.states: Counter[TaskState] = Counter()
+        self.real_parents: Counter[str] = Counter()
+
+    def copy(self) -> _GroupAggregate:
+        """Return an independent copy of the counters."""
+        clone = _GroupAggregate()
+        clone.states = self.states.copy()
+        clone.real_parents = self.real_parents.copy()
+        return clone
 
 
 class TaskGraph(BaseModel):
     """DAG of task executions, built incrementally from events.
 
-    Parent-child linking only occurs when parent exists at child insertion time.
-    Out-of-order events won't back-link.
+    A child that arrives before its parent is parked in an orphan index
+    (parent_id -> child IDs) and linked in O(k) when the parent's first event
+    arrives, so the resulting structure doesn't depend on arrival order.
+
+    Tasks are also indexed by workflow (``root_id``), so a workflow's members
+    can be found without walking parent links. A task with no known parent
+    is only listed in ``root_ids`` while its workflow root is not in the graph.
 
     Synthetic nodes (GROUP, CHORD) are created when tasks share a group_id.
     """
 
     model_config = ConfigDict(validate_assignment=True)
 
-    nodes: dict[str, TaskNode] = Field(default_factory=dict)
-    root_ids: list[str] = Field(default_factory=list)
+    nodes: dict[str, NodeRecord] = Field(default_factory=dict)
+    root_ids: OrderedIdSet = Field(default_factory=OrderedIdSet)
 
     # Track which tasks belong to each group_id (private, not serialized)
-    _group_members: dict[str, list[str]] = PrivateAttr(default_factory=dict)
+    _group_members: dict[str, OrderedIdSet] = PrivateAttr(default_factory=dict)
+    # Reverse membership index: task_id -> group_ids it is a member of
+    _member_of: dict[str, list[str]] = PrivateAttr(default_factory=dict)
+    # Per-group member counters backing the aggregate GROUP/CHORD state
+    _group_stats: dict[str, _GroupAggregate] = PrivateAttr(default_factory=dict)
+    # Chord callback task_id -> synthetic CHORD node id waiting for it
+    _chord_callbacks: dict[str, str] = PrivateAttr(default_factory=dict)
+    # Workflow index: root_id -> task_ids carrying that root_id
+    _workflows: dict[str, OrderedIdSet] = PrivateAttr(default_factory=dict)
+    # Orphan index: missing parent_id -> child ids waiting for it
+    _orphans: dict[str, OrderedIdSet] = PrivateAttr(default_factory=dict)
+
+    @classmethod
+    def from_events(cls, events: Iterable[TaskEvent]) -> TaskGraph:
+        """Build a graph from a batch of events in two passes.
+
+        The node pass groups the events by task and builds every record with
+        its complete event history at once. The linking pass then walks the
+        batch in arrival order, but only events that can change the graph's
+        links (a new parent, root, group or chord, group membership, a
+        pending chord callback) go through the ``add_event`` logic; the rest
+        only move their node's state. GROUP/CHORD placement depends on the
+        order members arrive in, so replaying the linking events in order is
+        what keeps the result identical to calling ``add_event`` for each
+        event, at a fraction of the cost.
+
+        Args:
+            events: Events in arrival order.
+
+        Returns:
+            A new graph, equal to one built incrementally from the same events.
+        """
+        events = list(events)
+        buckets: dict[str, list[TaskEvent]] = {}
+        for event in events:
+            bucket = buckets.get(event.task_id)
+            if bucket is None:
+                buckets[event.task_id] = [event]
+            else:
+                bucket.append(event)
+        records: dict[str, NodeRecord] = {}
+        for task_id, bucket in buckets.items():
+            first = bucket[0]
+            records[task_id] = NodeRecord(
+                task_id=sys.intern(task_id),
+                name=sys.intern(first.name),
+                state=first.state,
+                parent_id=intern_id(first.parent_id),
+                group_id=intern_id(first.group_id),
+                chord_id=intern_id(first.chord_id),
+                events=EventLog(bucket),
+            )
 
-    def add_event(self, event: TaskEvent) -> None:
+        graph = cls()
+        # Bound once: each private attribute lookup on a model costs ~2 us.
+        nodes = graph.nodes
+        root_ids = graph.root_ids
+        member_of = graph._member_of
+        chord_callbacks = graph._chord_callbacks
+        orphans = graph._orphans
+        workflows = graph._workflows
+        for event in events:
+            task_id = event.task_id
+            node = nodes.get(task_id)
+            if node is None:
+                node = records[task_id]
+                if (
+                    event.group_id is None
+                    and event.chord_id is None
+                    and task_id not in chord_callbacks
+                    and task_id not in orphans
+                    and task_id not in workflows
+                ):
+                    # A plain task nothing waits for: of _insert_node and
+                    # _apply_event, only the parent and root links apply.
+                    task_id = node.task_id
+                    nodes[task_id] = node
+                    if node.parent_id is None:
+                        root_ids.add(task_id)
+                    else:
+                        graph._link_child(node.parent_id, task_id)
+                    if event.root_id is not None:
+                        graph._set_root(node, event.root_id)
+                    continue
+                graph._insert_node(node)
+            elif task_id not in chord_callbacks and not _changes_links(
+                node, event, nodes, member_of
+            ):
+                if task_id in member_of:
+                    graph._set_state(node, event.state)
+                else:
+                    node.state = event.state
+                continue
+            graph._apply_event(node, event)
+        return graph
+
+    def add_event(self, event: TaskEvent) -> bool:
         """Add event, creating node if needed. Links child to parent if parent exists.
 
         Also tracks group membership and creates synthetic GROUP/CHORD nodes.
+
+        Returns:
+            Whether the event may have relinked nodes other than placing its
+            own: a GROUP/CHORD container created or upgraded, waiting
+            children or workflow members adopted, a parent, root or group
+            replaced. False when it only moved an existing node's state or
+            added a node under its parent or root (or as a root).
         """
-        if event.task_id not in self.nodes:
-            self.nodes[event.task_id] = TaskNode(
-                task_id=event.task_id,
-                name=event.name,
+        nodes = self.nodes
+        root_ids = self.root_ids
+        node_count, root_count = len(nodes), len(root_ids)
+        node = nodes.get(event.task_id)
+        links = None
+        adopted = False
+        if node is None:
+            # Names and IDs are interned, so the many references to a task
+            # (events, children, indexes) share one string.
+            node = NodeRecord(
+                task_id=sys.intern(event.task_id),
+                name=sys.intern(event.name),
                 state=event.state,
-                parent_id=event.parent_id,
-                group_id=event.group_id,
-                chord_id=event.chord_id,
+                parent_id=intern_id(event.parent_id),
+                group_id=intern_id(event.group_id),
+                chord_id=intern_id(event.chord_id),
             )
-            if event.parent_id is None:
-                self.root_ids.append(event.task_id)
-            elif event.parent_id in self.nodes:
-                self.nodes[event.parent_id].children.append(event.task_id)
-
-        node = self.nodes[event.task_id]
+            adopted = self._insert_node(node)
+        else:
+            links = (node.parent_id, node.root_id, node.group_id)
         node.events.append(event)
-        node.state = event.state
+        self._apply_event(node, event)
+        if adopted or event.chord_callback_id is not None:
+            return True
+        if links is None:
+            return len(nodes) != node_count + 1 or len(root_ids) != root_count + (
+                node.task_id in root_ids
+            )
+        return (
+            len(nodes) != node_count
+            or len(root_ids) != root_count
+            or links != (node.parent_id, node.root_id, node.group_id)
+        )
+
+    def _insert_node(self, node: NodeRecord) -> bool:
+        """Add a task's new record and link it to its parent and waiting children.
+
+        Returns:
+            Whether tasks waiting for it (as parent or root) were adopted.
+        """
+        task_id = node.task_id
+        self.nodes[task_id] = node
+        if node.parent_id is None:
+            self.root_ids.add(task_id)
+        else:
+            self._link_child(node.parent_id, task_id)
+        adopted = False
+        if task_id in self._orphans:
+            self._adopt_orphans(task_id)
+            adopted = True
+        if task_id in self._workflows:
+            # A workflow root arriving after its members: adopt them.
+            self._place_workflow_members(task_id, as_roots=False)
+            adopted = True
+        return adopted
+
+    def _apply_event(self, node: NodeRecord, event: TaskEvent) -> None:
+        """Apply an event's state and links to its task's record."""
+        self._set_state(node, event.state)
+
+        if node.root_id is None and event.root_id is not None:
+            self._set_root(node, event.root_id)
 
         # Update group_id if we didn't have it before
         if node.group_id is None and event.group_id is not None:
-            node.group_id = event.group_id
+            node.group_id = sys.intern(event.group_id)
 
         # Update chord_id if we didn't have it before
         if node.chord_id is None and event.chord_id is not None:
-            node.chord_id = event.chord_id
+            node.chord_id = sys.intern(event.chord_id)
 
         # Update parent_id if we didn't have it before (PENDING lacks parent_id)
         # Also update if current parent is a group node but event has a different parent
@@ -92,11 +493,12 @@ class TaskGraph(BaseModel):
             and node.parent_id != event.parent_id
         )
 
-        if should_update_parent:
+        task_id = node.task_id
+        if should_update_parent and event.parent_id is not None:
             old_parent = node.parent_id
-            node.parent_id = event.parent_id
-            if event.task_id in self.root_ids:
-                self.root_ids.remove(event.task_id)
+            parent_id = sys.intern(event.parent_id)
+            self._set_parent(node, parent_id)
+            self.root_ids.discard(task_id)
 
             # Remove from old parent's children if it was a group node
             if (
@@ -105,71 +507,183 @@ class TaskGraph(BaseModel):
                 and old_parent in self.nodes
             ):
                 old_group = self.nodes[old_parent]
-                if event.task_id in old_group.children:
-                    old_group.children.remove(event.task_id)
+                old_group.children.discard(task_id)
 
-            # Add to new parent's children
-            if event.parent_id in self.nodes:
-                parent = self.nodes[event.parent_id]
-                if event.task_id not in parent.children:
-                    parent.children.append(event.task_id)
+            # Add to new parent's children (or wait for the parent to arrive)
+            self._link_child(parent_id, task_id)
 
             # Check if this task is a group member and if group needs parent update
             if node.group_id is not None:
-                group_node_id = f"group:{node.group_id}"
-                if group_node_id in self.nodes:
-                    group_node = self.nodes[group_node_id]
-                    members = self._group_members.get(node.group_id, [])
-                    # Collect real parents of all members (skip group_node_id and None)
-                    # After updating this member, check if all members now share a common real parent
-                    member_real_parents: set[str | None] = set()
-                    for member_id in members:
-                        if member_id in self.nodes:
-                            member = self.nodes[member_id]
-                            # If member's parent is the group node, it doesn't have a real parent yet
-                            # Otherwise, use its current parent_id (which is the real parent)
-                            if (
-                                member.parent_id != group_node_id
-                                and member.parent_id is not None
-                            ):
-                                member_real_parents.add(member.parent_id)
-
-                    # If all members share the same real parent, update group
-                    if (
-                        len(member_real_parents) == 1
-                        and None not in member_real_parents
-                    ):
-                        common_parent = member_real_parents.pop()
-                        if (
-                            common_parent != group_node_id
-                            and group_node.parent_id != common_parent
-                        ):
-                            # Update group node's parent
-                            group_node.parent_id = common_parent
-                            # Remove group from root_ids if it was there
-                            if group_node_id in self.root_ids:
-                                self.root_ids.remove(group_node_id)
-                            # Add group to parent's children
-                            if common_parent in self.nodes:
-                                parent_node = self.nodes[common_parent]
-                                if group_node_id not in parent_node.children:
-                                    parent_node.children.append(group_node_id)
-                                # Remove member tasks from parent's direct children (they're in group)
-                                for member_id in members:
-                                    if member_id in parent_node.children:
-                                        parent_node.children.remove(member_id)
+                self._reconcile_group_parent(node.group_id)
 
         # Track group membership for synthetic node creation
-        if event.group_id is not None:
-            self._track_group_member(event.task_id, event.group_id)
+        group_id = intern_id(event.group_id)
+        if group_id is not None:
+            self._track_group_member(task_id, group_id)
 
         # Track chord - when header task has chord_callback_id, upgrade GROUP to CHORD
-        if event.chord_callback_id is not None and event.group_id is not None:
+        if event.chord_callback_id is not None and group_id is not None:
             # This is a HEADER task with chord info - upgrade GROUP to CHORD
-            self._upgrade_to_chord(event.group_id, event.chord_callback_id)
+            self._upgrade_to_chord(group_id, sys.intern(event.chord_callback_id))
 
         # Check if this task is a callback for any existing CHORD
-        self._link_chord_callback_if_needed(event.task_id)
+        self._link_chord_callback_if_needed(task_id)
+
+    def _set_state(self, node: NodeRecord, state: TaskState) -> None:
+        """Set a node's state, keeping the counters of its groups in sync."""
+        old_state = node.state
+        node.state = state
+        if old_state == state:
+            return
+        for group_id in self._member_of.get(node.task_id, ()):
+            counts = self._group_stats[group_id].states
+            _decrement(counts, old_state)
+            counts[state] += 1
+            self._refresh_group_state(group_id)
+
+    def _set_parent(self, node: NodeRecord, parent_id: str | None) -> None:
+        """Set a node's parent, keeping the parent histogram of its groups in sync."""
+        old_parent = node.parent_id
+        node.parent_id = parent_id = intern_id(parent_id)
+        if old_parent == parent_id:
+            return
+        if old_parent is not None and old_parent not in self.nodes:
+            self._discard_orphan(old_parent, node.task_id)
+        for group_id in self._member_of.get(node.task_id, ()):
+            old_real = _real_parent(group_id, old_parent)
+            new_real = _real_parent(group_id, parent_id)
+            if old_real == new_real:
+                continue
+            parents = self._group_stats[group_id].real_parents
+            if old_real is not None:
+                _decrement(parents, old_real)
+            if new_real is not None:
+                parents[new_real] += 1
+
+    def _link_child(self, parent_id: str, child_id: str) -> None:
+        """Add a child to its parent, or park it until the parent arrives."""
+        parent = self.nodes.get(parent_id)
+        if parent is not None:
+            parent.children.add(child_id)
+            return
+        waiting = self._orphans.get(parent_id)
+        if waiting is None:
+            waiting = self._orphans[parent_id] = OrderedIdSet()
+        waiting.add(child_id)
+
+    def _discard_orphan(self, parent_id: str, child_id: str) -> None:
+        """Stop a child waiting for a parent it no longer points at."""
+        waiting = self._orphans.get(parent_id)
+        if waiting is not None:
+            waiting.discard(child_id)
+            if not waiting:
+                del self._orphans[parent_id]
+
+    def _adopt_orphans(self, parent_id: str) -> None:
+        """Link children that arrived before their parent. O(k) in waiting children."""
+        parent = self.nodes[parent_id]
+        for child_id in self._orphans.pop(parent_id, ()):
+            child = self.nodes.get(child_id)
+            if child is not None and child.parent_id == parent_id:
+                parent.children.add(child_id)
+
+    def _set_root(self, node: NodeRecord, root_id: str) -> None:
+        """Record a task's workflow and index it under that root."""
+        node.root_id = root_id = sys.intern(root_id)
+        members = self._workflows.get(root_id)
+        if members is None:
+            members = self._workflows[root_id] = OrderedIdSet()
+        members.add(node.task_id)
+        if node.parent_id is None and root_id != node.task_id and root_id in self.nodes:
+            # Placed in its workflow; not a separate root
+            self.root_ids.discard(node.task_id)
+
+    def _place_workflow_members(self, root_id: str, *, as_roots: bool) -> None:
+        """Move a workflow's parentless members out of (or back into) root_ids."""
+        for member_id in self._workflows.get(root_id, ()):
+            member = self.nodes.get(member_id)
+            if member is None or member_id == root_id or member.parent_id is not None:
+                continue
+            if as_roots:
+                self.root_ids.add(member_id)
+            else:
+                self.root_ids.discard(member_id)
+
+    def _add_group_member(self, group_id: str, task_id: str) -> None:
+        """Register task as a group member and count its state and real parent."""
+        members = self._group_members.setdefault(group_id, OrderedIdSet())
+        if task_id in members:
+            return
+        members.add(task_id)
+        self._member_of.setdefault(task_id, []).append(group_id)
+
+        node = self.nodes[task_id]
+        stats = self._group_stats.setdefault(group_id, _GroupAggregate())
+        stats.states[node.state] += 1
+        real_parent = _real_parent(group_id, node.parent_id)
+        if real_parent is not None:
+            stats.real_parents[real_parent] += 1
+
+    def _remove_group_member(self, group_id: str, task_id: str) -> None:
+        """Unregister a group member and subtract it from the group counters."""
+        members = self._group_members.get(group_id)
+        if members is None or task_id not in members:
+            return
+        members.discard(task_id)
+
+        groups = self._member_of.get(task_id)
+        if groups is not None:
+            groups.remove(group_id)
+            if not groups:
+                del self._member_of[task_id]
+
+        stats = self._group_stats[group_id]
+        node = self.nodes.get(task_id)
+        if node is not None:
+            _decrement(stats.states, node.state)
+            real_parent = _real_parent(group_id, node.parent_id)
+            if real_parent is not None:
+                _decrement(stats.real_parents, real_parent)
+
+        if not members:
+            del self._group_members[group_id]
+            del self._group_stats[group_id]
+
+    def _refresh_group_state(self, group_id: str) -> None:
+        """Recompute the synthetic node state for a group from its counters."""
+        group_node = self.nodes.get(f"group:{group_id}")
+        if group_node is not None:
+            group_node.state = self._compute_group_state(group_id)
+
+    def _reconcile_group_parent(self, group_id: str) -> None:
+        """Attach the group node to its members' real parent once they all agree.
+
+        Uses the group's parent histogram, so the check is O(1) per member
+        transition instead of a scan over every member.
+        """
+        group_node_id = f"group:{group_id}"
+        group_node = self.nodes.get(group_node_id)
+        stats = self._group_stats.get(group_id)
+        if group_node is None or stats is None or len(stats.real_parents) != 1:
+            return
+
+        common_parent = next(iter(stats.real_parents))
+        if common_parent == group_node_id or group_node.parent_id == common_parent:
+            return
+
+        # Update group node's parent
+        self._set_parent(group_node, common_parent)
+        # Remove group from root_ids if it was there
+        self.root_ids.discard(group_node_id)
+        # Add group to parent's children
+        if common_parent in self.nodes:
+            parent_node = self.nodes[common_parent]
+            parent_node.children.add(group_node_id)
+            # Remove member tasks from parent's direct children (they're in group)
+            for member_id in self._group_members.get(group_id, ()):
+                parent_node.children.discard(member_id)
+        else:
+            self._link_child(common_parent, group_node_id)
 
     def _track_group_member(self, task_id: str, group_id: str) -> None:
         """Track task as member of a group and create synthetic node if needed.
@@ -189,21 +703,12 @@ class TaskGraph(BaseModel):
                 # This is the callback - link it to CHORD but not as group member
                 task_node = self.nodes[task_id]
                 if task_node.parent_id is None:
-                    task_node.parent_id = group_node_id
-                    if task_id in self.root_ids:
-                        self.root_ids.remove(task_id)
-                if task_id not in chord_node.children:
-                    chord_node.children.append(task_id)
+                    self._set_parent(task_node, group_node_id)
+                    self.root_ids.discard(task_id)
+                chord_node.children.add(task_id)
                 return  # Don't add to _group_members
 
-        if group_id not in self._group_members:
-            self._group_members[group_id] = []
-
-        if task_id not in self._group_members[group_id]:
-            self._group_members[group_id].append(task_id)
-
-        # Only create GROUP node for standalone groups (no parent task)
-        group_node_id = f"group:{group_id}"
+        self._add_group_member(group_id, task_id)
         members = self._group_members[group_id]
 
         should_create = (
@@ -217,19 +722,17 @@ class TaskGraph(BaseModel):
         # Update group node if it exists
         if group_node_id in self.nodes:
             group_node = self.nodes[group_node_id]
-            if task_id not in group_node.children:
-                group_node.children.append(task_id)
+            group_node.children.add(task_id)
 
-            group_node.state = self._compute_group_state(members)
+            group_node.state = self._compute_group_state(group_id)
 
             # Update task's parent to point to group node (if no other parent)
             task_node = self.nodes[task_id]
             if task_node.parent_id is None:
-                task_node.parent_id = group_node_id
-                if task_id in self.root_ids:
-                    self.root_ids.remove(task_id)
+                self._set_parent(task_node, group_node_id)
+                self.root_ids.discard(task_id)
 
-    def _should_create_group_node(self, member_ids: list[str]) -> bool:
+    def _should_create_group_node(self, member_ids: Collection[str]) -> bool:
         """Determine if a synthetic GROUP node should be created.
 
         Always returns True when there are 2+ members - we want to visualize
@@ -238,21 +741,20 @@ class TaskGraph(BaseModel):
         """
         return len(member_ids) >= 2
 
-    def _get_common_parent(self, member_ids: list[str]) -> str | None:
-        """Get common parent_id if all members share the same parent.
+    def _get_common_parent(self, group_id: str) -> str | None:
+        """Get common parent_id if all members of a group share the same parent.
 
         Returns the parent_id if all members have the same parent,
         or None if they have different parents or are standalone.
         """
-        parents: set[str | None] = set()
-        for mid in member_ids:
-            if mid in self.nodes:
-                parents.add(self.nodes[mid].parent_id)
+        stats = self._group_stats.get(group_id)
+        members = self._group_members.get(group_id)
+        if stats is None or members is None or len(stats.real_parents) != 1:
+            return None
 
         # Single shared non-None parent => common parent.
-        if len(parents) == 1 and None not in parents:
-            return parents.pop()
-        return None
+        parent_id, count = next(iter(stats.real_parents.items()))
+        return parent_id if count == len(members) else None
 
     def _create_group_node(self, group_id: str) -> None:
         """Create a synthetic GROUP node for tasks sharing a group_id.
@@ -261,74 +763,85 @@ class TaskGraph(BaseModel):
         of that parent. Otherwise, the GROUP is a root node.
         """
         group_node_id = f"group:{group_id}"
-        members = self._group_members.get(group_id, [])
+        members = self._group_members.get(group_id, OrderedIdSet())
 
         # Check if members share a common parent
-        common_parent = self._get_common_parent(members)
+        common_parent = self._get_common_parent(group_id)
 
         # Determine the group's state based on member states
-        group_state = self._compute_group_state(members)
+        group_state = self._compute_group_state(group_id)
 
-        self.nodes[group_node_id] = TaskNode(
+        self.nodes[group_node_id] = NodeRecord(
             task_id=group_node_id,
             name="group",
             state=group_state,
             node_type=NodeType.GROUP,
             group_id=group_id,
-            children=list(members),
+            children=OrderedIdSet(members),
             parent_id=common_parent,
+            root_id=self._members_root(members),
         )
 
         if common_parent is not None:
             # GROUP is child of common parent
             parent_node = self.nodes.get(common_parent)
             if parent_node and group_node_id not in parent_node.children:
-                parent_node.children.append(group_node_id)
+                parent_node.children.add(group_node_id)
             # Remove member tasks from parent's children (they're now in GROUP)
             if parent_node:
                 for member_id in members:
-                    if member_id in parent_node.children:
-                        parent_node.children.remove(member_id)
+                    parent_node.children.discard(member_id)
+            else:
+                self._link_child(common_parent, group_node_id)
         else:
             # GROUP is a root node
-            if group_node_id not in self.root_ids:
-                self.root_ids.append(group_node_id)
+            self.root_ids.add(group_node_id)
 
         # Update member nodes to point to group as parent
         for member_id in members:
             if member_id in self.nodes:
                 member = self.nodes[member_id]
                 # Store original parent before updating (for later members)
-                member.parent_id = group_node_id
+                self._set_parent(member, group_node_id)
                 # Remove from root_ids since it now has a parent
-                if member_id in self.root_ids:
-                    self.root_ids.remove(member_id)
+                self.root_ids.discard(member_id)
+
+    def _members_root(self, member_ids: Iterable[str]) -> str | None:
+        """Return the first known root_id among group members."""
+        for member_id in member_ids:
+            member = self.nodes.get(member_id)
+            if member is not None and member.root_id is not None:
+                return member.root_id
+        return None
 
-    def _compute_group_state(self, member_ids: list[str]) -> TaskState:
-        """Compute aggregate state for a group based on member states.
+    def _compute_group_state(self, group_id: str) -> TaskState:
+        """Compute aggregate state for a group from its per-state member counters.
 
         Priority: FAILURE > STARTED/RECEIVED > PENDING > RETRY > REVOKED > SUCCESS
         """
-        states = [self.nodes[mid].state for mid in member_ids if mid in self.nodes]
-        if not states:
+        stats = self._group_stats.get(group_id)
+        if stats is None or not stats.states:
             return TaskState.PENDING
 
-        state_set = set(states)
+        counts = stats.states
 
-        if TaskState.FAILURE in state_set:
+        if counts[TaskState.FAILURE]:
             return TaskState.FAILURE
-        if state_set & {TaskState.STARTED, TaskState.RECEIVED}:
+        if counts[TaskState.STARTED] or counts[TaskState.RECEIVED]:
             return TaskState.STARTED
-        if TaskState.PENDING in state_set:
+        if counts[TaskState.PENDING]:
             return TaskState.PENDING
-        if TaskState.RETRY in state_set:
+        if counts[TaskState.RETRY]:
             return TaskState.RETRY
-        if TaskState.REVOKED in state_set:
+        if counts[TaskState.REVOKED]:
             return TaskState.REVOKED
-        if all(s == TaskState.SUCCESS for s in states):
+        if len(counts) == 1 and TaskState.SUCCESS in counts:
             return TaskState.SUCCESS
 
-        return states[0]
+        # Mixed terminal states without a priority winner (e.g. REJECTED):
+        # fall back to the first member's state.
+        first_member = next(iter(self._group_members[group_id]))
+        return self.nodes[first_member].state
 
     def _upgrade_to_chord(self, group_id: str, callback_id: str) -> None:
         """Upgrade a GROUP node to CHORD and register the callback.
@@ -337,11 +850,11 @@ class TaskGraph(BaseModel):
         The callback will be linked outside the container.
         """
         group_node_id = f"group:{group_id}"
-        members = self._group_members.get(group_id, [])
+        members = self._group_members.get(group_id, OrderedIdSet())
 
         # If no GROUP node exists yet, create it as CHORD
         if group_node_id not in self.nodes:
-            self.nodes[group_node_id] = TaskNode(
+            self.nodes[group_node_id] = NodeRecord(
                 task_id=group_node_id,
                 name="chord",
                 state=TaskState.PENDING,
@@ -349,17 +862,16 @@ class TaskGraph(BaseModel):
                 group_id=group_id,
                 chord_id=callback_id,  # Store callback reference
                 chord_callback_id=callback_id,
-                children=list(members),  # Add existing members as children
+                children=OrderedIdSet(members),  # Add existing members as children
+                root_id=self._members_root(members),
             )
-            if group_node_id not in self.root_ids:
-                self.root_ids.append(group_node_id)
+            self.root_ids.add(group_node_id)
             # Update member nodes to point to CHORD as parent
             for member_id in members:
                 if member_id in self.nodes:
                     member = self.nodes[member_id]
-                    member.parent_id = group_node_id
-                    if member_id in self.root_ids:
-                        self.root_ids.remove(member_id)
+                    self._set_parent(member, group_node_id)
+                    self.root_ids.discard(member_id)
         else:
             # Upgrade existing GROUP to CHORD
             group_node = self.nodes[group_node_id]
@@ -368,6 +880,7 @@ class TaskGraph(BaseModel):
                 group_node.name = "chord"
             group_node.chord_id = callback_id  # Store callback reference
             group_node.chord_callback_id = callback_id
+        self._chord_callbacks.setdefault(callback_id, group_node_id)
 
         # Link callback to CHORD if it already exists
         group_node = self.nodes[group_node_id]
@@ -375,43 +888,254 @@ class TaskGraph(BaseModel):
         if callback_node:
             # Callback should be OUTSIDE container, linked as child for edge
             if callback_node.parent_id is None:
-                callback_node.parent_id = group_node_id
-                if callback_id in self.root_ids:
-                    self.root_ids.remove(callback_id)
+                self._set_parent(callback_node, group_node_id)
+                self.root_ids.discard(callback_id)
             # Ensure callback is in children (for edge rendering)
-            if callback_id not in group_node.children:
-                group_node.children.append(callback_id)
+            group_node.children.add(callback_id)
             # Remove callback from group members (it's not a header task)
-            if (
-                group_id in self._group_members
-                and callback_id in self._group_members[group_id]
-            ):
-                self._group_members[group_id].remove(callback_id)
+            self._remove_group_member(group_id, callback_id)
 
     def _link_chord_callback_if_needed(self, task_id: str) -> None:
         """Link a task to a CHORD node if it's the callback for that chord.
 
-        Called when a new task arrives. Checks if any existing CHORD node
-        is waiting for this task as its callback.
+        Called when a new task arrives. Looks up the CHORD waiting for this
+        task as its callback in the callback index (O(1)).
+        """
+        chord_node_id = self._chord_callbacks.get(task_id)
+        if chord_node_id is None:
+            return
+        node = self.nodes.get(chord_node_id)
+        if (
+            node is None
+            or node.node_type != NodeType.CHORD
+            or node.chord_callback_id != task_id
+        ):
+            return
+        callback_node = self.nodes.get(task_id)
+        if callback_node:
+            # Link callback to CHORD
+            if callback_node.parent_id is None:
+                self._set_parent(callback_node, node.task_id)
+                self.root_ids.discard(task_id)
+            # Add to children for edge rendering
+            node.children.add(task_id)
+
+    def remove_node(self, task_id: str) -> NodeRecord | None:
+        """Remove a node and unlink it from its parent, roots, group counters and indexes.
+
+        The node is also dropped from the children of its GROUP/CHORD
+        containers, which list members and callbacks whatever their parent.
+
+        Args:
+            task_id: ID of the node to remove.
+
+        Returns:
+            The removed node, or None if it was not in the graph.
         """
-        for node in self.nodes.values():
-            if node.node_type == NodeType.CHORD and node.chord_callback_id == task_id:
-                callback_node = self.nodes.get(task_id)
-                if callback_node:
-                    # Link callback to CHORD
-                    if callback_node.parent_id is None:
-                        callback_node.parent_id = node.task_id
-                        if task_id in self.root_ids:
-                            self.root_ids.remove(task_id)
-                    # Add to children for edge rendering
-                    if task_id not in node.children:
-                        node.children.append(task_id)
-                return  # Only one CHORD can have this callback
-
-    def get_node(self, task_id: str) -> TaskNode | None:
+        node = self.nodes.get(task_id)
+        if node is None:
+            return None
+
+        for container_id in self._containers(node):
+            self.nodes[container_id].children.discard(task_id)
+
+        for group_id in list(self._member_of.get(task_id, ())):
+            self._remove_group_member(group_id, task_id)
+            self._refresh_group_state(group_id)
+
+        if node.parent_id is not None:
+            if node.parent_id in self.nodes:
+                self.nodes[node.parent_id].children.discard(task_id)
+            else:
+                self._discard_orphan(node.parent_id, task_id)
+        self.root_ids.discard(task_id)
+
+        if node.root_id is not None:
+            members = self._workflows.get(node.root_id)
+            if members is not None:
+                members.discard(task_id)
+                if not members:
+                    del self._workflows[node.root_id]
+        # Without their root, parentless members are listed as roots again.
+        self._place_workflow_members(task_id, as_roots=True)
+
+        for callback_id in {node.chord_callback_id, node.chord_id}:
+            if (
+                callback_id is not None
+                and self._chord_callbacks.get(callback_id) == task_id
+            ):
+                del self._chord_callbacks[callback_id]
+
+        del self.nodes[task_id]
+
+        # Children still pointing here wait in case the task shows up again.
+        for child_id in node.children:
+            child = self.nodes.get(child_id)
+            if child is not None and child.parent_id == task_id:
+                self._link_child(task_id, child_id)
+        return node
+
+    def _containers(self, node: NodeRecord) -> list[str]:
+        """IDs of the GROUP/CHORD nodes present that hold node as member or callback."""
+        nodes = self.nodes
+        task_id = node.task_id
+        candidates = [
+            f"group:{group_id}" for group_id in self._member_of.get(task_id, ())
+        ]
+        if node.group_id is not None:
+            candidates.append(f"group:{node.group_id}")
+        chord_id = self._chord_callbacks.get(task_id)
+        if chord_id is not None:
+            candidates.append(chord_id)
+        return [
+            container_id
+            for container_id in dict.fromkeys(candidates)
+            if container_id != task_id and container_id in nodes
+        ]
+
+    def clone(self) -> TaskGraph:
+        """Return a detached copy that later events applied here won't touch.
+
+        Records are copied column-wise (``NodeRecord.copy``) and the indexes
+        container by container, so this is O(nodes) without rebuilding
+        anything; strings and event rows stay shared.
+        """
+        graph = TaskGraph.model_construct(
+            nodes={task_id: node.copy() for task_id, node in self.nodes.items()},
+            root_ids=OrderedIdSet(self.root_ids),
+        )
+        graph._group_members = {
+            group_id: OrderedIdSet(members)
+            for group_id, members in self._group_members.items()
+        }
+        graph._member_of = {
+            task_id: list(groups) for task_id, groups in self._member_of.items()
+        }
+        graph._group_stats = {
+            group_id: stats.copy() for group_id, stats in self._group_stats.items()
+        }
+        graph._chord_callbacks = dict(self._chord_callbacks)
+        graph._workflows = {
+            root_id: OrderedIdSet(members)
+            for root_id, members in self._workflows.items()
+        }
+        graph._orphans = {
+            parent_id: OrderedIdSet(children)
+            for parent_id, children in self._orphans.items()
+        }
+        return graph
+
+    def get_node(self, task_id: str) -> NodeRecord | None:
         """Get node by ID, or None if not found."""
         return self.nodes.get(task_id)
 
     def get_group_members(self, group_id: str) -> list[str]:
         """Get task IDs that belong to a group."""
-        return self._group_members.get(group_id, [])
+        return list(self._group_members.get(group_id, ()))
+
+    def get_containers(self, task_id: str) -> list[str]:
+        """Get IDs of the GROUP/CHORD nodes holding a task as member or callback."""
+        node = self.nodes.get(task_id)
+        return self._containers(node) if node is not None else []
+
+    def get_workflow_members(self, root_id: str) -> list[str]:
+        """Get IDs of tasks whose events carried this root_id (O(members))."""
+        return list(self._workflows.get(root_id, ()))
+
+    def get_workflow(self, task_id: str) -> list[str]:
+        """Get IDs of every node in the workflow containing task_id.
+
+        Follows parent links (or root_id when the parent is absent) up to the
+        top-most node present, then collects everything below it: children,
+        the GROUP/CHORD containers holding a task as member or callback, and
+        tasks indexed under a root_id. A group member whose parent and root
+        are both absent thus still comes with its container and the other
+        members. Cost is proportional to the workflow's size plus its depth.
+
+        Args:
+            task_id: ID of any node in the workflow.
+
+        Returns:
+            Node IDs, top-most node first; empty if task_id is not in the graph.
+        """
+        nodes = self.nodes
+        top = nodes.get(task_id)
+        if top is None:
+            return []
+        climbed = {top.task_id}
+        while True:
+            parent = nodes.get(top.parent_id) if top.parent_id else None
+            if parent is None and top.root_id is not None:
+                parent = nodes.get(top.root_id)
+            if parent is None or parent.task_id in climbed:
+                break
+            climbed.add(parent.task_id)
+            top = parent
+
+        workflows = self._workflows
+        workflow: dict[str, None] = {}
+        to_visit = [top.task_id]
+        while to_visit:
+            current_id = to_visit.pop()
+            node = nodes.get(current_id)
+            if node is None or current_id in workflow:
+                continue
+            workflow[current_id] = None
+            to_visit.extend(node.children)
+            if current_id in workflows:
+                to_visit.extend(workflows[current_id])
+            if node.parent_id is not None and node.parent_id.startswith("group:"):
+                to_visit.append(node.parent_id)
+            to_visit.extend(self._containers(node))
+        return list(workflow)
+
+
+def _changes_links(
+    node: NodeRecord,
+    event: TaskEvent,
+    nodes: dict[str, NodeRecord],
+    member_of: dict[str, list[str]],
+) -> bool:
+    """Return whether ``_apply_event`` would do more than set the node's state.
+
+    Mirrors its conditions: a group_id the task isn't a tracked member of
+    yet, a CHORD header or a member of a CHORD (whose state may be stale
+    until a member event refreshes it), a first root_id or chord_id, or a
+    parent_id that replaces a missing or synthetic parent. Pending chord
+    callbacks are checked by the caller.
+    """
+    group_id = event.group_id
+    if group_id is not None:
+        if event.chord_callback_id is not None:
+            return True
+        if group_id not in member_of.get(node.task_id, ()):
+            return True
+        group_node = nodes.get(f"group:{group_id}")
+        if group_node is not None and group_node.node_type != NodeType.GROUP:
+            return True
+    parent_id = event.parent_id
+    return (
+        (event.root_id is not None and node.root_id is None)
+        or (event.chord_id is not None and node.chord_id is None)
+        or (
+            parent_id is not None
+            and parent_id != node.parent_id
+            and (node.parent_id is None or node.parent_id.startswith("group:"))
+        )
+    )
+
+
+def _real_parent(group_id: str, parent_id: str | None) -> str | None:
+    """Return parent_id unless it is missing or the group's own synthetic node."""
+    if parent_id is None or parent_id == f"group:{group_id}":
+        return None
+    return parent_id
+
+
+def _decrement(counter: Counter[_K], key: _K) -> None:
+    """Decrement a counter entry, dropping it when it reaches zero."""
+    remaining = counter[key] - 1
+    if remaining > 0:
+        counter[key] = remaining
+    else:
+        counter.pop(key, None)
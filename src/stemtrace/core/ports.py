@@ -1,7 +1,7 @@
 """Protocol definitions for dependency inversion."""
 
 from collections.abc import Iterator
-from typing import TYPE_CHECKING, Protocol
+from typing import TYPE_CHECKING, Protocol, runtime_checkable
 
 from typing_extensions import Self
 
@@ -26,6 +26,22 @@ class EventTransport(Protocol):
         ...
 
 
+@runtime_checkable
+class ResumableTransport(Protocol):
+    """Transport whose stream can be re-read after a known position.
+
+    ``position`` is the position of the last event ``consume()`` yielded
+    (None before the first); passing it back to ``consume()`` resumes with
+    the event after it.
+    """
+
+    position: str | None
+
+    def consume(self, last_id: str = "0") -> Iterator["TaskEvent | WorkerEvent"]:
+        """Yield events after last_id ("0" reads from the start)."""
+        ...
+
+
 class TaskRepository(Protocol):
     """Read-only task data access for API endpoints."""
 
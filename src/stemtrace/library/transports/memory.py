@@ -14,14 +14,21 @@ class MemoryTransport:
     """In-memory event transport. Events stored in class-level list for test inspection."""
 
     events: ClassVar[list[StreamEvent]] = []
+    # Number of stored events consumed so far, as a resume position
+    position: str | None = None
 
     def publish(self, event: StreamEvent) -> None:
         """Store event in memory."""
         MemoryTransport.events.append(event)
 
-    def consume(self) -> Iterator[StreamEvent]:
-        """Yield all stored events."""
-        yield from MemoryTransport.events
+    def consume(self, last_id: str = "0") -> Iterator[StreamEvent]:
+        """Yield stored events, starting after the first int(last_id)."""
+        index = int(last_id)
+        while index < len(MemoryTransport.events):
+            event = MemoryTransport.events[index]
+            index += 1
+            self.position = str(index)
+            yield event
 
     @classmethod
     def from_url(cls, url: str) -> Self:
@@ -59,6 +59,8 @@ class RedisTransport:
         self._ttl = ttl
         self._stream_key = f"{prefix}:events"
         self._maxlen = max(ttl, 10000)
+        # Stream ID of the last event consume() yielded
+        self.position: str | None = None
 
     @property
     def client(self) -> Redis[Any]:
@@ -107,7 +109,8 @@ class RedisTransport:
         """Blocking iterator that yields events as they arrive.
 
         Detects event type from JSON and yields appropriate model
-        (TaskEvent or WorkerEvent).
+        (TaskEvent or WorkerEvent). Reads entries after the stream ID
+        last_id; ``position`` holds the ID of the last yielded event.
         """
         current_id = last_id
         while True:
@@ -130,7 +133,7 @@ class RedisTransport:
                     if data:
                         data_str = data.decode() if isinstance(data, bytes) else data
                         try:
-                            yield self._parse_event(data_str)
+                            event = self._parse_event(data_str)
                         except (json.JSONDecodeError, ValidationError, ValueError):
                             logger.warning(
                                 "Failed to parse event from Redis stream %s at id %s",
@@ -139,6 +142,8 @@ class RedisTransport:
                                 exc_info=True,
                             )
                             continue
+                        self.position = current_id
+                        yield event
 
     def _parse_event(self, data_str: str) -> StreamEvent:
         """Parse JSON into appropriate event type."""
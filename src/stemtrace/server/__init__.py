@@ -8,6 +8,7 @@ from stemtrace.server.fastapi import (
     require_api_key,
     require_basic_auth,
 )
+from stemtrace.server.sqlite_store import SqliteGraphStore
 from stemtrace.server.store import GraphStore
 from stemtrace.server.websocket import WebSocketManager
 
@@ -15,6 +16,7 @@ __all__ = [
     "AsyncEventConsumer",
     "EventConsumer",
     "GraphStore",
+    "SqliteGraphStore",
     "StemtraceExtension",
     "WebSocketManager",
     "create_router",
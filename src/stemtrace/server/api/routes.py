@@ -3,31 +3,40 @@
 from __future__ import annotations
 
 import asyncio
+import base64
 import contextlib
+import json
 import logging
 import threading
 import time
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Annotated
+from typing import TYPE_CHECKING, Annotated, Literal
 
 from celery import Celery
 from fastapi import APIRouter, HTTPException, Query
 
 from stemtrace.server.api.schemas import (
     ErrorResponse,
+    FailureGroupListResponse,
+    FailureGroupResponse,
     GraphListResponse,
     GraphNodeResponse,
     GraphResponse,
     HealthResponse,
+    LatencyStatsResponse,
+    LatencySummaryResponse,
     RegisteredTaskResponse,
     TaskDetailResponse,
     TaskEventResponse,
+    TaskLatencyResponse,
     TaskListResponse,
     TaskNodeResponse,
     TaskRegistryResponse,
     TaskStatus,
+    TimeseriesResponse,
     WorkerListResponse,
     WorkerResponse,
+    WorkflowSummaryResponse,
 )
 
 if TYPE_CHECKING:
@@ -36,7 +45,8 @@ if TYPE_CHECKING:
     from stemtrace.core.events import TaskState
     from stemtrace.core.graph import TaskNode
     from stemtrace.server.consumer import AsyncEventConsumer
-    from stemtrace.server.store import GraphStore, WorkerRegistry
+    from stemtrace.server.latency import LatencySummary
+    from stemtrace.server.store import GraphStore, RootWorkflow, WorkerRegistry
     from stemtrace.server.websocket import WebSocketManager
 
 logger = logging.getLogger(__name__)
@@ -91,6 +101,50 @@ def _tasks_for_worker_key(
     return tasks
 
 
+def _encode_cursor(timestamp: datetime | None, task_id: str) -> str:
+    """Build an opaque page token for a (latest event time, task_id) position."""
+    position = [timestamp.isoformat() if timestamp else None, task_id]
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime | None, str]:
+    """Parse a page token from ``_encode_cursor``.
+
+    Raises:
+        HTTPException: 400 if the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, task_id = json.loads(raw)
+        if not isinstance(task_id, str):
+            raise TypeError(task_id)
+        return (
+            datetime.fromisoformat(timestamp) if timestamp is not None else None,
+            task_id,
+        )
+    except (TypeError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def _ms(seconds: float | None) -> float | None:
+    """Convert seconds to milliseconds, passing None through."""
+    return seconds * 1000 if seconds is not None else None
+
+
+def _latency_to_response(summary: LatencySummary) -> LatencySummaryResponse:
+    """Convert a LatencySummary (seconds) to its API model (milliseconds)."""
+    return LatencySummaryResponse(
+        count=summary.count,
+        mean_ms=_ms(summary.mean),
+        min_ms=_ms(summary.minimum),
+        max_ms=_ms(summary.maximum),
+        p50_ms=_ms(summary.p50),
+        p95_ms=_ms(summary.p95),
+        p99_ms=_ms(summary.p99),
+    )
+
+
 def _node_to_response(node: TaskNode) -> TaskNodeResponse:
     """Convert TaskNode to API response model.
 
@@ -115,7 +169,8 @@ def _node_to_response(node: TaskNode) -> TaskNodeResponse:
         group_id=node.group_id,
         chord_id=node.chord_id,
         parent_id=node.parent_id,
-        children=node.children,
+        root_id=node.root_id,
+        children=list(node.children),
         events=[TaskEventResponse.model_validate(e) for e in node.events],
         first_seen=first_seen,
         last_updated=last_updated,
@@ -194,7 +249,7 @@ def _node_to_graph_response(
     # UI traversal is order-sensitive when callbacks can appear as both direct
     # children and CHORD-linked nodes. Prefer TASK children first so callback
     # branches render before synthetic containers.
-    children = node.children
+    children = list(node.children)
     if all_nodes is not None:
         children = sorted(
             node.children,
@@ -216,6 +271,46 @@ def _node_to_graph_response(
     )
 
 
+def _root_to_graph_response(
+    root: RootWorkflow, node_alias_key: str | None = None
+) -> GraphNodeResponse:
+    """Convert a listed root and its workflow summary to a graph response.
+
+    Timing comes from the root entry, so GROUP/CHORD roots need no child
+    lookups.
+
+    Args:
+        root: Root entry from ``GraphStore.get_root_workflows``.
+        node_alias_key: Key to resolve display name from task arguments.
+
+    Returns:
+        GraphNodeResponse carrying the workflow summary.
+    """
+    node = root.node
+    first_seen, last_updated = root.first_seen, root.last_updated
+    duration_ms = None
+    if first_seen and last_updated and first_seen != last_updated:
+        duration_ms = int((last_updated - first_seen).total_seconds() * 1000)
+    return GraphNodeResponse(
+        task_id=node.task_id,
+        name=_resolve_node_alias(node, node_alias_key),
+        state=node.state,
+        node_type=node.node_type,
+        group_id=node.group_id,
+        chord_id=node.chord_id,
+        parent_id=node.parent_id,
+        # TASK children first, as in _node_to_graph_response; synthetic
+        # node IDs are "group:<id>".
+        children=sorted(node.children, key=lambda c: c.startswith("group:")),
+        duration_ms=duration_ms,
+        first_seen=first_seen,
+        last_updated=last_updated,
+        summary=WorkflowSummaryResponse.model_validate(root.summary)
+        if root.summary is not None
+        else None,
+    )
+
+
 def _get_inspector(
     broker_url: str | None,
     *,
@@ -399,12 +494,17 @@ def create_api_router(
         """Return server health status and connection counts."""
         from stemtrace import __version__
 
+        # One published summary, so the counts all describe the same version
+        summary = store.summary
         return HealthResponse(
             status="ok",
             version=__version__,
             consumer_running=consumer.is_running if consumer else False,
             websocket_connections=ws_manager.connection_count if ws_manager else 0,
-            node_count=store.node_count,
+            node_count=summary.node_count,
+            state_counts=dict(summary.state_counts),
+            estimated_memory_bytes=summary.estimated_bytes,
+            max_memory_bytes=store.max_memory_bytes,
         )
 
     @router.get(
@@ -415,6 +515,10 @@ def create_api_router(
     async def list_tasks(
         limit: Annotated[int, Query(ge=1, le=500)] = 100,
         offset: Annotated[int, Query(ge=0)] = 0,
+        cursor: Annotated[
+            str | None,
+            Query(description="Continue after a previous page's next_cursor"),
+        ] = None,
         state: Annotated[str | None, Query(description="Filter by task state")] = None,
         name: Annotated[
             str | None, Query(description="Filter by name substring")
@@ -426,7 +530,11 @@ def create_api_router(
             datetime | None, Query(description="Filter by end date (ISO format)")
         ] = None,
     ) -> TaskListResponse:
-        """List tasks with optional filtering by state, name, and date range."""
+        """List tasks with optional filtering by state, name, and date range.
+
+        Pages can be walked by offset or, stably while new events arrive, by
+        passing each response's ``next_cursor`` back as ``cursor``.
+        """
         from stemtrace.core.events import TaskState as TS
 
         task_state: TaskState | None = None
@@ -441,12 +549,18 @@ def create_api_router(
             name_contains=name,
             from_date=from_date,
             to_date=to_date,
+            before=_decode_cursor(cursor) if cursor is not None else None,
         )
+        tasks = [_node_to_response(n) for n in nodes]
+        next_cursor = None
+        if len(tasks) == limit:
+            next_cursor = _encode_cursor(tasks[-1].last_updated, tasks[-1].task_id)
         return TaskListResponse(
-            tasks=[_node_to_response(n) for n in nodes],
+            tasks=tasks,
             total=total,
             limit=limit,
             offset=offset,
+            next_cursor=next_cursor,
         )
 
     @router.get(
@@ -480,8 +594,10 @@ def create_api_router(
         if refresh and worker_registry is not None:
             await _maybe_refresh_worker_registry_from_inspect()
 
-        # Get all observed task names (from executions)
-        observed_names = store.get_unique_task_names()
+        # Get observed task names (from executions), narrowed by the search query
+        observed_names = (
+            store.find_task_names(query) if query else store.get_unique_task_names()
+        )
 
         # Get all registered task names (from workers)
         # Use sets to avoid duplicates when same hostname has multiple workers (restarts)
@@ -495,17 +611,21 @@ def create_api_router(
                     registered_tasks_by_worker[task_name].add(worker.hostname)
 
         # Combine observed and registered tasks
-        all_task_names = observed_names | set(registered_tasks_by_worker.keys())
+        registered_names = set(registered_tasks_by_worker.keys())
+        if query:
+            query_lower = query.lower()
+            registered_names = {
+                name for name in registered_names if query_lower in name.lower()
+            }
+        all_task_names = observed_names | registered_names
+
+        # Per-name counts and last run, read from aggregates in one lock hold
+        stats = store.get_task_name_stats(all_task_names)
 
         tasks: list[RegisteredTaskResponse] = []
         for name in sorted(all_task_names):
-            # Apply text search filter
-            if query and query.lower() not in name.lower():
-                continue
-
-            # Get execution count and last run time
-            execution_count = store.get_task_execution_count(name)
-            last_run = store.get_last_execution_time(name)
+            name_stats = stats[name]
+            execution_count = name_stats.execution_count
 
             # Get workers that registered this task (convert set to sorted list)
             registered_by_set = registered_tasks_by_worker.get(name, set())
@@ -543,8 +663,10 @@ def create_api_router(
                     docstring=definition.docstring if definition else None,
                     bound=definition.bound if definition else False,
                     execution_count=execution_count,
+                    success_count=name_stats.success_count,
+                    failure_count=name_stats.failure_count,
                     registered_by=registered_by,
-                    last_run=last_run,
+                    last_run=name_stats.last_run,
                     status=task_status,
                 )
             )
@@ -582,10 +704,18 @@ def create_api_router(
         children = store.get_children(task_id)
         return [_node_to_response(c) for c in children]
 
-    @router.get("/graphs", response_model=GraphListResponse)
+    @router.get(
+        "/graphs",
+        response_model=GraphListResponse,
+        responses={400: {"model": ErrorResponse}},
+    )
     async def list_graphs(
         limit: Annotated[int, Query(ge=1, le=100)] = 50,
         offset: Annotated[int, Query(ge=0)] = 0,
+        cursor: Annotated[
+            str | None,
+            Query(description="Continue after a previous page's next_cursor"),
+        ] = None,
         from_date: Annotated[
             datetime | None, Query(description="Filter by start date (ISO format)")
         ] = None,
@@ -593,29 +723,33 @@ def create_api_router(
             datetime | None, Query(description="Filter by end date (ISO format)")
         ] = None,
     ) -> GraphListResponse:
-        """List task execution graphs (root tasks) with pagination and date filtering."""
-        roots, total = store.get_root_nodes(
+        """List task execution graphs (root tasks) with pagination and date filtering.
+
+        Pages can be walked by offset or by passing each response's
+        ``next_cursor`` back as ``cursor``.
+        """
+        roots, total = store.get_root_workflows(
             limit=limit,
             offset=offset,
             from_date=from_date,
             to_date=to_date,
+            before=_decode_cursor(cursor) if cursor is not None else None,
         )
-        # Build nodes dict for synthetic node timing computation
-        all_nodes: dict[str, TaskNode] = {}
-        for root in roots:
-            all_nodes[root.task_id] = root
-            for child in store.get_children(root.task_id):
-                all_nodes[child.task_id] = child
+        graphs = [
+            _root_to_graph_response(root, node_alias_key=node_alias_from_arguments)
+            for root in roots
+        ]
+        next_cursor = None
+        if len(graphs) == limit:
+            # last_updated is the time the store orders roots by (a
+            # GROUP/CHORD root's is its workflow's latest event).
+            next_cursor = _encode_cursor(graphs[-1].last_updated, graphs[-1].task_id)
         return GraphListResponse(
-            graphs=[
-                _node_to_graph_response(
-                    r, all_nodes, node_alias_key=node_alias_from_arguments
-                )
-                for r in roots
-            ],
+            graphs=graphs,
             total=total,
             limit=limit,
             offset=offset,
+            next_cursor=next_cursor,
         )
 
     @router.get(
@@ -643,6 +777,85 @@ def create_api_router(
             },
         )
 
+    @router.get(
+        "/stats/latency",
+        response_model=LatencyStatsResponse,
+    )
+    async def get_latency_stats(
+        name: Annotated[
+            list[str] | None, Query(description="Task names to report (repeatable)")
+        ] = None,
+        from_date: Annotated[
+            datetime | None,
+            Query(description="Only durations completed from this time (ISO format)"),
+        ] = None,
+        to_date: Annotated[
+            datetime | None,
+            Query(description="Only durations completed up to this time (ISO format)"),
+        ] = None,
+    ) -> LatencyStatsResponse:
+        """Runtime and queue-wait percentiles (p50/p95/p99) per task name.
+
+        Served from sketches maintained at ingestion (hourly buckets, last
+        24 hours), so tasks that were evicted from the store still count.
+        """
+        stats = store.get_latency_stats(name, from_date=from_date, to_date=to_date)
+        tasks = [
+            TaskLatencyResponse(
+                name=s.name,
+                runtime=_latency_to_response(s.runtime),
+                queue_wait=_latency_to_response(s.queue_wait),
+            )
+            for s in sorted(stats.values(), key=lambda s: s.name)
+        ]
+        return LatencyStatsResponse(tasks=tasks, total=len(tasks))
+
+    @router.get(
+        "/stats/timeseries",
+        response_model=TimeseriesResponse,
+    )
+    async def get_timeseries(
+        resolution: Annotated[
+            Literal["minute", "hour"],
+            Query(description="Bucket size: last 120 minutes or last 48 hours"),
+        ] = "minute",
+        name: Annotated[
+            list[str] | None, Query(description="Task names to include (repeatable)")
+        ] = None,
+        to_date: Annotated[
+            datetime | None,
+            Query(description="End the window at this time (ISO format)"),
+        ] = None,
+    ) -> TimeseriesResponse:
+        """Started/succeeded/failed/retried/revoked counts per minute or hour.
+
+        Served from ring-buffered counters kept at ingestion, overall and per
+        task name; no task data is read.
+        """
+        series = store.get_timeseries(resolution, name, to_date=to_date)
+        return TimeseriesResponse.model_validate(series)
+
+    @router.get(
+        "/stats/failures",
+        response_model=FailureGroupListResponse,
+    )
+    async def get_failure_groups(
+        limit: Annotated[int, Query(ge=1, le=500)] = 20,
+        name: Annotated[
+            str | None, Query(description="Only failures of this task name")
+        ] = None,
+    ) -> FailureGroupListResponse:
+        """Most frequent failures, grouped by exception type and top frames.
+
+        Served from an index of fingerprints kept at ingestion, so the cost
+        follows the number of distinct failures, not of failed tasks.
+        """
+        groups = store.get_failure_groups(limit, name)
+        return FailureGroupListResponse(
+            groups=[FailureGroupResponse.model_validate(g) for g in groups],
+            total=len(groups),
+        )
+
     @router.get(
         "/workers",
         response_model=WorkerListResponse,
@@ -60,6 +60,7 @@ class TaskNodeResponse(BaseModel):
     group_id: str | None = None
     chord_id: str | None = None
     parent_id: str | None = None
+    root_id: str | None = None
     children: list[str] = Field(default_factory=list)
     events: list[TaskEventResponse] = Field(default_factory=list)
     first_seen: datetime | None = None
@@ -74,6 +75,7 @@ class TaskListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: str | None = None
 
 
 class TaskDetailResponse(BaseModel):
@@ -83,6 +85,19 @@ class TaskDetailResponse(BaseModel):
     children: list[TaskNodeResponse] = Field(default_factory=list)
 
 
+class WorkflowSummaryResponse(BaseModel):
+    """Aggregates over the tasks of a root's workflow."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    node_count: int = 0
+    state_counts: dict[TaskState, int] = Field(default_factory=dict)
+    first_seen: datetime | None = None
+    last_updated: datetime | None = None
+    duration_ms: int | None = None
+    has_failure: bool = False
+
+
 class GraphNodeResponse(BaseModel):
     """Minimal node for graph visualization."""
 
@@ -97,6 +112,8 @@ class GraphNodeResponse(BaseModel):
     duration_ms: int | None = None
     first_seen: datetime | None = None
     last_updated: datetime | None = None
+    # Set on roots listed by /graphs
+    summary: WorkflowSummaryResponse | None = None
 
 
 class GraphResponse(BaseModel):
@@ -113,6 +130,7 @@ class GraphListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: str | None = None
 
 
 class HealthResponse(BaseModel):
@@ -123,6 +141,9 @@ class HealthResponse(BaseModel):
     consumer_running: bool = False
     websocket_connections: int = 0
     node_count: int = 0
+    state_counts: dict[TaskState, int] = Field(default_factory=dict)
+    estimated_memory_bytes: int = 0
+    max_memory_bytes: int | None = None
 
 
 class ErrorResponse(BaseModel):
@@ -144,6 +165,8 @@ class RegisteredTaskResponse(BaseModel):
     module: str | None = None
     bound: bool = False
     execution_count: int = 0
+    success_count: int = 0
+    failure_count: int = 0
     registered_by: list[str] = Field(default_factory=list)
     last_run: datetime | None = None
     status: TaskStatus = TaskStatus.ACTIVE
@@ -177,3 +200,80 @@ class WorkerListResponse(BaseModel):
 
     workers: list[WorkerResponse]
     total: int
+
+
+# Stats schemas
+
+
+class LatencySummaryResponse(BaseModel):
+    """Duration percentiles in milliseconds; None when nothing was recorded."""
+
+    count: int = 0
+    mean_ms: float | None = None
+    min_ms: float | None = None
+    max_ms: float | None = None
+    p50_ms: float | None = None
+    p95_ms: float | None = None
+    p99_ms: float | None = None
+
+
+class TaskLatencyResponse(BaseModel):
+    """Runtime and queue-wait percentiles for one task name."""
+
+    name: str
+    runtime: LatencySummaryResponse
+    queue_wait: LatencySummaryResponse
+
+
+class LatencyStatsResponse(BaseModel):
+    """Latency percentiles per task name."""
+
+    tasks: list[TaskLatencyResponse]
+    total: int
+
+
+class TimeseriesPointResponse(BaseModel):
+    """Task event counts for one time bucket."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    timestamp: datetime
+    started: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    retried: int = 0
+    revoked: int = 0
+
+
+class TimeseriesResponse(BaseModel):
+    """Event counts per time bucket, overall and per task name."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    resolution: str
+    interval_seconds: int
+    overall: list[TimeseriesPointResponse]
+    tasks: dict[str, list[TimeseriesPointResponse]]
+
+
+class FailureGroupResponse(BaseModel):
+    """Task failures sharing one exception fingerprint."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    fingerprint: str
+    exception_type: str
+    frames: list[str] = Field(default_factory=list)
+    message: str | None = None
+    count: int
+    first_seen: datetime
+    last_seen: datetime
+    task_names: dict[str, int] = Field(default_factory=dict)
+    sample_task_ids: list[str] = Field(default_factory=list)
+
+
+class FailureGroupListResponse(BaseModel):
+    """Most frequent failure groups."""
+
+    groups: list[FailureGroupResponse]
+    total: int
@@ -8,10 +8,21 @@ import time
 from typing import TYPE_CHECKING
 
 from stemtrace.core.events import TaskEvent, WorkerEvent, WorkerEventType
+from stemtrace.core.ports import ResumableTransport
 from stemtrace.library.transports import get_transport
+from stemtrace.server.snapshot import (
+    capture_snapshot,
+    read_snapshot,
+    restore_snapshot,
+    write_snapshot,
+)
 
 if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterator
+
     from stemtrace.core.ports import EventTransport
+    from stemtrace.server.snapshot import StoreSnapshot
     from stemtrace.server.store import GraphStore, WorkerRegistry
 
 logger = logging.getLogger(__name__)
@@ -19,9 +30,23 @@ logger = logging.getLogger(__name__)
 # Default interval for stale worker checks (seconds)
 STALE_CHECK_INTERVAL = 60
 
+# Default interval between store snapshots (seconds)
+SNAPSHOT_INTERVAL = 60.0
+
 
 class EventConsumer:
-    """Background consumer that reads events and updates the GraphStore."""
+    """Background consumer that reads events and updates the GraphStore.
+
+    With ``snapshot_path`` set, the consumer restores the store and worker
+    registry from that file on its first start and resumes the transport
+    after the snapshot's checkpoint (Redis stream ID) instead of replaying
+    the stream. While running it snapshots every ``snapshot_interval``
+    seconds between two events, so the checkpoint always matches the store,
+    and once more on stop. Only the graph copy blocks ingestion; pickling
+    and writing happen on a background thread. Transports without a resume
+    position (RabbitMQ) continue from their queue; events acknowledged
+    after the last snapshot are not in the restored store.
+    """
 
     def __init__(
         self,
@@ -32,8 +57,24 @@ class EventConsumer:
         ttl: int = 86400,
         worker_registry: WorkerRegistry | None = None,
         stale_check_interval: int = STALE_CHECK_INTERVAL,
+        snapshot_path: str | os.PathLike[str] | None = None,
+        snapshot_interval: float = SNAPSHOT_INTERVAL,
     ) -> None:
-        """Initialize consumer with broker URL and target store."""
+        """Initialize consumer with broker URL and target store.
+
+        Raises:
+            ValueError: If snapshot_interval is not positive, or snapshot_path
+                is set for a store that persists its own history.
+        """
+        if snapshot_interval <= 0:
+            raise ValueError(
+                f"snapshot_interval must be positive, got {snapshot_interval}"
+            )
+        if snapshot_path is not None and store.persists_history:
+            raise ValueError(
+                f"snapshot_path cannot be used with {type(store).__name__},"
+                " which keeps its history on disk"
+            )
         self._broker_url = broker_url
         self._store = store
         self._prefix = prefix
@@ -44,17 +85,33 @@ class EventConsumer:
         self._thread: threading.Thread | None = None
         self._stop_event = threading.Event()
         self._last_stale_check: float = 0.0
+        self._snapshot_path = snapshot_path
+        self._snapshot_interval = snapshot_interval
+        self._last_snapshot: float = 0.0
+        self._snapshot_thread: threading.Thread | None = None
+        self._restored = False
+        # Transport position of the last consumed event, if the transport has one
+        self._checkpoint: str | None = None
 
     @property
     def is_running(self) -> bool:
         """Whether the consumer thread is alive."""
         return self._thread is not None and self._thread.is_alive()
 
+    @property
+    def checkpoint(self) -> str | None:
+        """Transport position of the last consumed event, or None."""
+        return self._checkpoint
+
     def start(self) -> None:
         """Start consuming in background thread. Idempotent."""
         if self._thread is not None:
             return
 
+        if self._snapshot_path is not None and not self._restored:
+            self._restored = True
+            self._restore_snapshot(self._snapshot_path)
+        self._last_snapshot = time.monotonic()
         self._stop_event.clear()
         self._transport = get_transport(
             self._broker_url, prefix=self._prefix, ttl=self._ttl
@@ -76,6 +133,10 @@ class EventConsumer:
         self._thread.join(timeout=timeout)
         if self._thread.is_alive():
             logger.warning("Consumer thread did not stop gracefully")
+        elif self._snapshot_path is not None:
+            # The loop is done, so the checkpoint matches the store.
+            self._join_snapshot_writer()
+            self._write_snapshot(self._capture_snapshot(), self._snapshot_path)
         self._thread = None
         self._transport = None
         logger.info("Event consumer stopped")
@@ -86,8 +147,17 @@ class EventConsumer:
 
         logger.debug("Consumer loop starting, reading from %s", self._broker_url)
 
+        transport = self._transport
+        resumable = transport if isinstance(transport, ResumableTransport) else None
+        events: Iterator[TaskEvent | WorkerEvent]
+        if resumable is not None and self._checkpoint is not None:
+            logger.info("Resuming transport after %s", self._checkpoint)
+            events = resumable.consume(self._checkpoint)
+        else:
+            events = transport.consume()
+
         try:
-            for event in self._transport.consume():
+            for event in events:
                 if self._stop_event.is_set():
                     break
 
@@ -96,10 +166,84 @@ class EventConsumer:
                     self._maybe_check_stale_workers()
                 except Exception:
                     logger.exception("Error processing event")
+                if resumable is not None:
+                    self._checkpoint = resumable.position
+                self._maybe_snapshot()
         except Exception:
             if not self._stop_event.is_set():
                 logger.exception("Consumer loop error")
 
+    def _restore_snapshot(self, path: str | os.PathLike[str]) -> None:
+        """Load the snapshot file, if any, into the store and registry."""
+        start = time.perf_counter()
+        try:
+            snapshot = read_snapshot(path)
+        except FileNotFoundError:
+            logger.info("No snapshot at %s, starting empty", path)
+            return
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable snapshot %s", path, exc_info=True)
+            return
+        restore_snapshot(snapshot, self._store, self._worker_registry)
+        self._checkpoint = snapshot.checkpoint
+        logger.info(
+            "Restored %d nodes from %s in %.2fs (checkpoint %s)",
+            len(snapshot.graph.nodes),
+            path,
+            time.perf_counter() - start,
+            snapshot.checkpoint,
+        )
+
+    def _maybe_snapshot(self) -> None:
+        """Start a background snapshot write when one is due.
+
+        Runs on the consumer thread between events. Skipped while the
+        previous write is still in progress.
+        """
+        path = self._snapshot_path
+        if path is None:
+            return
+
+        now = time.monotonic()
+        if now - self._last_snapshot < self._snapshot_interval:
+            return
+        if self._snapshot_thread is not None and self._snapshot_thread.is_alive():
+            return
+        self._last_snapshot = now
+        self._snapshot_thread = threading.Thread(
+            target=self._write_snapshot,
+            args=(self._capture_snapshot(), path),
+            name="stemtrace-snapshot",
+            daemon=True,
+        )
+        self._snapshot_thread.start()
+
+    def _capture_snapshot(self) -> StoreSnapshot:
+        """Copy the store and registry at the current checkpoint."""
+        return capture_snapshot(self._store, self._worker_registry, self._checkpoint)
+
+    def _write_snapshot(
+        self, snapshot: StoreSnapshot, path: str | os.PathLike[str]
+    ) -> None:
+        """Write a captured snapshot, logging (not raising) failures."""
+        start = time.perf_counter()
+        try:
+            write_snapshot(snapshot, path)
+        except Exception:
+            logger.exception("Failed to write snapshot %s", path)
+            return
+        logger.debug(
+            "Wrote snapshot of %d nodes in %.2fs",
+            len(snapshot.graph.nodes),
+            time.perf_counter() - start,
+        )
+
+    def _join_snapshot_writer(self) -> None:
+        """Wait for a background snapshot write to finish."""
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+
     def _maybe_check_stale_workers(self) -> None:
         """Periodically check for and mark stale workers as offline.
 
@@ -167,6 +311,8 @@ class AsyncEventConsumer:
         ttl: int = 86400,
         worker_registry: WorkerRegistry | None = None,
         stale_check_interval: int = STALE_CHECK_INTERVAL,
+        snapshot_path: str | os.PathLike[str] | None = None,
+        snapshot_interval: float = SNAPSHOT_INTERVAL,
     ) -> None:
         """Initialize async consumer wrapper with broker URL and target store."""
         self._consumer = EventConsumer(
@@ -176,6 +322,8 @@ class AsyncEventConsumer:
             ttl=ttl,
             worker_registry=worker_registry,
             stale_check_interval=stale_check_interval,
+            snapshot_path=snapshot_path,
+            snapshot_interval=snapshot_interval,
         )
 
     @property
@@ -0,0 +1,213 @@
+"""Failure groups: task failures indexed by exception fingerprint."""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import re
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+from stemtrace.core.event_log import epoch_us
+
+if TYPE_CHECKING:
+    from stemtrace.core.events import TaskEvent
+
+# Innermost frames that identify where a failure was raised.
+_TOP_FRAMES = 3
+# Fingerprints kept; the least recently seen group is dropped beyond this.
+_MAX_GROUPS = 1000
+_SAMPLE_TASK_IDS = 5
+_MAX_MESSAGE_CHARS = 500
+
+_FRAME = re.compile(r'^\s*File "(?P<path>[^"]*)", line \d+, in (?P<func>.+?)\s*$', re.M)
+_EXCEPTION_TYPE = re.compile(r"^(?P<type>[A-Za-z_][\w.]*)(?::|$)")
+_UNKNOWN_TYPE = "UnknownError"
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _exception_type(exception: str | None, traceback: str | None) -> str:
+    """Exception class name from "Type: message", or the traceback's last line."""
+    candidates = [exception or ""]
+    if traceback:
+        lines = traceback.rstrip().splitlines()
+        if lines:
+            candidates.append(lines[-1])
+    for text in candidates:
+        match = _EXCEPTION_TYPE.match(text.strip())
+        if match:
+            return match["type"]
+    return _UNKNOWN_TYPE
+
+
+def _top_frames(traceback: str | None) -> list[str]:
+    """Innermost frames as "dir/module.py in function", line numbers dropped.
+
+    Paths keep their last two components, so the same code fails with the
+    same frames on every host and after edits that move lines.
+    """
+    if not traceback:
+        return []
+    frames = _FRAME.findall(traceback)[-_TOP_FRAMES:]
+    return [
+        "/".join(path.replace("\\", "/").split("/")[-2:]) + f" in {func}"
+        for path, func in frames
+    ]
+
+
+def fingerprint(
+    exception: str | None, traceback: str | None
+) -> tuple[str, str, list[str]]:
+    """Fingerprint a failure by exception type and normalized top frames.
+
+    Messages are left out (they usually carry IDs and values), so the same
+    error raised from the same place gets the same fingerprint.
+
+    Args:
+        exception: The event's exception ("Type: message").
+        traceback: The event's formatted traceback.
+
+    Returns:
+        (fingerprint, exception type, frames).
+    """
+    exception_type = _exception_type(exception, traceback)
+    frames = _top_frames(traceback)
+    digest = hashlib.blake2b(
+        "\n".join([exception_type, *frames]).encode(), digest_size=8
+    ).hexdigest()
+    return digest, exception_type, frames
+
+
+class FailureGroup(BaseModel):
+    """Task failures sharing one exception fingerprint."""
+
+    fingerprint: str
+    exception_type: str
+    frames: list[str] = Field(default_factory=list)
+    message: str | None = None
+    count: int = 0
+    first_seen: datetime
+    last_seen: datetime
+    task_names: dict[str, int] = Field(default_factory=dict)
+    sample_task_ids: list[str] = Field(default_factory=list)
+
+
+class _Group:
+    """Mutable aggregate behind a FailureGroup."""
+
+    __slots__ = (
+        "count",
+        "exception_type",
+        "first_us",
+        "frames",
+        "last_us",
+        "message",
+        "task_ids",
+        "task_names",
+    )
+
+    def __init__(self, exception_type: str, frames: list[str], seen_us: int) -> None:
+        self.exception_type = exception_type
+        self.frames = frames
+        self.message: str | None = None
+        self.count = 0
+        # Epoch µs, so naive (UTC) and aware timestamps compare
+        self.first_us = seen_us
+        self.last_us = seen_us
+        self.task_names: dict[str, int] = {}
+        self.task_ids: deque[str] = deque(maxlen=_SAMPLE_TASK_IDS)
+
+
+class FailureIndex:
+    """FAILURE events grouped by fingerprint (exception type + top frames).
+
+    Each group keeps a count, first/last seen, the latest message, failures
+    per task name and the most recent task IDs, updated at ingestion, so
+    ranking failures costs O(F log N) over F fingerprints rather than a
+    scan of failed tasks, and evicted tasks still count. At most
+    ``max_groups`` fingerprints are kept; the least recently seen one is
+    dropped to make room.
+
+    Not thread-safe; GraphStore calls it under its lock.
+    """
+
+    __slots__ = ("_groups", "_max_groups")
+
+    def __init__(self, max_groups: int = _MAX_GROUPS) -> None:
+        """Create an empty index.
+
+        Raises:
+            ValueError: If max_groups is not positive.
+        """
+        if max_groups <= 0:
+            raise ValueError(f"max_groups must be positive, got {max_groups}")
+        self._max_groups = max_groups
+        # Fingerprint -> group, least recently seen first
+        self._groups: dict[str, _Group] = {}
+
+    def __len__(self) -> int:
+        """Return the number of fingerprints."""
+        return len(self._groups)
+
+    def add(self, event: TaskEvent) -> str:
+        """Count a failure event under its fingerprint and return the fingerprint."""
+        key, exception_type, frames = fingerprint(event.exception, event.traceback)
+        seen_us = epoch_us(event.timestamp)
+        groups = self._groups
+        group = groups.pop(key, None)
+        if group is None:
+            if len(groups) >= self._max_groups:
+                del groups[next(iter(groups))]
+            group = _Group(exception_type, frames, seen_us)
+        groups[key] = group
+        group.count += 1
+        group.first_us = min(group.first_us, seen_us)
+        group.last_us = max(group.last_us, seen_us)
+        if event.exception is not None:
+            group.message = event.exception[:_MAX_MESSAGE_CHARS]
+        group.task_names[event.name] = group.task_names.get(event.name, 0) + 1
+        group.task_ids.append(event.task_id)
+        return key
+
+    def top(self, limit: int, name: str | None = None) -> list[FailureGroup]:
+        """Return the limit largest groups, most failures first.
+
+        Args:
+            limit: Number of groups to return.
+            name: Only groups in which this task name failed, ranked and
+                counted by its failures alone; the other fields still
+                describe the whole group.
+
+        Returns:
+            Groups by descending count (then latest failure first).
+        """
+
+        def rank(item: tuple[str, _Group]) -> tuple[int, int]:
+            group = item[1]
+            total = group.count if name is None else group.task_names[name]
+            return (total, group.last_us)
+
+        items = [
+            item
+            for item in self._groups.items()
+            if name is None or name in item[1].task_names
+        ]
+        return [
+            FailureGroup(
+                fingerprint=key,
+                exception_type=group.exception_type,
+                frames=list(group.frames),
+                message=group.message,
+                count=rank((key, group))[0],
+                first_seen=_EPOCH + timedelta(microseconds=group.first_us),
+                last_seen=_EPOCH + timedelta(microseconds=group.last_us),
+                task_names=dict(
+                    sorted(group.task_names.items(), key=lambda kv: -kv[1])
+                ),
+                sample_task_ids=list(reversed(group.task_ids)),
+            )
+            for key, group in heapq.nlargest(limit, items, key=rank)
+        ]
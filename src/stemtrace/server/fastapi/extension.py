@@ -7,8 +7,9 @@ from typing import TYPE_CHECKING, Any, overload
 
 from fastapi.responses import RedirectResponse
 
-from stemtrace.server.consumer import AsyncEventConsumer
+from stemtrace.server.consumer import SNAPSHOT_INTERVAL, AsyncEventConsumer
 from stemtrace.server.fastapi.router import create_router
+from stemtrace.server.sqlite_store import SqliteGraphStore
 from stemtrace.server.store import GraphStore, WorkerRegistry
 from stemtrace.server.ui.static import get_static_router
 from stemtrace.server.websocket import WebSocketManager
@@ -65,6 +66,16 @@ class StemtraceExtension:
         prefix: str = "/stemtrace",
         ttl: int = 86400,
         max_nodes: int = 10000,
+        max_events_per_node: int | None = None,
+        compact_event_history: bool = False,
+        protect_active_workflows: bool = False,
+        max_memory_bytes: int | None = None,
+        retention_seconds: float | None = None,
+        payload_dir: str | None = None,
+        max_payload_bytes: int | None = None,
+        store_path: str | None = None,
+        snapshot_path: str | None = None,
+        snapshot_interval: float = SNAPSHOT_INTERVAL,
         auth_dependency: Any = None,
         form_auth_config: FormAuthConfig | None = None,
         node_alias_from_arguments: str | None = None,
@@ -80,11 +91,42 @@ class StemtraceExtension:
             prefix: Mount path for stemtrace routes (also used as event prefix after normalization).
             ttl: Event retention window in seconds (transport-specific).
             max_nodes: Maximum number of nodes to keep in memory.
+            max_events_per_node: Maximum events kept per node. None keeps all.
+            compact_event_history: Drop payloads from intermediate node events.
+            protect_active_workflows: Never evict workflows with unfinished tasks.
+            max_memory_bytes: Evict oldest workflows when the store's estimated
+                size exceeds this many bytes. None limits by max_nodes only.
+            retention_seconds: Evict workflows idle for longer than this from
+                the in-memory store (independent of the transport ttl).
+            payload_dir: Directory for memory-mapped payload segments; event
+                args/results/tracebacks are kept there instead of on the heap.
+                Each store uses its own subdirectory, deleted on shutdown.
+            max_payload_bytes: Drop the oldest payload segments beyond this
+                size (requires payload_dir).
+            store_path: SQLite file for the full event history. When set, the
+                store is a SqliteGraphStore and the limits above apply to its
+                in-memory cache of recent workflows.
+            snapshot_path: File the embedded consumer snapshots the in-memory
+                store to and restores it from on startup, resuming the
+                transport after the snapshot instead of replaying it. Not
+                combinable with store_path.
+            snapshot_interval: Seconds between snapshots while consuming.
             auth_dependency: Optional FastAPI dependency applied to all routes for authentication.
             form_auth_config: Optional cookie-session configuration used to protect WebSocket.
             node_alias_from_arguments: Key to derive graph node display name from task
                 arguments. Digit string for args[index], string for kwargs[key].
+
+        Raises:
+            ValueError: If snapshot_path or payload_dir is combined with
+                store_path, or snapshot_path is set without the embedded
+                consumer.
         """
+        if snapshot_path is not None and store_path is not None:
+            raise ValueError("snapshot_path cannot be combined with store_path")
+        if payload_dir is not None and store_path is not None:
+            raise ValueError("payload_dir cannot be combined with store_path")
+        if snapshot_path is not None and not embedded_consumer:
+            raise ValueError("snapshot_path requires embedded_consumer=True")
         self._broker_url = broker_url
         self._transport_url = transport_url or broker_url
         self._serve_ui = serve_ui
@@ -92,7 +134,28 @@ class StemtraceExtension:
         self._auth_dependency = auth_dependency
         self._form_auth_config = form_auth_config
 
-        self._store = GraphStore(max_nodes=max_nodes)
+        self._store: GraphStore
+        if store_path is not None:
+            self._store = SqliteGraphStore(
+                store_path,
+                max_nodes=max_nodes,
+                max_events_per_node=max_events_per_node,
+                compact_event_history=compact_event_history,
+                protect_active_workflows=protect_active_workflows,
+                max_memory_bytes=max_memory_bytes,
+                retention_seconds=retention_seconds,
+            )
+        else:
+            self._store = GraphStore(
+                max_nodes=max_nodes,
+                max_events_per_node=max_events_per_node,
+                compact_event_history=compact_event_history,
+                protect_active_workflows=protect_active_workflows,
+                max_memory_bytes=max_memory_bytes,
+                retention_seconds=retention_seconds,
+                payload_dir=payload_dir,
+                max_payload_bytes=max_payload_bytes,
+            )
         self._worker_registry = WorkerRegistry()
         self._ws_manager = WebSocketManager()
         self._consumer: AsyncEventConsumer | None = None
@@ -104,6 +167,8 @@ class StemtraceExtension:
                 prefix=self._prefix,
                 ttl=ttl,
                 worker_registry=self._worker_registry,
+                snapshot_path=snapshot_path,
+                snapshot_interval=snapshot_interval,
             )
 
         self._node_alias_from_arguments = node_alias_from_arguments
@@ -117,7 +182,7 @@ class StemtraceExtension:
 
     @property
     def store(self) -> GraphStore:
-        """The in-memory graph store."""
+        """The graph store (in-memory, or SQLite-backed with store_path)."""
         return self._store
 
     @property
@@ -193,6 +258,7 @@ class StemtraceExtension:
                 if self._consumer is not None:
                     self._consumer.stop()
                 await self._ws_manager.stop_broadcast_loop()
+                self._store.close()
 
         return _wrapped
 
@@ -0,0 +1,402 @@
+"""Secondary indexes maintained by GraphStore alongside the task graph."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Generic, Protocol, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from collections.abc import Set as AbstractSet
+
+    from stemtrace.core.events import TaskState
+
+
+class _Comparable(Protocol):
+    def __lt__(self, other: Any, /) -> bool: ...
+
+
+_K = TypeVar("_K", bound=_Comparable)
+_H = TypeVar("_H")
+
+_EMPTY: frozenset[str] = frozenset()
+
+
+class SortedKeyList(Generic[_K]):
+    """Sorted multiset of keys stored as a list of bounded sorted buckets.
+
+    Inserts and removals cost O(log N + bucket size) instead of the O(N)
+    memmove of a single sorted list; walking from either end, skipping an
+    offset and counting keys above a bound touch whole buckets at a time.
+    """
+
+    _LOAD = 512
+
+    __slots__ = ("_buckets", "_len", "_maxes")
+
+    def __init__(self) -> None:
+        """Create an empty list."""
+        self._buckets: list[list[_K]] = []
+        self._maxes: list[_K] = []
+        self._len = 0
+
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        return self._len
+
+    def __contains__(self, key: _K) -> bool:
+        """Return whether key is present."""
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return False
+        bucket = self._buckets[pos]
+        idx = bisect_left(bucket, key)
+        return idx < len(bucket) and not (key < bucket[idx])
+
+    def add(self, key: _K) -> None:
+        """Insert a key, keeping order."""
+        if not self._maxes:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return
+
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            # Largest key so far - the common case for timestamps.
+            pos -= 1
+            self._buckets[pos].append(key)
+            self._maxes[pos] = key
+        else:
+            insort(self._buckets[pos], key)
+        self._len += 1
+
+        bucket = self._buckets[pos]
+        if len(bucket) > 2 * self._LOAD:
+            tail = bucket[self._LOAD :]
+            del bucket[self._LOAD :]
+            self._maxes[pos] = bucket[-1]
+            self._buckets.insert(pos + 1, tail)
+            self._maxes.insert(pos + 1, tail[-1])
+
+    def discard(self, key: _K) -> None:
+        """Remove one occurrence of key if present."""
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return
+        bucket = self._buckets[pos]
+        idx = bisect_left(bucket, key)
+        if idx == len(bucket) or key < bucket[idx]:
+            return
+
+        del bucket[idx]
+        self._len -= 1
+        if not bucket:
+            del self._buckets[pos]
+            del self._maxes[pos]
+        elif idx == len(bucket):
+            self._maxes[pos] = bucket[-1]
+
+    def last(self) -> _K | None:
+        """Return the largest key, or None if empty."""
+        return self._maxes[-1] if self._maxes else None
+
+    def count_at_least(self, low: _K) -> int:
+        """Return how many keys are >= low."""
+        pos = bisect_left(self._maxes, low)
+        if pos == len(self._maxes):
+            return 0
+        bucket = self._buckets[pos]
+        count = len(bucket) - bisect_left(bucket, low)
+        for later in self._buckets[pos + 1 :]:
+            count += len(later)
+        return count
+
+    def descending(
+        self,
+        low: _K | None = None,
+        *,
+        below: _K | None = None,
+        offset: int = 0,
+    ) -> Iterator[_K]:
+        """Yield keys from largest to smallest, stopping below low.
+
+        Keys >= ``below`` are skipped by bisection, then the first ``offset``
+        keys a bucket at a time.
+        """
+        pos = len(self._buckets) - 1
+        end = None  # exclusive end within the first bucket walked
+        if below is not None:
+            pos = bisect_left(self._maxes, below)
+            if pos < len(self._buckets):
+                end = bisect_left(self._buckets[pos], below)
+            else:
+                pos -= 1
+        while pos >= 0:
+            size = len(self._buckets[pos]) if end is None else end
+            if offset < size:
+                break
+            offset -= size
+            end = None
+            pos -= 1
+        while pos >= 0:
+            bucket = self._buckets[pos]
+            stop = 0 if low is None else bisect_left(bucket, low)
+            top = len(bucket) if end is None else end
+            for idx in range(top - 1 - offset, stop - 1, -1):
+                yield bucket[idx]
+            if stop > 0:
+                return
+            offset = 0
+            end = None
+            pos -= 1
+
+    def ascending(self, low: _K | None = None, high: _K | None = None) -> Iterator[_K]:
+        """Yield keys from low (inclusive) to high (inclusive) in order."""
+        pos = 0 if low is None else bisect_left(self._maxes, low)
+        for bucket in self._buckets[pos:]:
+            start = 0 if low is None else bisect_left(bucket, low)
+            low = None
+            if high is not None and high < bucket[-1]:
+                yield from bucket[start : bisect_right(bucket, high)]
+                return
+            yield from bucket[start:]
+
+
+class NodeIdIndex(Generic[_H]):
+    """Map keys (task states, task names) to the IDs of nodes having them.
+
+    Keys whose last node is removed are dropped, so iteration only yields
+    values present in the store and ``count()`` is a set length lookup.
+    """
+
+    __slots__ = ("_ids",)
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self._ids: dict[_H, set[str]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of distinct keys."""
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[_H]:
+        """Iterate over the keys present."""
+        return iter(self._ids)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether any node is filed under key."""
+        return key in self._ids
+
+    def add(self, key: _H, task_id: str) -> bool:
+        """Record task_id under key; return True if key is new."""
+        ids = self._ids.get(key)
+        if ids is None:
+            self._ids[key] = {task_id}
+            return True
+        ids.add(task_id)
+        return False
+
+    def discard(self, key: _H, task_id: str) -> bool:
+        """Remove task_id from key; return True if that dropped the key."""
+        ids = self._ids.get(key)
+        if ids is None:
+            return False
+        ids.discard(task_id)
+        if ids:
+            return False
+        del self._ids[key]
+        return True
+
+    def move(self, old: _H, new: _H, task_id: str) -> None:
+        """Re-file task_id from old to new."""
+        if old != new:
+            self.discard(old, task_id)
+            self.add(new, task_id)
+
+    def get(self, key: _H) -> AbstractSet[str]:
+        """Return the live set of IDs under key (empty if none)."""
+        return self._ids.get(key, _EMPTY)
+
+    def count(self, key: _H) -> int:
+        """Return how many IDs are filed under key."""
+        ids = self._ids.get(key)
+        return len(ids) if ids is not None else 0
+
+    def counts(self) -> dict[_H, int]:
+        """Return the number of IDs per key."""
+        return {key: len(ids) for key, ids in self._ids.items()}
+
+
+class _NameEntry:
+    __slots__ = ("keys", "states")
+
+    def __init__(self) -> None:
+        self.keys: SortedKeyList[tuple[int, str]] = SortedKeyList()
+        self.states: Counter[TaskState] = Counter()
+
+
+class TaskNameIndex:
+    """Per-task-name recency keys and state counters for TASK nodes.
+
+    Each name keeps its nodes' ``(latest event µs, task_id)`` keys in a
+    SortedKeyList and a count of their current states, so execution count,
+    last run and per-state counts are O(1), and a name's nodes can be walked
+    newest-first without sorting. Names whose last node is removed are
+    dropped.
+    """
+
+    __slots__ = ("_entries",)
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self._entries: dict[str, _NameEntry] = {}
+
+    def __len__(self) -> int:
+        """Return the number of distinct names."""
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names present."""
+        return iter(self._entries)
+
+    def __contains__(self, name: object) -> bool:
+        """Return whether any node has this name."""
+        return name in self._entries
+
+    def add(self, name: str, key: tuple[int, str], state: TaskState) -> bool:
+        """File a node's key and state under name; return True if name is new."""
+        entry = self._entries.get(name)
+        created = entry is None
+        if entry is None:
+            entry = self._entries[name] = _NameEntry()
+        entry.keys.add(key)
+        entry.states[state] += 1
+        return created
+
+    def discard(self, name: str, key: tuple[int, str], state: TaskState) -> bool:
+        """Remove a node's key and state; return True if that dropped the name."""
+        entry = self._entries.get(name)
+        if entry is None:
+            return False
+        entry.keys.discard(key)
+        remaining = entry.states[state] - 1
+        if remaining > 0:
+            entry.states[state] = remaining
+        else:
+            entry.states.pop(state, None)
+        if len(entry.keys):
+            return False
+        del self._entries[name]
+        return True
+
+    def update(
+        self,
+        name: str,
+        old: tuple[tuple[int, str], TaskState],
+        new: tuple[tuple[int, str], TaskState],
+    ) -> None:
+        """Replace a node's (key, state) after an event."""
+        entry = self._entries[name]
+        (old_key, old_state), (new_key, new_state) = old, new
+        if old_key != new_key:
+            entry.keys.discard(old_key)
+            entry.keys.add(new_key)
+        if old_state != new_state:
+            entry.states[new_state] += 1
+            remaining = entry.states[old_state] - 1
+            if remaining > 0:
+                entry.states[old_state] = remaining
+            else:
+                del entry.states[old_state]
+
+    def count(self, name: str) -> int:
+        """Return how many nodes have this name."""
+        entry = self._entries.get(name)
+        return len(entry.keys) if entry is not None else 0
+
+    def last(self, name: str) -> tuple[int, str] | None:
+        """Return the newest key for name, or None."""
+        entry = self._entries.get(name)
+        return entry.keys.last() if entry is not None else None
+
+    def state_counts(self, name: str) -> dict[TaskState, int]:
+        """Return the number of nodes with this name in each state."""
+        entry = self._entries.get(name)
+        return dict(entry.states) if entry is not None else {}
+
+    def descending(
+        self, name: str, low: tuple[int, str] | None = None
+    ) -> Iterator[tuple[int, str]]:
+        """Yield name's keys newest-first, stopping below low."""
+        entry = self._entries.get(name)
+        if entry is None:
+            return iter(())
+        return entry.keys.descending(low)
+
+
+class TrigramIndex:
+    """Case-insensitive substring search over a set of distinct strings.
+
+    Each string is filed under every 3-character window of its lowercased
+    form. A query is answered by intersecting the sets for its own windows,
+    smallest first, and confirming each candidate with ``in``. Queries
+    shorter than three characters fall back to checking every string, which
+    stays cheap because the index holds distinct task names, not nodes.
+    """
+
+    __slots__ = ("_grams", "_lowered")
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self._lowered: dict[str, str] = {}
+        self._grams: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed strings."""
+        return len(self._lowered)
+
+    def add(self, value: str) -> None:
+        """Index value (no-op if already present)."""
+        if value in self._lowered:
+            return
+        lowered = self._lowered[value] = value.lower()
+        for gram in _trigrams(lowered):
+            holders = self._grams.get(gram)
+            if holders is None:
+                self._grams[gram] = {value}
+            else:
+                holders.add(value)
+
+    def discard(self, value: str) -> None:
+        """Remove value if present."""
+        lowered = self._lowered.pop(value, None)
+        if lowered is None:
+            return
+        for gram in _trigrams(lowered):
+            holders = self._grams[gram]
+            holders.discard(value)
+            if not holders:
+                del self._grams[gram]
+
+    def search(self, needle: str) -> set[str]:
+        """Return indexed strings containing needle, ignoring case."""
+        needle = needle.lower()
+        grams = _trigrams(needle)
+        if not grams:
+            return {v for v, lowered in self._lowered.items() if needle in lowered}
+
+        holders = []
+        for gram in grams:
+            found = self._grams.get(gram)
+            if found is None:
+                return set()
+            holders.append(found)
+        holders.sort(key=len)
+        candidates = holders[0].intersection(*holders[1:])
+        return {v for v in candidates if needle in self._lowered[v]}
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
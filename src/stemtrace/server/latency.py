@@ -0,0 +1,263 @@
+"""Streaming latency percentiles per task name, kept in time buckets."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+# Quantile estimates are within this relative error of a true sample value.
+_RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + _RELATIVE_ACCURACY) / (1 - _RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+# Durations below this (seconds) share one bucket, reported as the minimum.
+_MIN_VALUE = 1e-6
+
+_MICROS = 1_000_000
+
+
+class LatencySketch:
+    """Mergeable quantile sketch over durations in seconds.
+
+    A log-bucketed histogram (the DDSketch scheme): a duration v lands in
+    bucket ceil(log_gamma(v)), so every bucket spans the same relative
+    width and any quantile is answered within 1% of a value that was
+    actually added. Counts live in one contiguous array covering the
+    buckets between the smallest and largest duration seen, which for
+    durations from milliseconds to minutes is a few hundred entries.
+    Merging adds the counts bucket by bucket, so the sketch of a union is
+    exact with respect to the sketches of its parts.
+    """
+
+    __slots__ = ("_counts", "_offset", "_zeros", "count", "maximum", "minimum", "total")
+
+    def __init__(self) -> None:
+        """Create an empty sketch."""
+        # _counts[i] is the count of bucket _offset + i
+        self._counts = array("I")
+        self._offset = 0
+        self._zeros = 0
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+
+    def add(self, seconds: float) -> None:
+        """Add one duration.
+
+        Raises:
+            ValueError: If seconds is negative.
+        """
+        if seconds < 0:
+            raise ValueError(f"duration must not be negative, got {seconds}")
+        self.count += 1
+        self.total += seconds
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+        if seconds < _MIN_VALUE:
+            self._zeros += 1
+        else:
+            self._bump(math.ceil(math.log(seconds) / _LOG_GAMMA), 1)
+
+    def merge(self, other: LatencySketch) -> None:
+        """Add every duration counted by other to this sketch."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._zeros += other._zeros
+        offset = other._offset
+        for pos, n in enumerate(other._counts):
+            if n:
+                self._bump(offset + pos, n)
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the q-quantile (0 <= q <= 1), or None if the sketch is empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._zeros
+        if rank < seen:
+            return self.minimum
+        for pos, n in enumerate(self._counts):
+            seen += n
+            if seen > rank:
+                # Midpoint (in relative terms) of bucket i: (gamma^(i-1), gamma^i]
+                value = 2 * _GAMMA ** (self._offset + pos) / (_GAMMA + 1)
+                return min(max(value, self.minimum), self.maximum)
+        return self.maximum
+
+    def summary(self) -> LatencySummary:
+        """Return the count, mean, extremes and p50/p95/p99."""
+        if not self.count:
+            return LatencySummary()
+        return LatencySummary(
+            count=self.count,
+            mean=self.total / self.count,
+            minimum=self.minimum,
+            maximum=self.maximum,
+            p50=self.quantile(0.5),
+            p95=self.quantile(0.95),
+            p99=self.quantile(0.99),
+        )
+
+    def _bump(self, index: int, n: int) -> None:
+        """Add n to bucket index, widening the array to cover it."""
+        counts = self._counts
+        if not counts:
+            self._offset = index
+            counts.append(n)
+            return
+        pos = index - self._offset
+        if pos < 0:
+            counts[0:0] = array("I", bytes(counts.itemsize * -pos))
+            self._offset = index
+            pos = 0
+        elif pos >= len(counts):
+            counts.extend(array("I", bytes(counts.itemsize * (pos - len(counts) + 1))))
+        counts[pos] += n
+
+
+class LatencySummary(BaseModel):
+    """Duration statistics in seconds; all None when nothing was recorded."""
+
+    count: int = 0
+    mean: float | None = None
+    minimum: float | None = None
+    maximum: float | None = None
+    p50: float | None = None
+    p95: float | None = None
+    p99: float | None = None
+
+
+class TaskLatencyStats(BaseModel):
+    """Runtime and queue-wait statistics for one task name."""
+
+    name: str
+    runtime: LatencySummary = Field(default_factory=LatencySummary)
+    queue_wait: LatencySummary = Field(default_factory=LatencySummary)
+
+
+class LatencyIndex:
+    """Runtime and queue-wait sketches per task name and per time bucket.
+
+    Durations are filed under the bucket of the event that completed them
+    (a STARTED event for queue wait, SUCCESS/FAILURE for runtime). Only the
+    newest ``buckets`` buckets are kept: when a later bucket starts, older
+    ones are dropped for every name, so memory is bounded by names x
+    buckets, not by task volume, and durations completing before the
+    window are ignored. The index is independent of the task graph, so it
+    keeps counting tasks that have since been evicted.
+
+    Not thread-safe; GraphStore calls it under its lock.
+    """
+
+    __slots__ = ("_bucket_us", "_buckets", "_by_name", "_newest")
+
+    def __init__(self, bucket_seconds: float = 3600, buckets: int = 24) -> None:
+        """Create an empty index.
+
+        Args:
+            bucket_seconds: Width of one time bucket.
+            buckets: Number of most recent buckets kept.
+
+        Raises:
+            ValueError: If bucket_seconds or buckets is not positive.
+        """
+        if bucket_seconds <= 0:
+            raise ValueError(f"bucket_seconds must be positive, got {bucket_seconds}")
+        if buckets <= 0:
+            raise ValueError(f"buckets must be positive, got {buckets}")
+        self._bucket_us = max(int(bucket_seconds * _MICROS), 1)
+        self._buckets = buckets
+        # Name -> bucket number -> (runtime, queue wait)
+        self._by_name: dict[str, dict[int, tuple[LatencySketch, LatencySketch]]] = {}
+        self._newest: int | None = None
+
+    def __len__(self) -> int:
+        """Return the number of task names with a duration in the window."""
+        return len(self._by_name)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the task names with a duration in the window."""
+        return iter(self._by_name)
+
+    def add_runtime(self, name: str, at_us: int, seconds: float) -> None:
+        """Record a run of name that finished at at_us (epoch µs)."""
+        sketches = self._sketches(name, at_us)
+        if sketches is not None:
+            sketches[0].add(seconds)
+
+    def add_queue_wait(self, name: str, at_us: int, seconds: float) -> None:
+        """Record a queue wait of name that ended (task started) at at_us."""
+        sketches = self._sketches(name, at_us)
+        if sketches is not None:
+            sketches[1].add(seconds)
+
+    def stats(
+        self,
+        names: Iterable[str] | None = None,
+        from_us: int | None = None,
+        to_us: int | None = None,
+    ) -> dict[str, TaskLatencyStats]:
+        """Merge the buckets overlapping [from_us, to_us] per name.
+
+        Cost is O(names x buckets x sketch size), independent of how many
+        tasks were recorded. The range is resolved to whole buckets.
+
+        Args:
+            names: Task names to report; defaults to every name in the
+                window. Names without durations get empty summaries.
+            from_us: Earliest time (epoch µs) to include; None for no bound.
+            to_us: Latest time (epoch µs) to include; None for no bound.
+
+        Returns:
+            Stats keyed by task name.
+        """
+        first = None if from_us is None else from_us // self._bucket_us
+        last = None if to_us is None else to_us // self._bucket_us
+        result: dict[str, TaskLatencyStats] = {}
+        for name in list(self._by_name) if names is None else names:
+            runtime = LatencySketch()
+            queue_wait = LatencySketch()
+            for bucket, (run, wait) in self._by_name.get(name, {}).items():
+                if (first is None or bucket >= first) and (
+                    last is None or bucket <= last
+                ):
+                    runtime.merge(run)
+                    queue_wait.merge(wait)
+            result[name] = TaskLatencyStats(
+                name=name, runtime=runtime.summary(), queue_wait=queue_wait.summary()
+            )
+        return result
+
+    def _sketches(
+        self, name: str, at_us: int
+    ) -> tuple[LatencySketch, LatencySketch] | None:
+        """Return name's sketches for the bucket of at_us, or None if too old."""
+        bucket = at_us // self._bucket_us
+        if self._newest is None or bucket > self._newest:
+            self._newest = bucket
+            self._prune(bucket - self._buckets + 1)
+        elif bucket <= self._newest - self._buckets:
+            return None
+        by_bucket = self._by_name.setdefault(name, {})
+        sketches = by_bucket.get(bucket)
+        if sketches is None:
+            sketches = by_bucket[bucket] = (LatencySketch(), LatencySketch())
+        return sketches
+
+    def _prune(self, oldest: int) -> None:
+        """Drop buckets before oldest, and names left without any."""
+        for name, by_bucket in list(self._by_name.items()):
+            for bucket in [b for b in by_bucket if b < oldest]:
+                del by_bucket[bucket]
+            if not by_bucket:
+                del self._by_name[name]
@@ -0,0 +1,200 @@
+"""Append-only, memory-mapped segment files for event payloads."""
+
+from __future__ import annotations
+
+import contextlib
+import mmap
+import pickle
+import tempfile
+import threading
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO
+
+from stemtrace.core.event_log import SpilledPayload
+
+if TYPE_CHECKING:
+    import os
+
+_DEFAULT_SEGMENT_BYTES = 64 * 1024**2
+
+
+class _Segment:
+    """One mapped segment file; ``used`` bytes of ``size`` are written."""
+
+    __slots__ = ("file", "map", "path", "size", "used")
+
+    def __init__(self, path: Path, size: int) -> None:
+        self.path = path
+        self.size = size
+        self.used = 0
+        self.file: BinaryIO = path.open("w+b")
+        try:
+            # Sparse on most filesystems; blocks are allocated as pages are written.
+            self.file.truncate(size)
+            self.map = mmap.mmap(self.file.fileno(), size)
+        except BaseException:
+            self.file.close()
+            raise
+
+    def close(self) -> None:
+        """Unmap, close and delete the file."""
+        self.map.close()
+        self.file.close()
+        with contextlib.suppress(OSError):
+            self.path.unlink()
+
+
+class PayloadSegmentLog:
+    """Event payloads in append-only, memory-mapped segment files.
+
+    Payloads (args, kwargs, result, exception, traceback) are pickled into
+    the current segment and replaced in the node's EventLog by a
+    ``SpilledPayload`` reference (segment, offset, length), so the heap only
+    holds the references. Reads unpickle straight from the mapping without
+    copying the bytes out first; pages of segments nobody reads stay with the
+    page cache, which can write them back and reclaim them, so resident
+    memory follows the payloads actually being viewed.
+
+    Segments are never rewritten. Retention drops whole segments, oldest
+    first, once the written bytes exceed ``max_bytes``; events whose payload
+    was in a dropped segment are returned without args/kwargs/result/
+    exception/traceback.
+
+    The files are scratch space for one log: each log writes to its own new
+    subdirectory of the given directory, so several processes (server
+    workers, or a restart overlapping the old process) can share it, and
+    ``close()`` (or garbage collection of the log) deletes that subdirectory.
+    Payload files do not survive a restart; snapshots carry payloads inline.
+
+    Thread-safe: writes come from ingestion, reads from API handlers.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        segment_bytes: int = _DEFAULT_SEGMENT_BYTES,
+        max_bytes: int | None = None,
+    ) -> None:
+        """Open a log in a new subdirectory of directory, creating it if needed.
+
+        Args:
+            directory: Parent of the log's own segment directory.
+            segment_bytes: Size of each segment file. A payload larger than
+                this gets a segment of its own.
+            max_bytes: Drop the oldest segments while more than this many
+                payload bytes are stored. None keeps every segment.
+
+        Raises:
+            ValueError: If segment_bytes or max_bytes is not positive.
+        """
+        if segment_bytes <= 0:
+            raise ValueError(f"segment_bytes must be positive, got {segment_bytes}")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        parent = Path(directory)
+        parent.mkdir(parents=True, exist_ok=True)
+        self._directory = Path(tempfile.mkdtemp(dir=parent, prefix="payloads-"))
+        self._segment_bytes = segment_bytes
+        self._max_bytes = max_bytes
+        # Segment ID -> segment, oldest first; the last one is being written
+        self._segments: dict[int, _Segment] = {}
+        self._next_id = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._finalizer = weakref.finalize(
+            self, _close_segments, self._segments, self._directory
+        )
+
+    @property
+    def directory(self) -> Path:
+        """This log's segment directory (removed on close)."""
+        return self._directory
+
+    @property
+    def nbytes(self) -> int:
+        """Payload bytes held by the live segments."""
+        return self._bytes
+
+    @property
+    def segment_count(self) -> int:
+        """Number of live segment files."""
+        return len(self._segments)
+
+    def store_payload(self, payload: tuple[Any, ...]) -> SpilledPayload:
+        """Append a payload tuple and return a reference to it.
+
+        Args:
+            payload: The (args, kwargs, result, exception, traceback) tuple.
+
+        Returns:
+            A reference that loads the payload back from this log.
+        """
+        data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        length = len(data)
+        with self._lock:
+            segment_id = self._next_id - 1
+            segment = self._segments.get(segment_id)
+            if segment is None or segment.used + length > segment.size:
+                segment_id = self._next_id
+                segment = self._open_segment(max(self._segment_bytes, length))
+            offset = segment.used
+            segment.map[offset : offset + length] = data
+            segment.used += length
+            self._bytes += length
+            self._enforce_budget()
+        return SpilledPayload(
+            self,
+            segment_id,
+            offset,
+            length,
+            has_arguments=payload[0] is not None or payload[1] is not None,
+        )
+
+    def load_payload(self, ref: SpilledPayload) -> tuple[Any, ...] | None:
+        """Return the payload ref points to, or None if its segment was dropped."""
+        with self._lock:
+            segment = self._segments.get(ref.segment)
+            if segment is None:
+                return None
+            end = ref.offset + ref.length
+            with memoryview(segment.map) as view, view[ref.offset : end] as chunk:
+                payload: tuple[Any, ...] = pickle.loads(chunk)
+        return payload
+
+    def close(self) -> None:
+        """Delete the segments and their directory. References then load as None."""
+        with self._lock:
+            self._finalizer()
+            self._bytes = 0
+
+    def _open_segment(self, size: int) -> _Segment:
+        """Start a new segment. Call with lock held."""
+        segment_id = self._next_id
+        segment = _Segment(self._directory / f"payloads-{segment_id:08d}.seg", size)
+        self._segments[segment_id] = segment
+        self._next_id += 1
+        return segment
+
+    def _enforce_budget(self) -> None:
+        """Drop the oldest segments while over max_bytes. Call with lock held.
+
+        The segment being written is never dropped.
+        """
+        if self._max_bytes is None:
+            return
+        while self._bytes > self._max_bytes and len(self._segments) > 1:
+            oldest = next(iter(self._segments))
+            segment = self._segments.pop(oldest)
+            self._bytes -= segment.used
+            segment.close()
+
+
+def _close_segments(segments: dict[int, _Segment], directory: Path) -> None:
+    """Delete every segment and directory (also run when the log is collected)."""
+    for segment in segments.values():
+        segment.close()
+    segments.clear()
+    with contextlib.suppress(OSError):
+        directory.rmdir()
@@ -0,0 +1,197 @@
+"""Store snapshots for fast startup.
+
+A snapshot holds the task graph (records plus its workflow, group, chord and
+orphan indexes), the worker registry and the transport position of the last
+applied event. Restoring one and resuming the transport after that position
+replaces replaying the whole stream through validation and
+``TaskGraph.add_event``; the store's own indexes are rebuilt from the records.
+
+Snapshots are pickles, so only load files the server wrote itself.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gc
+import os
+import pickle
+import struct
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from stemtrace.core.events import RegisteredTaskDefinition
+    from stemtrace.core.graph import NodeRecord, TaskGraph
+    from stemtrace.server.store import GraphStore, WorkerInfo, WorkerRegistry
+
+_MAGIC = b"STEMTRACE-SNAPSHOT"
+_HEADER = struct.Struct(">H")
+_FORMAT_VERSION = 2
+# Records per pickle frame. The serializer holds the GIL for a whole frame,
+# so smaller frames let the ingestion thread in more often.
+_CHUNK_SIZE = 500
+
+
+@contextlib.contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Suspend the cyclic garbage collector.
+
+    Copying or loading a graph allocates several objects per node and none of
+    them are garbage; left enabled, the collector runs repeated full passes
+    over the (large) live heap, which doubles the time spent copying under
+    the store lock.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class StoreSnapshot(NamedTuple):
+    """The store's state as of one transport position."""
+
+    graph: TaskGraph
+    workers: list[WorkerInfo]
+    task_definitions: dict[str, RegisteredTaskDefinition]
+    checkpoint: str | None
+
+
+def capture_snapshot(
+    store: GraphStore,
+    worker_registry: WorkerRegistry | None = None,
+    checkpoint: str | None = None,
+) -> StoreSnapshot:
+    """Copy the store's current state.
+
+    Only the copy happens under the store lock (``GraphStore.clone_graph``);
+    the result is detached, so it can be written from another thread while
+    ingestion continues.
+
+    Args:
+        store: Store to copy.
+        worker_registry: Registry to include, if any.
+        checkpoint: Transport position of the last event applied to the store.
+
+    Returns:
+        A detached snapshot.
+    """
+    workers: list[WorkerInfo] = []
+    task_definitions: dict[str, RegisteredTaskDefinition] = {}
+    if worker_registry is not None:
+        workers, task_definitions = worker_registry.export_state()
+    with _gc_paused():
+        graph = store.clone_graph()
+    return StoreSnapshot(graph, workers, task_definitions, checkpoint)
+
+
+def write_snapshot(snapshot: StoreSnapshot, path: str | os.PathLike[str]) -> None:
+    """Write a snapshot atomically.
+
+    The file is written next to path under a temporary name, synced, then
+    renamed over path, so readers see either the previous snapshot or the
+    complete new one. Records are pickled in frames sharing one memo, which
+    keeps strings shared across records without one long GIL-holding call.
+
+    Args:
+        snapshot: Snapshot to write (not modified).
+        path: Destination file.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    path = Path(path)
+    graph = snapshot.graph
+    records = list(graph.nodes.values())
+    # The graph's indexes without the records, which follow in frames.
+    shell = graph.model_copy(update={"nodes": {}})
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    tmp = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(_MAGIC + _HEADER.pack(_FORMAT_VERSION))
+            pickler = pickle.Pickler(file, protocol=pickle.HIGHEST_PROTOCOL)
+            pickler.dump(
+                (
+                    snapshot.checkpoint,
+                    snapshot.workers,
+                    snapshot.task_definitions,
+                    shell,
+                    len(records),
+                )
+            )
+            for start in range(0, len(records), _CHUNK_SIZE):
+                pickler.dump(records[start : start + _CHUNK_SIZE])
+            file.flush()
+            os.fsync(file.fileno())
+        tmp.replace(path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            tmp.unlink()
+        raise
+
+
+def read_snapshot(path: str | os.PathLike[str]) -> StoreSnapshot:
+    """Read a snapshot written by ``write_snapshot``.
+
+    Args:
+        path: Snapshot file.
+
+    Returns:
+        The snapshot.
+
+    Raises:
+        FileNotFoundError: If path does not exist.
+        ValueError: If the file is not a snapshot, was written by an
+            incompatible version, or is truncated or corrupt.
+    """
+    with Path(path).open("rb") as file, _gc_paused():
+        return _read(file, str(path))
+
+
+def _read(file: BinaryIO, name: str) -> StoreSnapshot:
+    """Check the header, then load the metadata frame and record frames."""
+    header = file.read(len(_MAGIC) + _HEADER.size)
+    if not header.startswith(_MAGIC) or len(header) != len(_MAGIC) + _HEADER.size:
+        raise ValueError(f"{name} is not a stemtrace snapshot")
+    (version,) = _HEADER.unpack(header[len(_MAGIC) :])
+    if version != _FORMAT_VERSION:
+        raise ValueError(
+            f"{name} has snapshot format {version}, expected {_FORMAT_VERSION}"
+        )
+    unpickler = pickle.Unpickler(file)
+    try:
+        checkpoint, workers, task_definitions, graph, count = unpickler.load()
+        nodes = graph.nodes
+        while len(nodes) < count:
+            records: list[NodeRecord] = unpickler.load()
+            for record in records:
+                nodes[record.task_id] = record
+    except Exception as exc:
+        raise ValueError(f"{name} is truncated or corrupt: {exc!r}") from exc
+    return StoreSnapshot(graph, workers, task_definitions, checkpoint)
+
+
+def restore_snapshot(
+    snapshot: StoreSnapshot,
+    store: GraphStore,
+    worker_registry: WorkerRegistry | None = None,
+) -> None:
+    """Load a snapshot into a store (and registry), replacing their contents.
+
+    Args:
+        snapshot: Snapshot to restore; the store takes ownership of its graph.
+        store: Store to fill.
+        worker_registry: Registry to fill, if any.
+    """
+    with _gc_paused():
+        store.restore_graph(snapshot.graph)
+    if worker_registry is not None:
+        worker_registry.restore_state(snapshot.workers, snapshot.task_definitions)
@@ -0,0 +1,850 @@
+"""SQLite-backed graph store: full history on disk, recent workflows in memory."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import queue
+import sqlite3
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from stemtrace.core.event_log import EventLog, epoch_us
+from stemtrace.core.events import TaskEvent, TaskState
+from stemtrace.core.graph import NodeRecord, NodeType, OrderedIdSet, TaskGraph
+from stemtrace.server.indexes import TrigramIndex
+from stemtrace.server.store import (
+    _MIN_TIMESTAMP_US,
+    GraphStore,
+    RootWorkflow,
+    TaskNameStats,
+    _ensure_end_of_day,
+    _ensure_tz_aware,
+    _first_timestamp_us,
+    _last_timestamp_us,
+    _position_key,
+)
+from stemtrace.server.workflows import WorkflowSummary
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from stemtrace.core.graph import TaskNode
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    task_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (task_id, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    node_type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    state TEXT NOT NULL,
+    parent_id TEXT,
+    root_id TEXT,
+    workflow_id TEXT NOT NULL,
+    group_id TEXT,
+    chord_id TEXT,
+    chord_callback_id TEXT,
+    first_ts INTEGER NOT NULL,
+    last_ts INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_last_ts ON tasks (last_ts, task_id);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, last_ts);
+CREATE INDEX IF NOT EXISTS tasks_name ON tasks (name, last_ts);
+CREATE INDEX IF NOT EXISTS tasks_workflow ON tasks (workflow_id);
+CREATE INDEX IF NOT EXISTS tasks_parent ON tasks (parent_id);
+CREATE INDEX IF NOT EXISTS tasks_roots ON tasks (last_ts, task_id)
+    WHERE parent_id IS NULL;
+
+CREATE TABLE IF NOT EXISTS task_names (
+    name TEXT PRIMARY KEY,
+    last_ts INTEGER NOT NULL,
+    counts TEXT NOT NULL
+);
+"""
+
+_COLUMNS = (
+    "task_id, node_type, name, state, parent_id, root_id, workflow_id, "
+    "group_id, chord_id, chord_callback_id, first_ts, last_ts"
+)
+
+_INSERT_EVENT = "INSERT INTO events (task_id, seq, data) VALUES (?, ?, ?)"
+
+# Task rows mirror the cached node. Synthetic GROUP/CHORD rows are written
+# from whichever member changed, so their time range only ever widens.
+_UPSERT_TASK = f"""
+INSERT INTO tasks ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (task_id) DO UPDATE SET
+    node_type = excluded.node_type,
+    name = excluded.name,
+    state = excluded.state,
+    parent_id = excluded.parent_id,
+    root_id = excluded.root_id,
+    workflow_id = excluded.workflow_id,
+    group_id = excluded.group_id,
+    chord_id = excluded.chord_id,
+    chord_callback_id = excluded.chord_callback_id,
+    first_ts = CASE WHEN excluded.node_type = 'TASK' THEN excluded.first_ts
+        ELSE min(first_ts, excluded.first_ts) END,
+    last_ts = CASE WHEN excluded.node_type = 'TASK' THEN excluded.last_ts
+        ELSE max(last_ts, excluded.last_ts) END
+"""
+
+_UPSERT_NAME = (
+    "INSERT OR REPLACE INTO task_names (name, last_ts, counts) VALUES (?, ?, ?)"
+)
+
+_WORKFLOW_EVENTS = """
+SELECT e.task_id, e.data FROM events AS e JOIN tasks AS t ON t.task_id = e.task_id
+WHERE t.workflow_id = ? ORDER BY e.seq
+"""
+
+# A node without a parent is a root unless it is a task whose workflow root
+# is stored (mirrors TaskGraph.root_ids).
+_IS_ROOT = (
+    "parent_id IS NULL AND (node_type != 'TASK' OR root_id IS NULL"
+    " OR root_id = task_id"
+    " OR NOT EXISTS (SELECT 1 FROM tasks AS r WHERE r.task_id = tasks.root_id))"
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Parent hops followed when deriving a workflow key (guards against cycles)
+_MAX_DEPTH = 256
+
+
+def _from_row_us(value: int) -> datetime | None:
+    """Datetime for a row's first_ts/last_ts (None for nodes without events)."""
+    return (
+        None if value == _MIN_TIMESTAMP_US else _EPOCH + timedelta(microseconds=value)
+    )
+
+
+def _marks(count: int) -> str:
+    """Placeholders for an ``IN (...)`` list."""
+    return ", ".join("?" * count)
+
+
+class SqliteGraphStore(GraphStore):
+    """GraphStore that keeps every event in SQLite and recent workflows in memory.
+
+    The in-memory graph inherited from GraphStore is a hot cache bounded by
+    the usual limits (max_nodes, max_memory_bytes, retention_seconds). Every
+    event is also appended to an ``events`` table and each touched node,
+    GROUP/CHORD containers included, is upserted into a ``tasks`` table, in
+    batches on the ingesting thread. The database runs in WAL mode and reads
+    use a small pool of read-only connections, so API queries don't block
+    the writer.
+
+    Task and workflow listings, lookups and per-name stats cover the whole
+    history on disk. Nodes still in the cache are returned from memory; older
+    ones are rebuilt from their stored rows and events, with their full event
+    history and children in the order their rows were created. An event for
+    a task whose workflow has left the cache reloads that workflow first, so
+    the cache never holds part of a workflow.
+    ``summary``, ``node_count``, ``estimated_bytes``, ``get_state_counts()``
+    and ``sweep_expired()`` apply to the cache only.
+
+    Call ``close()`` on shutdown to write pending events.
+    """
+
+    persists_history = True
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        max_nodes: int = 10000,
+        *,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        read_connections: int = 4,
+        max_events_per_node: int | None = None,
+        compact_event_history: bool = False,
+        protect_active_workflows: bool = False,
+        max_memory_bytes: int | None = None,
+        retention_seconds: float | None = None,
+    ) -> None:
+        """Open (or create) the database and start with an empty cache.
+
+        Args:
+            path: SQLite database file. Created with its tables if missing.
+            max_nodes: Maximum number of nodes kept in the in-memory cache.
+            batch_size: Pending events that trigger a write to disk.
+            flush_interval: Seconds after which pending events are written at
+                the next event, even if fewer than batch_size. Reads write
+                pending events first, so they always see every event.
+            read_connections: Size of the read-only connection pool.
+            max_events_per_node: See GraphStore (applies to the cache).
+            compact_event_history: See GraphStore (applies to the cache).
+            protect_active_workflows: See GraphStore.
+            max_memory_bytes: See GraphStore (budget for the cache).
+            retention_seconds: See GraphStore (how long workflows stay
+                cached; the database keeps them until ``purge_before``).
+
+        Raises:
+            ValueError: If batch_size or read_connections is below 1, or a
+                GraphStore limit is invalid.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        if read_connections < 1:
+            raise ValueError(
+                f"read_connections must be at least 1, got {read_connections}"
+            )
+        super().__init__(
+            max_nodes,
+            max_events_per_node=max_events_per_node,
+            compact_event_history=compact_event_history,
+            protect_active_workflows=protect_active_workflows,
+            max_memory_bytes=max_memory_bytes,
+            retention_seconds=retention_seconds,
+        )
+        self._path = Path(path).absolute()
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+
+        # Writer: used under the store lock only, from whichever thread ingests.
+        self._conn = sqlite3.connect(
+            self._path, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self._pending_events: list[tuple[str, int, str]] = []
+        # Arrival order of events across tasks (events are clustered by task)
+        self._seq = self._conn.execute("SELECT max(seq) FROM events").fetchone()[0] or 0
+        self._pending_rows: dict[str, tuple[Any, ...]] = {}
+        self._dirty_names: set[str] = set()
+        self._last_flush = time.monotonic()
+        # Cached GROUP/CHORD containers by kind and callback, as last written
+        self._containers: dict[str, tuple[NodeType, str | None]] = {}
+
+        # Per-name state counts and latest event time over the whole history
+        self._name_counts: dict[str, Counter[TaskState]] = {}
+        self._name_last: dict[str, int] = {}
+        self._history_names = TrigramIndex()
+        self._load_name_totals()
+        # While the database holds nothing the cache doesn't (a new file,
+        # before the first eviction), events need no reload lookup.
+        self._cache_complete = (
+            self._conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is None
+        )
+
+        self._readers: queue.SimpleQueue[sqlite3.Connection] = queue.SimpleQueue()
+        uri = f"{self._path.as_uri()}?mode=ro"
+        for _ in range(read_connections):
+            self._readers.put(sqlite3.connect(uri, uri=True, check_same_thread=False))
+        self._closed = False
+
+    def flush(self) -> None:
+        """Write pending events and node rows to disk now."""
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """Write pending events and close every connection. Idempotent."""
+        with self._lock:
+            if self._closed:
+                return
+            self._flush()
+            self._closed = True
+            self._conn.close()
+        while True:
+            try:
+                reader = self._readers.get_nowait()
+            except queue.Empty:
+                break
+            reader.close()
+
+    def purge_before(self, cutoff: datetime) -> int:
+        """Delete stored workflows whose latest event is older than cutoff.
+
+        Workflows whose root is still cached are kept. Per-name totals are
+        recomputed from the remaining rows.
+
+        Args:
+            cutoff: Workflows with no event at or after this time are deleted.
+
+        Returns:
+            Number of node rows deleted.
+        """
+        cutoff_us = epoch_us(_ensure_tz_aware(cutoff))
+        with self._lock:
+            self._flush()
+            conn = self._conn
+            nodes = self._graph.nodes
+            expired = [
+                (workflow_id,)
+                for (workflow_id,) in conn.execute(
+                    "SELECT workflow_id FROM tasks GROUP BY workflow_id"
+                    " HAVING max(last_ts) < ?",
+                    (cutoff_us,),
+                )
+                if workflow_id not in nodes
+            ]
+            if not expired:
+                return 0
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(
+                    "DELETE FROM events WHERE task_id IN"
+                    " (SELECT task_id FROM tasks WHERE workflow_id = ?)",
+                    expired,
+                )
+                deleted = conn.executemany(
+                    "DELETE FROM tasks WHERE workflow_id = ?", expired
+                ).rowcount
+                self._rebuild_name_totals()
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            self._cache_complete = False
+            return deleted
+
+    def _ingest(self, event: TaskEvent, *, replay: bool = False) -> None:
+        """Reload the event's workflow if needed, apply it, and queue it for disk."""
+        nodes = self._graph.nodes
+        if not self._cache_complete:
+            self._reload_workflows(event)
+        node = nodes.get(event.task_id)
+        previous = node.state if node is not None else None
+
+        super()._ingest(event, replay=replay)
+        self._seq += 1
+        self._pending_events.append((event.task_id, self._seq, event.model_dump_json()))
+        node = nodes.get(event.task_id)
+        if node is not None:
+            self._record(node, previous)
+
+        if (
+            len(self._pending_events) >= self._batch_size
+            or time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            self._flush()
+
+    def _evict_workflow(self, workflow: list[str]) -> None:
+        """Drop a workflow from the cache; its rows stay on disk."""
+        self._cache_complete = False
+        for task_id in workflow:
+            self._containers.pop(task_id, None)
+        super()._evict_workflow(workflow)
+
+    def _record(self, node: NodeRecord, previous: TaskState | None) -> None:
+        """Queue the row of a node just updated. Call with lock held.
+
+        Also queues the GROUP/CHORD containers the node sits in and updates
+        the per-name totals. A container seen for the first time, or turned
+        from GROUP into CHORD, re-parents members and callbacks that arrived
+        earlier, so its children are queued too.
+        """
+        nodes = self._graph.nodes
+        first, last = _first_timestamp_us(node), _last_timestamp_us(node)
+        self._pending_rows[node.task_id] = self._row(node, first, last)
+
+        if node.node_type == NodeType.TASK:
+            name = node.name
+            counts = self._name_counts.get(name)
+            if counts is None:
+                counts = self._name_counts[name] = Counter()
+                self._history_names.add(name)
+            if previous != node.state:
+                counts[node.state] += 1
+                if previous is not None:
+                    counts[previous] -= 1
+            if last > self._name_last.get(name, last - 1):
+                self._name_last[name] = last
+            self._dirty_names.add(name)
+
+        containers = {node.parent_id}
+        if node.group_id is not None:
+            containers.add(f"group:{node.group_id}")
+        for container_id in containers:
+            container = nodes.get(container_id) if container_id else None
+            if container is None or container.node_type == NodeType.TASK:
+                continue
+            pending = self._pending_rows.get(container.task_id)
+            if pending is not None:
+                first, last = min(first, pending[-2]), max(last, pending[-1])
+            self._pending_rows[container.task_id] = self._row(container, first, last)
+
+            kind = (container.node_type, container.chord_callback_id)
+            if self._containers.get(container.task_id) != kind:
+                self._containers[container.task_id] = kind
+                for child_id in container.children:
+                    child = nodes.get(child_id)
+                    if child is not None and child is not node:
+                        self._pending_rows[child_id] = self._row(
+                            child, _first_timestamp_us(child), _last_timestamp_us(child)
+                        )
+
+    def _row(self, node: NodeRecord, first: int, last: int) -> tuple[Any, ...]:
+        """Build a ``tasks`` row for a cached node. Call with lock held."""
+        return (
+            node.task_id,
+            node.node_type.value,
+            node.name,
+            node.state.value,
+            node.parent_id,
+            node.root_id,
+            self._workflow_id(node),
+            node.group_id,
+            node.chord_id,
+            node.chord_callback_id,
+            first,
+            last,
+        )
+
+    def _workflow_id(self, node: NodeRecord) -> str:
+        """Key of the workflow a cached node belongs to. Call with lock held.
+
+        The first root_id found walking up through cached parents; a parent
+        that isn't cached (yet) stands in for the root.
+        """
+        nodes = self._graph.nodes
+        for _ in range(_MAX_DEPTH):
+            if node.root_id is not None or node.parent_id is None:
+                break
+            parent = nodes.get(node.parent_id)
+            if parent is None:
+                return node.parent_id
+            node = parent
+        return node.root_id or node.task_id
+
+    def _flush(self) -> None:
+        """Write pending events, rows and name totals. Call with lock held."""
+        self._last_flush = time.monotonic()
+        if not self._pending_events and not self._pending_rows:
+            return
+        conn = self._conn
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(_INSERT_EVENT, self._pending_events)
+            conn.executemany(_UPSERT_TASK, self._pending_rows.values())
+            conn.executemany(_UPSERT_NAME, map(self._name_row, self._dirty_names))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        self._pending_events.clear()
+        self._pending_rows.clear()
+        self._dirty_names.clear()
+
+    def _name_row(self, name: str) -> tuple[str, int, str]:
+        counts = {state.value: n for state, n in self._name_counts[name].items() if n}
+        return (name, self._name_last[name], json.dumps(counts))
+
+    def _load_name_totals(self) -> None:
+        """Read the per-name totals table into memory."""
+        for name, last_ts, counts in self._conn.execute(
+            "SELECT name, last_ts, counts FROM task_names"
+        ):
+            self._name_counts[name] = Counter(
+                {TaskState(state): n for state, n in json.loads(counts).items()}
+            )
+            self._name_last[name] = last_ts
+            self._history_names.add(name)
+
+    def _rebuild_name_totals(self) -> None:
+        """Recompute per-name totals from the tasks table. Call with lock held."""
+        self._name_counts.clear()
+        self._name_last.clear()
+        self._history_names = TrigramIndex()
+        for name, state, count, last_ts in self._conn.execute(
+            "SELECT name, state, count(*), max(last_ts) FROM tasks"
+            " WHERE node_type = 'TASK' GROUP BY name, state"
+        ):
+            counts = self._name_counts.get(name)
+            if counts is None:
+                counts = self._name_counts[name] = Counter()
+                self._history_names.add(name)
+            counts[TaskState(state)] = count
+            self._name_last[name] = max(self._name_last.get(name, last_ts), last_ts)
+        self._conn.execute("DELETE FROM task_names")
+        self._conn.executemany(_UPSERT_NAME, map(self._name_row, self._name_counts))
+
+    def _reload_workflows(self, event: TaskEvent) -> None:
+        """Load stored workflows the event touches back into the cache.
+
+        Call with lock held. Workflows are cached and evicted whole, so an
+        event whose root (or parent) is cached needs no lookup; otherwise the
+        IDs missing from the cache are looked up on disk.
+        """
+        nodes = self._graph.nodes
+        anchor = event.root_id or event.parent_id
+        if anchor is not None and anchor != event.task_id and anchor in nodes:
+            return
+        missing = [
+            task_id
+            for task_id in dict.fromkeys(
+                (event.task_id, event.parent_id, event.root_id)
+            )
+            if task_id is not None and task_id not in nodes
+        ]
+        if not missing:
+            return
+        if any(task_id in self._pending_rows for task_id in missing):
+            # Evicted before its rows were written
+            self._flush()
+        workflows = self._conn.execute(
+            f"SELECT DISTINCT workflow_id FROM tasks WHERE task_id IN ({_marks(len(missing))})",
+            missing,
+        ).fetchall()
+        if not workflows:
+            return
+        self._flush()
+        for (workflow_id,) in workflows:
+            rows = self._conn.execute(_WORKFLOW_EVENTS, (workflow_id,)).fetchall()
+            cached = {task_id for task_id, _ in rows if task_id in nodes}
+            for task_id, data in rows:
+                if task_id not in cached:
+                    super()._ingest(TaskEvent.model_validate_json(data), replay=True)
+
+    @contextlib.contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection, waiting if all are in use."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    def _sync(self) -> None:
+        """Expire cached workflows and write pending events before a read."""
+        with self._lock:
+            self._maybe_sweep_expired()
+            self._flush()
+
+    def _materialize(
+        self, conn: sqlite3.Connection, rows: Sequence[tuple[Any, ...]]
+    ) -> list[NodeRecord]:
+        """Records for ``tasks`` rows: cached copies, else rebuilt from disk."""
+        with self._lock:
+            nodes = self._graph.nodes
+            cached = {row[0]: nodes[row[0]].copy() for row in rows if row[0] in nodes}
+        cold = self._load_records(conn, [row for row in rows if row[0] not in cached])
+        return [cached.get(row[0]) or cold[row[0]] for row in rows]
+
+    @staticmethod
+    def _load_records(
+        conn: sqlite3.Connection, rows: Sequence[tuple[Any, ...]]
+    ) -> dict[str, NodeRecord]:
+        """Rebuild records from ``tasks`` rows, their events and child rows."""
+        if not rows:
+            return {}
+        ids = [row[0] for row in rows]
+        marks = _marks(len(ids))
+        events: dict[str, list[TaskEvent]] = {task_id: [] for task_id in ids}
+        for task_id, data in conn.execute(
+            f"SELECT task_id, data FROM events WHERE task_id IN ({marks}) ORDER BY seq",
+            ids,
+        ):
+            events[task_id].append(TaskEvent.model_validate_json(data))
+        children: dict[str, list[str]] = {task_id: [] for task_id in ids}
+        for parent_id, child_id in conn.execute(
+            f"SELECT parent_id, task_id FROM tasks WHERE parent_id IN ({marks})"
+            " ORDER BY rowid",
+            ids,
+        ):
+            children[parent_id].append(child_id)
+
+        records = {}
+        for row in rows:
+            task_id, node_type, name, state, parent_id, root_id = row[:6]
+            group_id, chord_id, chord_callback_id = row[7:10]
+            records[task_id] = NodeRecord(
+                task_id=task_id,
+                name=name,
+                state=TaskState(state),
+                node_type=NodeType(node_type),
+                group_id=group_id,
+                chord_id=chord_id,
+                chord_callback_id=chord_callback_id,
+                events=EventLog(events[task_id]),
+                children=OrderedIdSet(children[task_id]),
+                parent_id=parent_id,
+                root_id=root_id,
+            )
+        return records
+
+    def _page(
+        self,
+        where: list[str],
+        params: list[Any],
+        limit: int,
+        offset: int,
+        before: tuple[datetime | None, str] | None,
+        total: int | None = None,
+    ) -> tuple[list[TaskNode], int]:
+        """Run a listing query newest-first and materialize the page.
+
+        The total is counted in SQL unless the caller already knows it.
+        """
+        _, records, total = self._page_rows(where, params, limit, offset, before, total)
+        return [record.to_model() for record in records], total
+
+    def _page_rows(
+        self,
+        where: list[str],
+        params: list[Any],
+        limit: int,
+        offset: int,
+        before: tuple[datetime | None, str] | None,
+        total: int | None = None,
+    ) -> tuple[list[tuple[Any, ...]], list[NodeRecord], int]:
+        """``_page``, also returning the page's ``tasks`` rows."""
+        self._sync()
+        clause = " AND ".join(where)
+        page_clause, page_params = clause, list(params)
+        if before is not None:
+            page_clause += " AND (last_ts, task_id) < (?, ?)"
+            page_params.extend(_position_key(before))
+        with self._reader() as conn:
+            if total is None:
+                total = conn.execute(
+                    f"SELECT count(*) FROM tasks WHERE {clause}", params
+                ).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM tasks WHERE {page_clause}"
+                " ORDER BY last_ts DESC, task_id DESC LIMIT ? OFFSET ?",
+                [*page_params, limit, offset],
+            ).fetchall()
+            records = self._materialize(conn, rows)
+        return rows, records, total
+
+    def get_node(self, task_id: str) -> TaskNode | None:
+        """Get node by ID from the cache, else from disk; None if unknown."""
+        node = super().get_node(task_id)
+        if node is not None:
+            return node
+        self._sync()
+        with self._reader() as conn:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchall()
+            records = self._materialize(conn, rows)
+        return records[0].to_model() if records else None
+
+    def get_nodes(
+        self,
+        *,
+        limit: int = 100,
+        offset: int = 0,
+        state: TaskState | None = None,
+        name_contains: str | None = None,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+        before: tuple[datetime | None, str] | None = None,
+    ) -> tuple[list[TaskNode], int]:
+        """Get task nodes across the stored history, most recent first.
+
+        Same filters and ordering as ``GraphStore.get_nodes``, answered from
+        the ``tasks`` table indexes. Without date filters the total comes
+        from the per-name totals instead of a count over the history.
+        """
+        where = ["node_type = 'TASK'"]
+        params: list[Any] = []
+        if state is not None:
+            where.append("state = ?")
+            params.append(state.value)
+        names = None
+        if name_contains is not None:
+            names = sorted(self.find_task_names(name_contains))
+            if not names:
+                return [], 0
+            where.append(f"name IN ({_marks(len(names))})")
+            params.extend(names)
+        total = None
+        if from_date is None and to_date is None:
+            total = self._count_tasks(state, names)
+        if from_date is not None:
+            where.append("last_ts >= ?")
+            params.append(epoch_us(_ensure_tz_aware(from_date)))
+        if to_date is not None:
+            where.append("first_ts <= ?")
+            params.append(epoch_us(_ensure_end_of_day(to_date)))
+        return self._page(where, params, limit, offset, before, total)
+
+    def _count_tasks(self, state: TaskState | None, names: list[str] | None) -> int:
+        """Count stored tasks by state and name from the per-name totals."""
+        with self._lock:
+            counters = self._name_counts
+            selected = (
+                counters.values()
+                if names is None
+                else [counters[name] for name in names if name in counters]
+            )
+            if state is None:
+                return sum(sum(counts.values()) for counts in selected)
+            return sum(counts[state] for counts in selected)
+
+    def get_root_workflows(
+        self,
+        *,
+        limit: int = 50,
+        offset: int = 0,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+        before: tuple[datetime | None, str] | None = None,
+    ) -> tuple[list[RootWorkflow], int]:
+        """Get root nodes across the stored history, most recent first.
+
+        Same filters and ordering as ``GraphStore.get_root_workflows``, on
+        the rows' time ranges. Cached workflows take the summaries kept at
+        ingestion; evicted ones are aggregated from their task rows in one
+        query per page.
+        """
+        where = [_IS_ROOT]
+        params: list[Any] = []
+        if from_date is not None:
+            where.append("last_ts >= ?")
+            params.append(epoch_us(_ensure_tz_aware(from_date)))
+        if to_date is not None:
+            where.append("first_ts <= ?")
+            params.append(epoch_us(_ensure_end_of_day(to_date)))
+        rows, records, total = self._page_rows(where, params, limit, offset, before)
+
+        summaries: dict[str, WorkflowSummary | None] = {}
+        with self._lock:
+            graph = self._graph
+            self._workflows.resolve(graph)
+            for row in rows:
+                if row[0] in graph.nodes:
+                    summaries[row[0]] = self._workflows.summary(graph, row[0])
+        cold = {row[6]: row[0] for row in rows if row[0] not in summaries}
+        if cold:
+            summaries.update(self._stored_summaries(cold))
+        return [
+            RootWorkflow(
+                record.to_model(),
+                _from_row_us(row[10]),
+                _from_row_us(row[11]),
+                summaries.get(row[0]),
+            )
+            for row, record in zip(rows, records, strict=True)
+        ], total
+
+    def _stored_summaries(self, roots: dict[str, str]) -> dict[str, WorkflowSummary]:
+        """Summaries aggregated from stored task rows, by root ID.
+
+        Args:
+            roots: Workflow key -> root ID of the workflows to summarize.
+        """
+        counts: dict[str, dict[TaskState, int]] = {}
+        spans: dict[str, tuple[int, int]] = {}
+        with self._reader() as conn:
+            for workflow_id, state, count, first, last in conn.execute(
+                "SELECT workflow_id, state, count(*), min(first_ts), max(last_ts)"
+                " FROM tasks WHERE node_type = 'TASK' AND workflow_id IN"
+                f" ({_marks(len(roots))}) GROUP BY workflow_id, state",
+                list(roots),
+            ):
+                counts.setdefault(workflow_id, {})[TaskState(state)] = count
+                low, high = spans.get(workflow_id, (first, last))
+                spans[workflow_id] = (min(low, first), max(high, last))
+        summaries = {}
+        for workflow_id, root_id in roots.items():
+            first, last = spans.get(workflow_id, (_MIN_TIMESTAMP_US,) * 2)
+            summaries[root_id] = WorkflowSummary.from_counts(
+                root_id,
+                counts.get(workflow_id, {}),
+                first if first != _MIN_TIMESTAMP_US else None,
+                last if last != _MIN_TIMESTAMP_US else None,
+            )
+        return summaries
+
+    def get_children(self, task_id: str) -> list[TaskNode]:
+        """Get child nodes of a task, cached or stored."""
+        with self._lock:
+            cached = task_id in self._graph.nodes
+        if cached:
+            return super().get_children(task_id)
+        self._sync()
+        with self._reader() as conn:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM tasks WHERE parent_id = ? ORDER BY rowid",
+                (task_id,),
+            ).fetchall()
+            records = self._materialize(conn, rows)
+        return [record.to_model() for record in records]
+
+    def get_graph_from_root(self, root_id: str) -> dict[str, TaskNode]:
+        """Get all nodes in a workflow, replaying stored events if not cached."""
+        with self._lock:
+            cached = root_id in self._graph.nodes
+        if cached:
+            return super().get_graph_from_root(root_id)
+        self._sync()
+        with self._reader() as conn:
+            row = conn.execute(
+                "SELECT workflow_id FROM tasks WHERE task_id = ?", (root_id,)
+            ).fetchone()
+            workflow_id = row[0] if row is not None else root_id
+            data = [d for _, d in conn.execute(_WORKFLOW_EVENTS, (workflow_id,))]
+        replay = GraphStore(sys.maxsize)
+        replay.restore_graph(
+            TaskGraph.from_events(TaskEvent.model_validate_json(item) for item in data)
+        )
+        return replay.get_graph_from_root(root_id)
+
+    def get_unique_task_names(self) -> set[str]:
+        """Get every task name in the stored history."""
+        with self._lock:
+            return set(self._name_counts)
+
+    def find_task_names(self, query: str) -> set[str]:
+        """Get stored task names containing query, ignoring case."""
+        with self._lock:
+            return self._history_names.search(query)
+
+    def get_task_execution_count(self, task_name: str) -> int:
+        """Get the number of stored executions of a task name."""
+        with self._lock:
+            counts = self._name_counts.get(task_name)
+            return sum(counts.values()) if counts is not None else 0
+
+    def get_last_execution_time(self, task_name: str) -> datetime | None:
+        """Get the latest stored event time for a task name (UTC)."""
+        with self._lock:
+            last = self._name_last.get(task_name)
+        return None if last is None else _EPOCH + timedelta(microseconds=last)
+
+    def get_task_name_stats(
+        self, names: Iterable[str] | None = None
+    ) -> dict[str, TaskNameStats]:
+        """Get per-name aggregates over the stored history.
+
+        Totals are kept in memory (and in the ``task_names`` table across
+        restarts), so this costs O(names) like the in-memory store.
+        """
+        with self._lock:
+            totals = {
+                name: (sum(counts.values()), counts.copy(), self._name_last[name])
+                for name, counts in self._name_counts.items()
+            }
+        stats: dict[str, TaskNameStats] = {}
+        for name in list(totals) if names is None else names:
+            total = totals.get(name)
+            if total is None:
+                stats[name] = TaskNameStats(name=name)
+                continue
+            count, counts, last = total
+            stats[name] = TaskNameStats(
+                name=name,
+                execution_count=count,
+                success_count=counts[TaskState.SUCCESS],
+                failure_count=counts[TaskState.FAILURE],
+                last_run=_EPOCH + timedelta(microseconds=last),
+            )
+        return stats
@@ -3,17 +3,40 @@
 from __future__ import annotations
 
 import contextlib
+import heapq
+import sys
 import threading
+import time
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING
+from itertools import islice, takewhile
+from types import MappingProxyType
+from typing import TYPE_CHECKING, ClassVar, NamedTuple
 
 from pydantic import BaseModel
 
-from stemtrace.core.graph import NodeType, TaskGraph, TaskNode
+from stemtrace.core.event_log import epoch_us
+from stemtrace.core.events import TERMINAL_STATES, TaskState
+from stemtrace.core.graph import NodeType, TaskGraph
 from stemtrace.server.api.schemas import WorkerStatus
+from stemtrace.server.failures import FailureGroup, FailureIndex
+from stemtrace.server.indexes import (
+    NodeIdIndex,
+    SortedKeyList,
+    TaskNameIndex,
+    TrigramIndex,
+)
+from stemtrace.server.latency import LatencyIndex, TaskLatencyStats
+from stemtrace.server.payload_segments import PayloadSegmentLog
+from stemtrace.server.timeseries import Resolution, Timeseries, TimeseriesIndex
+from stemtrace.server.workflows import WorkflowIndex, WorkflowSummary
 
 if TYPE_CHECKING:
+    import os
+    from collections.abc import Mapping
+
+    from stemtrace.core.event_log import EventLog
     from stemtrace.core.events import RegisteredTaskDefinition, TaskEvent
+    from stemtrace.core.graph import NodeRecord, TaskNode
 
 
 class WorkerInfo(BaseModel):
@@ -27,6 +50,57 @@ class WorkerInfo(BaseModel):
     status: WorkerStatus = WorkerStatus.ONLINE
 
 
+class StoreSummary(NamedTuple):
+    """Immutable summary of a GraphStore, published after every write.
+
+    Readers take the current summary without locking; all fields describe
+    the same store version.
+    """
+
+    version: int
+    node_count: int
+    estimated_bytes: int
+    state_counts: Mapping[TaskState, int]
+
+
+_EMPTY_SUMMARY = StoreSummary(0, 0, 0, MappingProxyType({}))
+
+
+class RootWorkflow(NamedTuple):
+    """A root node as listed by ``GraphStore.get_root_workflows``.
+
+    first_seen and last_updated are the times the root is filtered and
+    ordered by: its own first and latest event, or its workflow's for a
+    GROUP/CHORD root.
+    """
+
+    node: TaskNode
+    first_seen: datetime | None
+    last_updated: datetime | None
+    summary: WorkflowSummary | None
+
+    @classmethod
+    def of(cls, node: TaskNode, summary: WorkflowSummary | None) -> RootWorkflow:
+        """Build the entry for a root node and its workflow summary."""
+        if node.events:
+            return cls(
+                node, node.events[0].timestamp, node.events[-1].timestamp, summary
+            )
+        if summary is None:
+            return cls(node, None, None, None)
+        return cls(node, summary.first_seen, summary.last_updated, summary)
+
+
+class TaskNameStats(BaseModel):
+    """Aggregates over the task nodes in the store sharing one task name."""
+
+    name: str
+    execution_count: int = 0
+    success_count: int = 0
+    failure_count: int = 0
+    last_run: datetime | None = None
+
+
 def _ensure_tz_aware(dt: datetime) -> datetime:
     """Ensure datetime is timezone-aware (assume UTC if naive)."""
     if dt.tzinfo is None:
@@ -48,50 +122,57 @@ def _ensure_end_of_day(dt: datetime) -> datetime:
     return dt
 
 
-# Fallback for nodes with no events (synthetic nodes)
-_MIN_DATETIME = datetime.min.replace(tzinfo=timezone.utc)
+# Sort key for nodes without events (synthetic nodes)
+_MIN_TIMESTAMP_US = -(2**63)
+
+# Estimated bytes per node outside its event log: the NodeRecord, its ID
+# string and children set, graph index entries and the store's own indexes.
+# Calibrated with tracemalloc against benchmarks/bench_memory.py.
+_NODE_BYTES = 1320
+
+# Bounds (seconds) on how often the retention sweep runs: a tenth of the
+# retention window, clamped to this range.
+_MIN_SWEEP_INTERVAL = 1.0
+_MAX_SWEEP_INTERVAL = 60.0
+
+# first event + first event with arguments + latest event
+_MIN_EVENTS_PER_NODE = 3
+
+# States of a task that was sent or received but has not started running.
+_QUEUED_STATES = frozenset({TaskState.PENDING, TaskState.RECEIVED})
 
 
-def _get_node_timestamp(node: TaskNode, graph: TaskGraph) -> datetime:
-    """Get the most recent timestamp for a node (including children for synthetic nodes)."""
-    if node.events:
-        return node.events[-1].timestamp
+def _args_anchor(events: EventLog) -> int:
+    """Index of the first event carrying task arguments (0 if none does)."""
+    for idx in range(len(events)):
+        if events.has_arguments(idx):
+            return idx
+    return 0
 
-    # For synthetic nodes (GROUP/CHORD), use the latest child timestamp
-    if node.node_type in (NodeType.GROUP, NodeType.CHORD) and node.children:
-        child_timestamps: list[datetime] = []
-        for child_id in node.children:
-            child = graph.get_node(child_id)
-            if child and child.events:
-                child_timestamps.append(child.events[-1].timestamp)
-        if child_timestamps:
-            return max(child_timestamps)
 
-    return _MIN_DATETIME
+def _position_key(position: tuple[datetime | None, str]) -> tuple[int, str]:
+    """Index key for a (latest event time, task_id) page position."""
+    timestamp, task_id = position
+    if timestamp is None:
+        return (_MIN_TIMESTAMP_US, task_id)
+    return (epoch_us(timestamp), task_id)
 
 
-def _get_first_timestamp(node: TaskNode, graph: TaskGraph) -> datetime:
-    """Get the first timestamp for a node (including children for synthetic nodes)."""
-    if node.events:
-        return node.events[0].timestamp
+def _first_timestamp_us(node: NodeRecord) -> int:
+    """Sort key: the node's first event time (synthetic nodes sort first)."""
+    return node.events.timestamp_us(0) if node.events else _MIN_TIMESTAMP_US
 
-    # For synthetic nodes (GROUP/CHORD), use the earliest child timestamp
-    if node.node_type in (NodeType.GROUP, NodeType.CHORD) and node.children:
-        child_timestamps: list[datetime] = []
-        for child_id in node.children:
-            child = graph.get_node(child_id)
-            if child and child.events:
-                child_timestamps.append(child.events[0].timestamp)
-        if child_timestamps:
-            return min(child_timestamps)
 
-    return _MIN_DATETIME
+def _last_timestamp_us(node: NodeRecord) -> int:
+    """Sort key: the node's latest event time (synthetic nodes sort first)."""
+    return node.events.timestamp_us(-1) if node.events else _MIN_TIMESTAMP_US
 
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
+    from collections.abc import Set as AbstractSet
 
-    from stemtrace.core.events import TaskEvent, TaskState
+    from stemtrace.core.events import TaskEvent
 
 
 class WorkerRegistry:
@@ -294,31 +375,264 @@ class WorkerRegistry:
             for worker_id in to_remove:
                 del self._workers[worker_id]
 
+    def export_state(
+        self,
+    ) -> tuple[list[WorkerInfo], dict[str, RegisteredTaskDefinition]]:
+        """Copy the registry's workers and task definitions (for snapshots).
+
+        Returns:
+            Detached copies of every WorkerInfo and the task definitions map.
+        """
+        with self._lock:
+            return (
+                [worker.model_copy(deep=True) for worker in self._workers.values()],
+                dict(self._task_definitions_by_name),
+            )
+
+    def restore_state(
+        self,
+        workers: list[WorkerInfo],
+        task_definitions: dict[str, RegisteredTaskDefinition],
+    ) -> None:
+        """Replace the registry's contents with previously exported state.
+
+        Args:
+            workers: Workers as returned by ``export_state()``.
+            task_definitions: Task definitions as returned by ``export_state()``.
+        """
+        with self._lock:
+            self._workers = {
+                f"{worker.hostname}:{worker.pid}": worker for worker in workers
+            }
+            self._task_definitions_by_name = dict(task_definitions)
+
 
 class GraphStore:
-    """Thread-safe in-memory store for TaskGraph with LRU eviction."""
+    """Thread-safe in-memory store for TaskGraph with oldest-workflow eviction.
+
+    Nodes are kept as internal NodeRecords; every read method returns
+    detached TaskNode snapshots, so callers never see (or mutate) live state.
+    Readers hold the lock only while copying the records they need (cheap
+    column copies) and build the TaskNode models after releasing it. Counts
+    and size are published as an immutable ``StoreSummary`` after each write
+    and read without the lock.
+    """
+
+    # Whether the store keeps its own durable history, so snapshots of the
+    # in-memory graph must not be restored into it.
+    persists_history: ClassVar[bool] = False
 
-    def __init__(self, max_nodes: int = 10000) -> None:
-        """Initialize store with optional maximum node limit for LRU eviction."""
+    def __init__(
+        self,
+        max_nodes: int = 10000,
+        *,
+        max_events_per_node: int | None = None,
+        compact_event_history: bool = False,
+        protect_active_workflows: bool = False,
+        max_memory_bytes: int | None = None,
+        retention_seconds: float | None = None,
+        payload_dir: str | os.PathLike[str] | None = None,
+        max_payload_bytes: int | None = None,
+    ) -> None:
+        """Initialize store with optional limits on node count and event history.
+
+        Args:
+            max_nodes: Maximum number of nodes before the oldest workflows are
+                evicted. Workflows (a root task, its descendants, group
+                containers and tasks sharing its root_id) are evicted whole,
+                oldest first task first, until 90% of max_nodes remain.
+            max_events_per_node: Maximum events kept per node (at least 3).
+                When exceeded, the oldest intermediate events are dropped; the
+                first event, the first event with arguments and the latest
+                event are always kept. None keeps every event.
+            compact_event_history: Replace intermediate events with payload-free
+                summaries (state, timestamp, retries). The first event with
+                arguments, terminal events and the latest event keep their
+                args/kwargs/result/exception/traceback.
+            protect_active_workflows: Skip workflows that still have a task in
+                a non-terminal state when evicting. While such workflows fill
+                the store it can grow past max_nodes; eviction is then retried
+                after every further 10% of max_nodes.
+            max_memory_bytes: Budget for the store's estimated size (see
+                ``estimated_bytes``). When exceeded, the oldest workflows are
+                evicted until the estimate is back under 90% of the budget.
+                None (default) limits by max_nodes only.
+            retention_seconds: Evict workflows whose latest event is older than
+                this, regardless of max_nodes. Checked during ingestion and
+                task list reads at most every tenth of the window (1-60 s).
+                In-flight workflows are not protected. None (default) keeps
+                nodes until capacity eviction.
+            payload_dir: Directory for a ``PayloadSegmentLog``. Event payloads
+                (args, kwargs, result, exception, traceback) are then written
+                to memory-mapped segment files, in a subdirectory of its own
+                that ``close()`` removes, and nodes keep references;
+                ``estimated_bytes`` counts the references. The files do not
+                survive a restart. None (default) keeps payloads on the heap.
+            max_payload_bytes: Drop the oldest payload segments once they
+                hold more than this; events lose the payloads that were in
+                them. Requires payload_dir. None keeps every segment.
+
+        Raises:
+            ValueError: If max_events_per_node is below 3, max_memory_bytes,
+                retention_seconds or max_payload_bytes is not positive, or
+                max_payload_bytes is set without payload_dir.
+        """
+        if (
+            max_events_per_node is not None
+            and max_events_per_node < _MIN_EVENTS_PER_NODE
+        ):
+            raise ValueError(
+                f"max_events_per_node must be at least {_MIN_EVENTS_PER_NODE}, "
+                f"got {max_events_per_node}"
+            )
+        if max_memory_bytes is not None and max_memory_bytes <= 0:
+            raise ValueError(
+                f"max_memory_bytes must be positive, got {max_memory_bytes}"
+            )
+        if retention_seconds is not None and retention_seconds <= 0:
+            raise ValueError(
+                f"retention_seconds must be positive, got {retention_seconds}"
+            )
+        if max_payload_bytes is not None and payload_dir is None:
+            raise ValueError("max_payload_bytes requires payload_dir")
+        self._payloads = (
+            PayloadSegmentLog(payload_dir, max_bytes=max_payload_bytes)
+            if payload_dir is not None
+            else None
+        )
         self._graph = TaskGraph()
         self._lock = threading.RLock()
         self._max_nodes = max_nodes
+        self._max_events_per_node = max_events_per_node
+        self._compact_event_history = compact_event_history
+        self._protect_active_workflows = protect_active_workflows
+        self._max_memory_bytes = max_memory_bytes
+        # Sum of EventLog.nbytes over all nodes
+        self._event_bytes = 0
+        self._retention_seconds = retention_seconds
+        self._sweep_interval = (
+            min(max(retention_seconds / 10, _MIN_SWEEP_INTERVAL), _MAX_SWEEP_INTERVAL)
+            if retention_seconds is not None
+            else 0.0
+        )
+        self._last_sweep = time.monotonic()
+        # Min-heap of (first event time in epoch µs, task_id), one entry per
+        # TASK node created; entries of evicted nodes are skipped when popped.
+        self._ages: list[tuple[int, str]] = []
+        # Node count / byte estimate below which a blocked eviction pass
+        # isn't retried
+        self._evict_retry_size = 0
+        self._evict_retry_bytes = 0
+        # (latest event time in epoch µs, task_id) for every TASK node
+        self._recency: SortedKeyList[tuple[int, str]] = SortedKeyList()
+        # TASK node IDs by current state; recency keys and state counts by name
+        self._by_state: NodeIdIndex[TaskState] = NodeIdIndex()
+        self._by_name = TaskNameIndex()
+        # Substring search over the distinct names in _by_name
+        self._name_search = TrigramIndex()
+        # Runtime/queue-wait sketches by name and hour; outlives eviction
+        self._latency = LatencyIndex()
+        # Event counters per minute/hour, overall and by name; outlive eviction
+        self._timeseries = TimeseriesIndex()
+        # FAILURE events by exception fingerprint; outlive eviction
+        self._failures = FailureIndex()
+        # Task count, states and time span per workflow
+        self._workflows = WorkflowIndex()
         self._listeners: list[Callable[[TaskEvent], None]] = []
+        # Replaced (never mutated) by _publish; read without the lock
+        self._summary = _EMPTY_SUMMARY
 
     def add_event(self, event: TaskEvent) -> None:
         """Add event to graph and notify listeners."""
         with self._lock:
-            self._graph.add_event(event)
+            self._ingest(event)
             self._maybe_evict()
+            self._maybe_sweep_expired()
+            self._publish()
 
         for listener in self._listeners:
             with contextlib.suppress(Exception):
                 listener(event)
 
+    def _ingest(self, event: TaskEvent, *, replay: bool = False) -> None:
+        """Apply one event to the graph and indexes. Call with lock held.
+
+        Args:
+            event: Event to apply.
+            replay: The event was applied before (e.g. it is being reloaded
+                from disk), so it is not counted in the latency stats,
+                timeseries or failure groups again.
+        """
+        if not replay:
+            self._timeseries.add(event.name, event.state, epoch_us(event.timestamp))
+            if event.state == TaskState.FAILURE:
+                self._failures.add(event)
+        node = self._graph.get_node(event.task_id)
+        previous = None
+        if node is not None:
+            self._event_bytes -= node.events.nbytes
+            if node.node_type == NodeType.TASK:
+                previous = ((_last_timestamp_us(node), node.task_id), node.state)
+                self._recency.discard(previous[0])
+        relinked = self._graph.add_event(event)
+        node = self._graph.get_node(event.task_id)
+        if node is not None:
+            self._workflows.update(
+                self._graph,
+                node,
+                (previous[1], previous[0][0]) if previous is not None else None,
+                relinked=relinked,
+            )
+            if self._max_events_per_node is not None or self._compact_event_history:
+                self._trim_history(node)
+            if self._payloads is not None:
+                node.events.spill_payload(-1, self._payloads)
+            self._event_bytes += node.events.nbytes
+            if node.node_type == NodeType.TASK:
+                self._index_task(node, previous)
+                if previous is not None and not replay:
+                    self._record_latency(node, event, previous[0][0], previous[1])
+
+    def _record_latency(
+        self,
+        node: NodeRecord,
+        event: TaskEvent,
+        previous_us: int,
+        previous_state: TaskState,
+    ) -> None:
+        """Record the queue wait or runtime event completes. Call with lock held.
+
+        Queue wait runs from a task's first (PENDING/RECEIVED) event to its
+        first STARTED event; runtime from a STARTED event to the SUCCESS or
+        FAILURE event right after it. Retried attempts only count runtime.
+        """
+        state = event.state
+        if state == TaskState.STARTED:
+            if (
+                previous_state in _QUEUED_STATES
+                and event.retries == 0
+                and node.events.state(0) in _QUEUED_STATES
+            ):
+                at_us = epoch_us(event.timestamp)
+                waited_us = at_us - node.events.timestamp_us(0)
+                if waited_us >= 0:
+                    self._latency.add_queue_wait(node.name, at_us, waited_us / 1e6)
+        elif (
+            state in (TaskState.SUCCESS, TaskState.FAILURE)
+            and previous_state == TaskState.STARTED
+        ):
+            at_us = epoch_us(event.timestamp)
+            if at_us >= previous_us:
+                self._latency.add_runtime(node.name, at_us, (at_us - previous_us) / 1e6)
+
     def get_node(self, task_id: str) -> TaskNode | None:
         """Get node by ID, or None if not found."""
         with self._lock:
-            return self._graph.get_node(task_id)
+            node = self._graph.get_node(task_id)
+            if node is None:
+                return None
+            node = node.copy()
+        return node.to_model()
 
     def get_nodes(
         self,
@@ -329,39 +643,118 @@ class GraphStore:
         name_contains: str | None = None,
         from_date: datetime | None = None,
         to_date: datetime | None = None,
+        before: tuple[datetime | None, str] | None = None,
     ) -> tuple[list[TaskNode], int]:
         """Get nodes with optional filtering, most recent first.
 
         Excludes synthetic nodes (GROUP, CHORD) which are for graph
-        visualization only.
+        visualization only. Nodes are ordered by (latest event time,
+        task_id), descending.
+
+        Args:
+            limit: Maximum number of nodes to return.
+            offset: Number of matching nodes to skip (after ``before``).
+            state: Only nodes currently in this state.
+            name_contains: Only nodes whose name contains this, ignoring case.
+            from_date: Only nodes with an event at or after this time.
+            to_date: Only nodes whose first event is on or before this time.
+            before: Start after this sort position - the (latest event time,
+                task_id) of the last node of the previous page. Positions are
+                stable while new events arrive, unlike offsets.
 
         Returns:
             Tuple of (filtered nodes, total count matching filters).
         """
         with self._lock:
-            # Exclude synthetic nodes (GROUP, CHORD) - they're for graphs, not task list
-            nodes = [
-                n for n in self._graph.nodes.values() if n.node_type == NodeType.TASK
-            ]
+            self._maybe_sweep_expired()
+            # Synthetic nodes are never indexed, so they're excluded here.
+            low = None
+            if from_date is not None:
+                low = (epoch_us(_ensure_tz_aware(from_date)), "")
+            below = _position_key(before) if before is not None else None
+            nodes = self._graph.nodes
+
+            if state is None and name_contains is None and to_date is None:
+                total = (
+                    len(self._recency)
+                    if low is None
+                    else self._recency.count_at_least(low)
+                )
+                page = islice(
+                    self._recency.descending(low, below=below, offset=offset), limit
+                )
+                records = [nodes[task_id].copy() for _, task_id in page]
+            else:
+                records, total = self._filter_nodes(
+                    limit, offset, state, name_contains, low, to_date, below
+                )
+        return [record.to_model() for record in records], total
 
+    def _filter_nodes(
+        self,
+        limit: int,
+        offset: int,
+        state: TaskState | None,
+        name_contains: str | None,
+        low: tuple[int, str] | None,
+        to_date: datetime | None,
+        below: tuple[int, str] | None,
+    ) -> tuple[list[NodeRecord], int]:
+        """Run a filtered ``get_nodes`` query. Call with lock held.
+
+        Returns:
+            Tuple of (copied records for the page, total count matching).
+        """
+        nodes = self._graph.nodes
+        # Walk the smallest source in recency order: the matching names'
+        # key lists (already sorted, merged lazily), the state bucket
+        # (sorted here), or the whole recency index.
+        candidates: AbstractSet[str] | None = None
         if state is not None:
-            nodes = [n for n in nodes if n.state == state]
+            candidates = self._by_state.get(state)
+        names = None
+        keys: Iterable[tuple[int, str]] | None = None
         if name_contains is not None:
-            name_lower = name_contains.lower()
-            nodes = [n for n in nodes if name_lower in n.name.lower()]
-        if from_date is not None:
-            from_dt = _ensure_tz_aware(from_date)
-            nodes = [n for n in nodes if n.events and n.events[-1].timestamp >= from_dt]
-        if to_date is not None:
-            to_dt = _ensure_end_of_day(to_date)
-            nodes = [n for n in nodes if n.events and n.events[0].timestamp <= to_dt]
-
-        nodes.sort(
-            key=lambda n: n.events[-1].timestamp if n.events else _MIN_DATETIME,
-            reverse=True,
-        )
-        total = len(nodes)
-        return nodes[offset : offset + limit], total
+            names = self._name_search.search(name_contains)
+            by_name = self._by_name
+            named = sum(map(by_name.count, names))
+            if candidates is None or named < len(candidates):
+                candidates = None
+                keys = heapq.merge(
+                    *(by_name.descending(name, low) for name in names),
+                    reverse=True,
+                )
+
+        if candidates is not None:
+            keys = sorted(
+                (
+                    (_last_timestamp_us(nodes[task_id]), task_id)
+                    for task_id in candidates
+                ),
+                reverse=True,
+            )
+        elif keys is None:
+            keys = self._recency.descending(low)
+
+        to_us = epoch_us(_ensure_end_of_day(to_date)) if to_date is not None else None
+        matches: list[NodeRecord] = []
+        start = offset  # matches at or above the cursor come first
+        for key in keys:
+            if low is not None and key < low:
+                break
+            node = nodes[key[1]]
+            if state is not None and node.state != state:
+                continue
+            if names is not None and node.name not in names:
+                continue
+            if to_us is not None and node.events.timestamp_us(0) > to_us:
+                continue
+            matches.append(node)
+            if below is not None and key >= below:
+                start += 1
+
+        total = len(matches)
+        return [n.copy() for n in matches[start : start + limit]], total
 
     def get_root_nodes(
         self,
@@ -370,76 +763,185 @@ class GraphStore:
         offset: int = 0,
         from_date: datetime | None = None,
         to_date: datetime | None = None,
+        before: tuple[datetime | None, str] | None = None,
     ) -> tuple[list[TaskNode], int]:
         """Get root nodes (no parent), most recent first.
 
+        Same filters and ordering as ``get_root_workflows``, without the
+        summaries.
+
         Returns:
             Tuple of (filtered root nodes, total count matching filters).
         """
+        roots, total = self.get_root_workflows(
+            limit=limit,
+            offset=offset,
+            from_date=from_date,
+            to_date=to_date,
+            before=before,
+        )
+        return [root.node for root in roots], total
+
+    def get_root_workflows(
+        self,
+        *,
+        limit: int = 50,
+        offset: int = 0,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+        before: tuple[datetime | None, str] | None = None,
+    ) -> tuple[list[RootWorkflow], int]:
+        """Get root nodes with their workflow summaries, most recent first.
+
+        Roots are ordered by (latest event time, task_id), descending; a
+        GROUP/CHORD root, having no events of its own, takes the first and
+        latest event times of its workflow. Workflow summaries are kept up
+        to date at ingestion, so a page is one pass over the roots and no
+        workflow is walked.
+
+        Args:
+            limit: Maximum number of roots to return.
+            offset: Number of matching roots to skip (after ``before``).
+            from_date: Only roots with an event at or after this time.
+            to_date: Only roots whose first event is on or before this time.
+            before: Start after this sort position - the (latest event time,
+                task_id) of the last root of the previous page, with a None
+                time for roots without timed events.
+
+        Returns:
+            Tuple of (filtered roots, total count matching filters).
+        """
         with self._lock:
-            root_nodes = [
-                self._graph.nodes[rid]
-                for rid in self._graph.root_ids
-                if rid in self._graph.nodes
+            self._maybe_sweep_expired()
+            graph = self._graph
+            nodes = graph.nodes
+            self._workflows.resolve(graph)
+            spans = [
+                self._root_span(nodes[rid]) for rid in graph.root_ids if rid in nodes
             ]
-
-            # Date filtering - use child timestamps for synthetic nodes
             if from_date is not None:
-                from_dt = _ensure_tz_aware(from_date)
-                root_nodes = [
-                    n
-                    for n in root_nodes
-                    if _get_node_timestamp(n, self._graph) >= from_dt
-                ]
+                from_us = epoch_us(_ensure_tz_aware(from_date))
+                spans = [span for span in spans if span[1] >= from_us]
             if to_date is not None:
-                to_dt = _ensure_end_of_day(to_date)
-                root_nodes = [
-                    n
-                    for n in root_nodes
-                    if _get_first_timestamp(n, self._graph) <= to_dt
-                ]
-
-            # Sort while holding lock since we need access to graph for children
-            root_nodes.sort(
-                key=lambda n: _get_node_timestamp(n, self._graph),
-                reverse=True,
+                to_us = epoch_us(_ensure_end_of_day(to_date))
+                spans = [span for span in spans if span[0] <= to_us]
+
+            total = len(spans)
+            keys: Iterable[tuple[int, str]] = (
+                (last_us, task_id) for _, last_us, task_id in spans
             )
-            total = len(root_nodes)
-        return root_nodes[offset : offset + limit], total
+            if before is not None:
+                below = _position_key(before)
+                keys = (key for key in keys if key < below)
+            page = heapq.nlargest(offset + limit, keys)[offset:]
+            records = [
+                (nodes[task_id].copy(), self._workflows.summary(graph, task_id))
+                for _, task_id in page
+            ]
+        return [
+            RootWorkflow.of(record.to_model(), summary) for record, summary in records
+        ], total
+
+    def _root_span(self, node: NodeRecord) -> tuple[int, int, str]:
+        """(first, latest event time in epoch µs, task_id) of a root.
+
+        Synthetic roots use their workflow's span. Call with lock held.
+        """
+        events = node.events
+        if events:
+            return (events.timestamp_us(0), events.timestamp_us(-1), node.task_id)
+        first_us, last_us = self._workflows.span(self._graph, node.task_id)
+        if first_us is None or last_us is None:
+            return (_MIN_TIMESTAMP_US, _MIN_TIMESTAMP_US, node.task_id)
+        return (first_us, last_us, node.task_id)
 
     def get_children(self, task_id: str) -> list[TaskNode]:
         """Get child nodes of a task."""
         with self._lock:
-            node = self._graph.get_node(task_id)
+            nodes = self._graph.nodes
+            node = nodes.get(task_id)
             if node is None:
                 return []
-            return [
-                self._graph.nodes[cid]
-                for cid in node.children
-                if cid in self._graph.nodes
-            ]
+            records = [nodes[cid].copy() for cid in node.children if cid in nodes]
+        return [record.to_model() for record in records]
 
     def get_graph_from_root(self, root_id: str) -> dict[str, TaskNode]:
-        """Get all nodes in subgraph starting from root."""
-        with self._lock:
-            root = self._graph.get_node(root_id)
-            if root is None:
-                return {}
+        """Get all nodes in a workflow: the root's subgraph plus indexed members.
 
-            result: dict[str, TaskNode] = {}
-            to_visit = [root_id]
+        Members are found through the graph's root_id index, so tasks whose
+        parent is missing (not yet received, or evicted) are still included,
+        along with the GROUP/CHORD containers they sit in. Cost is
+        proportional to the workflow, not the store.
+        """
+        with self._lock:
+            to_visit = [root_id, *self._graph.get_workflow_members(root_id)]
+            records: dict[str, NodeRecord] = {}
 
             while to_visit:
                 current_id = to_visit.pop()
-                if current_id in result:
+                if current_id in records:
                     continue
                 node = self._graph.get_node(current_id)
                 if node is None:
                     continue
-                result[current_id] = node
+                records[current_id] = node.copy()
                 to_visit.extend(node.children)
+                if node.parent_id is not None and node.parent_id.startswith("group:"):
+                    to_visit.append(node.parent_id)
+
+        return {task_id: record.to_model() for task_id, record in records.items()}
 
-            return result
+    def clone_graph(self) -> TaskGraph:
+        """Return a detached copy of the graph, e.g. to write a snapshot.
+
+        Holds the lock for one O(nodes) ``TaskGraph.clone()`` (column copies,
+        no model building), so the copy can be serialized while ingestion
+        carries on.
+        """
+        with self._lock:
+            return self._graph.clone()
+
+    def restore_graph(self, graph: TaskGraph) -> None:
+        """Replace the store's contents with graph, e.g. from a snapshot.
+
+        The graph's own indexes are taken as they are; the store's indexes
+        (recency, state, name, ages, size estimate) are rebuilt from its
+        records in O(N log N) without re-applying any events. Capacity limits
+        are applied afterwards.
+
+        Args:
+            graph: Graph to adopt. The store takes ownership of it.
+        """
+        with self._lock:
+            self._graph = graph
+            self._event_bytes = 0
+            self._ages = []
+            self._evict_retry_size = 0
+            self._evict_retry_bytes = 0
+            self._recency = SortedKeyList()
+            self._by_state = NodeIdIndex()
+            self._by_name = TaskNameIndex()
+            self._name_search = TrigramIndex()
+            # Summaries are counted again as the roots are first read
+            self._workflows = WorkflowIndex()
+            for node in graph.nodes.values():
+                node.name = sys.intern(node.name)
+                if self._payloads is not None:
+                    for row in range(len(node.events)):
+                        node.events.spill_payload(row, self._payloads)
+                self._event_bytes += node.events.nbytes
+                if node.node_type == NodeType.TASK:
+                    self._index_task(node, None)
+            self._maybe_evict()
+            self._publish()
+
+    def close(self) -> None:
+        """Release resources held by the store (the payload segments, if any).
+
+        Payloads still referenced by nodes read as absent afterwards.
+        """
+        if self._payloads is not None:
+            self._payloads.close()
 
     def add_listener(self, callback: Callable[[TaskEvent], None]) -> None:
         """Register callback for new events (used by WebSocket manager)."""
@@ -450,11 +952,35 @@ class GraphStore:
         with contextlib.suppress(ValueError):
             self._listeners.remove(callback)
 
+    @property
+    def summary(self) -> StoreSummary:
+        """Latest published summary (version, counts, size); never blocks."""
+        return self._summary
+
+    @property
+    def version(self) -> int:
+        """Write counter, bumped by every event and eviction sweep; never blocks."""
+        return self._summary.version
+
     @property
     def node_count(self) -> int:
         """Current node count."""
-        with self._lock:
-            return len(self._graph.nodes)
+        return self._summary.node_count
+
+    @property
+    def estimated_bytes(self) -> int:
+        """Estimated memory held by the store's nodes, events and indexes.
+
+        Maintained incrementally: a fixed cost per node plus each node's event
+        log (columns and payload sizes), so a task with many retries or large
+        arguments counts for more than a bare success.
+        """
+        return self._summary.estimated_bytes
+
+    @property
+    def max_memory_bytes(self) -> int | None:
+        """Memory budget driving eviction, or None if limited by max_nodes only."""
+        return self._max_memory_bytes
 
     def get_unique_task_names(self) -> set[str]:
         """Get all unique task names seen in events.
@@ -463,11 +989,22 @@ class GraphStore:
         names like 'group' or 'chord'.
         """
         with self._lock:
-            return {
-                node.name
-                for node in self._graph.nodes.values()
-                if node.node_type == NodeType.TASK
-            }
+            return set(self._by_name)
+
+    def find_task_names(self, query: str) -> set[str]:
+        """Get task names seen in events that contain query, ignoring case.
+
+        Uses a trigram index over distinct names, so cost follows the number
+        of candidate names rather than the number of nodes.
+
+        Args:
+            query: Substring to look for.
+
+        Returns:
+            Matching task names (synthetic GROUP/CHORD names excluded).
+        """
+        with self._lock:
+            return self._name_search.search(query)
 
     def get_task_execution_count(self, task_name: str) -> int:
         """Get number of executions (nodes) for a task name.
@@ -481,11 +1018,15 @@ class GraphStore:
             Number of task executions (TaskNodes) with this name.
         """
         with self._lock:
-            return sum(
-                1
-                for node in self._graph.nodes.values()
-                if node.name == task_name and node.node_type == NodeType.TASK
-            )
+            return self._by_name.count(task_name)
+
+    def get_state_counts(self) -> dict[TaskState, int]:
+        """Get the number of task nodes currently in each state.
+
+        States with no nodes are omitted. Excludes synthetic nodes (GROUP,
+        CHORD). Read from the published summary without locking.
+        """
+        return dict(self._summary.state_counts)
 
     def get_last_execution_time(self, task_name: str) -> datetime | None:
         """Get the most recent execution timestamp for a task name.
@@ -500,36 +1041,342 @@ class GraphStore:
             Most recent event timestamp, or None if task has never been executed.
         """
         with self._lock:
-            last_time: datetime | None = None
-            for node in self._graph.nodes.values():
-                if (
-                    node.name == task_name
-                    and node.node_type == NodeType.TASK
-                    and node.events
-                ):
-                    node_time = node.events[-1].timestamp
-                    if last_time is None or node_time > last_time:
-                        last_time = node_time
-            return last_time
+            return self._last_run(task_name)
+
+    def get_task_name_stats(
+        self, names: Iterable[str] | None = None
+    ) -> dict[str, TaskNameStats]:
+        """Get per-name execution aggregates in one pass under the lock.
+
+        Counts and last run are maintained at ingestion and eviction, so the
+        cost is O(1) per name regardless of how many nodes the store holds.
+        Excludes synthetic nodes (GROUP, CHORD).
+
+        Args:
+            names: Task names to report; defaults to every name in the store.
+                Names with no nodes get zero counts and no last run.
+
+        Returns:
+            Stats keyed by task name.
+        """
+        with self._lock:
+            by_name = self._by_name
+            stats: dict[str, TaskNameStats] = {}
+            for name in list(by_name) if names is None else names:
+                states = by_name.state_counts(name)
+                stats[name] = TaskNameStats(
+                    name=name,
+                    execution_count=by_name.count(name),
+                    success_count=states.get(TaskState.SUCCESS, 0),
+                    failure_count=states.get(TaskState.FAILURE, 0),
+                    last_run=self._last_run(name),
+                )
+            return stats
+
+    def get_latency_stats(
+        self,
+        names: Iterable[str] | None = None,
+        *,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> dict[str, TaskLatencyStats]:
+        """Get runtime and queue-wait percentiles per task name.
+
+        Durations are summarized at ingestion into hourly sketches kept for
+        24 hours, so the cost is O(names x buckets) however many tasks ran,
+        and tasks evicted from the store still count. Percentiles are
+        within 1% of a recorded duration. Dates resolve to whole hours.
+
+        Args:
+            names: Task names to report; defaults to every name with a
+                duration in the last 24 hours.
+            from_date: Only durations completed from this time on.
+            to_date: Only durations completed up to this time.
+
+        Returns:
+            Stats keyed by task name.
+        """
+        from_us = (
+            epoch_us(_ensure_tz_aware(from_date)) if from_date is not None else None
+        )
+        to_us = epoch_us(_ensure_end_of_day(to_date)) if to_date is not None else None
+        with self._lock:
+            return self._latency.stats(names, from_us, to_us)
+
+    def get_timeseries(
+        self,
+        resolution: Resolution = "minute",
+        names: Iterable[str] | None = None,
+        *,
+        to_date: datetime | None = None,
+    ) -> Timeseries:
+        """Get started/succeeded/failed/retried/revoked counts over time.
+
+        Counters are kept at ingestion in fixed rings (the last 120 minutes
+        and 48 hours), overall and per task name, so no node data is read
+        and evicted tasks still count.
+
+        Args:
+            resolution: "minute" or "hour" buckets.
+            names: Task names to include; defaults to every name counted.
+            to_date: End the window with the bucket holding this time;
+                defaults to the latest event counted.
+
+        Returns:
+            The overall and per-name series, oldest bucket first.
+        """
+        end_us = epoch_us(_ensure_end_of_day(to_date)) if to_date is not None else None
+        with self._lock:
+            window = self._timeseries.window(resolution, names, end_us)
+        return window.to_model()
+
+    def get_failure_groups(
+        self, limit: int = 20, name: str | None = None
+    ) -> list[FailureGroup]:
+        """Get the most frequent failures, grouped by exception fingerprint.
+
+        FAILURE events are fingerprinted at ingestion by exception type and
+        their innermost traceback frames (paths shortened, line numbers
+        dropped), so ranking costs O(F log limit) over F fingerprints and
+        evicted tasks still count. Up to 1000 fingerprints are kept.
+
+        Args:
+            limit: Number of groups to return.
+            name: Only groups in which this task name failed, counted by
+                its failures.
+
+        Returns:
+            Groups by descending failure count.
+        """
+        with self._lock:
+            return self._failures.top(limit, name)
+
+    def _last_run(self, task_name: str) -> datetime | None:
+        """Return the latest event time across a name's nodes. Call with lock held."""
+        key = self._by_name.last(task_name)
+        if key is None:
+            return None
+        return self._graph.nodes[key[1]].events.timestamp(-1)
+
+    def _index_task(
+        self,
+        node: NodeRecord,
+        previous: tuple[tuple[int, str], TaskState] | None,
+    ) -> None:
+        """File a TASK node after an event.
+
+        previous is the node's (recency key, state) before the event, if it
+        already existed; its old recency key must already be discarded. Call
+        with lock held.
+        """
+        task_id = node.task_id
+        key = (_last_timestamp_us(node), task_id)
+        self._recency.add(key)
+        if previous is None:
+            heapq.heappush(self._ages, (_first_timestamp_us(node), task_id))
+            self._by_state.add(node.state, task_id)
+            if self._by_name.add(node.name, key, node.state):
+                self._name_search.add(node.name)
+        else:
+            self._by_state.move(previous[1], node.state, task_id)
+            self._by_name.update(node.name, previous, (key, node.state))
+
+    def _unindex_task(self, node: NodeRecord) -> None:
+        """Drop a TASK node from every index. Call with lock held."""
+        key = (_last_timestamp_us(node), node.task_id)
+        self._recency.discard(key)
+        self._by_state.discard(node.state, node.task_id)
+        if self._by_name.discard(node.name, key, node.state):
+            self._name_search.discard(node.name)
+
+    def _trim_history(self, node: NodeRecord) -> None:
+        """Apply compaction and the per-node event cap. Call with lock held."""
+        events = node.events
+        if len(events) < 2:
+            return
+
+        anchor = _args_anchor(events)
+        if self._compact_event_history:
+            # The previously-latest event just became intermediate.
+            previous = len(events) - 2
+            if previous != anchor and events.state(previous) not in TERMINAL_STATES:
+                events.clear_payload(previous)
+
+        cap = self._max_events_per_node
+        if cap is None:
+            return
+        while len(events) > cap:
+            # Oldest event that isn't the first, the args anchor or the latest.
+            drop = 2 if anchor == 1 else 1
+            del events[drop]
+            if anchor > drop:
+                anchor -= 1
+
+    def sweep_expired(self, now: datetime | None = None) -> int:
+        """Evict workflows with no event inside the retention window.
+
+        Runs automatically during ingestion and task list reads; call it to
+        force a sweep. Walks the recency index from the oldest entry, so cost
+        is proportional to the expired tasks (plus the workflows they belong
+        to), not the store.
+
+        Args:
+            now: Reference time (default: current UTC time).
+
+        Returns:
+            Number of nodes evicted (0 when no retention is configured).
+        """
+        if self._retention_seconds is None:
+            return 0
+        with self._lock:
+            self._last_sweep = time.monotonic()
+            reference = _ensure_tz_aware(now or datetime.now(timezone.utc))
+            cutoff_us = epoch_us(reference) - int(self._retention_seconds * 1e6)
+            evicted = self._sweep_expired(cutoff_us)
+            if evicted:
+                self._publish()
+            return evicted
+
+    def _maybe_sweep_expired(self) -> None:
+        """Run the retention sweep if the interval has passed. Call with lock held."""
+        if (
+            self._retention_seconds is not None
+            and time.monotonic() - self._last_sweep >= self._sweep_interval
+        ):
+            self.sweep_expired()
+
+    def _sweep_expired(self, cutoff_us: int) -> int:
+        """Evict workflows whose every task's latest event is before cutoff_us.
+
+        A workflow with any task active since the cutoff is kept whole. Call
+        with lock held.
+        """
+        nodes = self._graph.nodes
+        expired = list(
+            takewhile(lambda key: key[0] < cutoff_us, self._recency.ascending())
+        )
+        checked: set[str] = set()
+        evicted = 0
+        for _, task_id in expired:
+            if task_id in checked or task_id not in nodes:
+                continue
+            workflow = self._graph.get_workflow(task_id)
+            checked.update(workflow)
+            if all(
+                nodes[member].node_type != NodeType.TASK
+                or _last_timestamp_us(nodes[member]) < cutoff_us
+                for member in workflow
+            ):
+                self._evict_workflow(workflow)
+                evicted += len(workflow)
+        return evicted
+
+    def _publish(self) -> None:
+        """Replace the published summary with the current state. Call with lock held.
+
+        Readers may still hold the previous summary; it is never mutated.
+        """
+        self._summary = StoreSummary(
+            self._summary.version + 1,
+            len(self._graph.nodes),
+            self._estimated_bytes(),
+            MappingProxyType(self._by_state.counts()),
+        )
+
+    def _estimated_bytes(self) -> int:
+        """Current size estimate. Call with lock held."""
+        return len(self._graph.nodes) * _NODE_BYTES + self._event_bytes
 
     def _maybe_evict(self) -> None:
-        """Evict oldest 10% when over capacity. Call with lock held."""
-        if len(self._graph.nodes) <= self._max_nodes:
+        """Evict the oldest workflows when over capacity. Call with lock held.
+
+        Pops the age heap until enough nodes are gone; each live entry pulls
+        in its whole workflow, so amortized cost is O(log N) per evicted node.
+        Each limit that was exceeded (max_nodes, max_memory_bytes) is brought
+        back under 90% of its value.
+        """
+        nodes = self._graph.nodes
+        budget = self._max_memory_bytes
+        over_nodes = len(nodes) > max(self._max_nodes, self._evict_retry_size)
+        over_bytes = budget is not None and self._estimated_bytes() > max(
+            budget, self._evict_retry_bytes
+        )
+        if not (over_nodes or over_bytes):
             return
 
-        nodes_by_age = sorted(
-            self._graph.nodes.values(),
-            key=lambda n: n.events[0].timestamp if n.events else _MIN_DATETIME,
+        node_target = int(self._max_nodes * 0.9) if over_nodes else len(nodes)
+        byte_target = int(budget * 0.9) if budget is not None and over_bytes else None
+        protected: set[str] = set()
+        parked: list[tuple[int, str]] = []
+        while self._ages and (
+            len(nodes) > node_target
+            or (byte_target is not None and self._estimated_bytes() > byte_target)
+        ):
+            entry = heapq.heappop(self._ages)
+            first_us, task_id = entry
+            node = nodes.get(task_id)
+            if node is None or _first_timestamp_us(node) != first_us:
+                continue  # evicted with an earlier workflow, or re-created
+            if task_id in protected:
+                parked.append(entry)
+                continue
+
+            workflow = self._graph.get_workflow(task_id)
+            if self._protect_active_workflows and self._is_active(workflow):
+                protected.update(workflow)
+                parked.append(entry)
+                continue
+            self._evict_workflow(workflow)
+
+        for entry in parked:
+            heapq.heappush(self._ages, entry)
+        self._evict_retry_size = (
+            len(nodes) + max(self._max_nodes // 10, 1)
+            if len(nodes) > self._max_nodes
+            else 0
+        )
+        estimate = self._estimated_bytes()
+        self._evict_retry_bytes = (
+            estimate + max(budget // 10, 1)
+            if budget is not None and estimate > budget
+            else 0
         )
 
-        to_remove = len(nodes_by_age) - int(self._max_nodes * 0.9)
-        for node in nodes_by_age[:to_remove]:
-            if node.parent_id and node.parent_id in self._graph.nodes:
-                parent = self._graph.nodes[node.parent_id]
-                if node.task_id in parent.children:
-                    parent.children.remove(node.task_id)
+    def _is_active(self, workflow: list[str]) -> bool:
+        """Whether any task in the workflow is not finished. Call with lock held."""
+        nodes = self._graph.nodes
+        return any(
+            nodes[task_id].node_type == NodeType.TASK
+            and nodes[task_id].state not in TERMINAL_STATES
+            for task_id in workflow
+        )
 
-            if node.task_id in self._graph.root_ids:
-                self._graph.root_ids.remove(node.task_id)
+    def _evict_workflow(self, workflow: list[str]) -> None:
+        """Remove every node of a workflow. Call with lock held.
 
-            del self._graph.nodes[node.task_id]
+        Tasks go deepest-first so parents and GROUP/CHORD containers are
+        already empty when they are removed. Containers outside the workflow
+        that it leaves without children are removed too.
+        """
+        graph = self._graph
+        nodes = graph.nodes
+        synthetic: list[str] = []
+        containers: dict[str, None] = {}
+        for task_id in reversed(workflow):
+            node = nodes[task_id]
+            if node.node_type != NodeType.TASK:
+                synthetic.append(task_id)
+                continue
+            containers.update(dict.fromkeys(graph.get_containers(task_id)))
+            self._unindex_task(node)
+            self._workflows.discard(node)
+            self._event_bytes -= node.events.nbytes
+            graph.remove_node(task_id)
+        for task_id in synthetic:
+            self._workflows.discard(nodes[task_id])
+            self._event_bytes -= nodes[task_id].events.nbytes
+            graph.remove_node(task_id)
+        for container_id in containers:
+            container = nodes.get(container_id)
+            if container is not None and not container.children:
+                self._evict_workflow([container_id])
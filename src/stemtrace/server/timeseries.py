@@ -0,0 +1,239 @@
+"""Ring-buffered event counters per task name, per minute and per hour."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Literal, NamedTuple
+
+from pydantic import BaseModel, Field
+
+from stemtrace.core.events import TaskState
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+Resolution = Literal["minute", "hour"]
+
+# Counter column per counted state; other states are not counted.
+_KINDS = {
+    TaskState.STARTED: 0,
+    TaskState.SUCCESS: 1,
+    TaskState.FAILURE: 2,
+    TaskState.RETRY: 3,
+    TaskState.REVOKED: 4,
+}
+_KIND_COUNT = len(_KINDS)
+
+_MINUTE_US = 60 * 1_000_000
+_HOUR_US = 60 * _MINUTE_US
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_ZEROS = array("I", bytes(4 * _KIND_COUNT))
+
+
+class TimeseriesPoint(BaseModel):
+    """Event counts for one bucket, starting at timestamp."""
+
+    timestamp: datetime
+    started: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    retried: int = 0
+    revoked: int = 0
+
+
+class Timeseries(BaseModel):
+    """Counts per bucket (oldest first) overall and per task name."""
+
+    resolution: Resolution
+    interval_seconds: int
+    overall: list[TimeseriesPoint] = Field(default_factory=list)
+    tasks: dict[str, list[TimeseriesPoint]] = Field(default_factory=dict)
+
+
+class CounterRing:
+    """Counts per kind for the latest ``size`` buckets of a fixed interval.
+
+    Bucket b lives in slot b % size, stamped with b; a slot holding an older
+    bucket is zeroed when a later bucket claims it, so memory is fixed at
+    ``size`` slots however many events are counted.
+    """
+
+    __slots__ = ("_counts", "_size", "_stamps")
+
+    def __init__(self, size: int) -> None:
+        """Create a ring of size empty slots."""
+        self._size = size
+        # Bucket number held by each slot (-1: never used)
+        self._stamps = array("q", [-1]) * size
+        self._counts = array("I", bytes(4 * size * _KIND_COUNT))
+
+    def add(self, bucket: int, kind: int) -> None:
+        """Count one event of kind in bucket; ignored if the slot moved past it."""
+        slot = bucket % self._size
+        if self._stamps[slot] != bucket and not self._claim(slot, bucket):
+            return
+        self._counts[slot * _KIND_COUNT + kind] += 1
+
+    def _claim(self, slot: int, bucket: int) -> bool:
+        """Zero slot for bucket, unless it already holds a later bucket."""
+        if self._stamps[slot] > bucket:
+            return False
+        self._stamps[slot] = bucket
+        start = slot * _KIND_COUNT
+        self._counts[start : start + _KIND_COUNT] = _ZEROS
+        return True
+
+    def counts(self, bucket: int) -> tuple[int, ...]:
+        """Return the counts per kind for bucket (zeros if not held)."""
+        slot = bucket % self._size
+        if self._stamps[slot] != bucket:
+            return (0,) * _KIND_COUNT
+        start = slot * _KIND_COUNT
+        return tuple(self._counts[start : start + _KIND_COUNT])
+
+
+class TimeseriesIndex:
+    """Per-minute and per-hour counters of task lifecycle events.
+
+    Counts STARTED, SUCCESS, FAILURE, RETRY and REVOKED events per task
+    name, in one ring of the latest ``minutes`` minutes and one of the
+    latest ``hours`` hours; overall counts are summed when read. The hourly
+    ring is the per-minute counts downsampled: both are updated by every
+    event, so the hour view reaches further back than the minute view
+    without keeping its minutes. Events are bucketed by their own
+    timestamp; ones older than a ring's window are ignored by that ring.
+    Memory is bounded by names x buckets.
+
+    Not thread-safe; GraphStore calls it under its lock.
+    """
+
+    __slots__ = ("_hours", "_minutes", "_newest_us", "_rings")
+
+    def __init__(self, minutes: int = 120, hours: int = 48) -> None:
+        """Create an empty index.
+
+        Args:
+            minutes: Number of per-minute buckets kept.
+            hours: Number of per-hour buckets kept.
+
+        Raises:
+            ValueError: If minutes or hours is not positive.
+        """
+        if minutes <= 0:
+            raise ValueError(f"minutes must be positive, got {minutes}")
+        if hours <= 0:
+            raise ValueError(f"hours must be positive, got {hours}")
+        self._minutes = minutes
+        self._hours = hours
+        # Name -> (minute ring, hour ring)
+        self._rings: dict[str, tuple[CounterRing, CounterRing]] = {}
+        self._newest_us: int | None = None
+
+    def __len__(self) -> int:
+        """Return the number of task names counted."""
+        return len(self._rings)
+
+    def add(self, name: str, state: TaskState, at_us: int) -> None:
+        """Count an event of name in state at at_us (epoch µs), if counted."""
+        kind = _KINDS.get(state)
+        if kind is None:
+            return
+        if self._newest_us is None or at_us > self._newest_us:
+            self._newest_us = at_us
+        rings = self._rings.get(name)
+        if rings is None:
+            rings = self._rings[name] = (
+                CounterRing(self._minutes),
+                CounterRing(self._hours),
+            )
+        minutes, hours = rings
+        minutes.add(at_us // _MINUTE_US, kind)
+        hours.add(at_us // _HOUR_US, kind)
+
+    def window(
+        self,
+        resolution: Resolution = "minute",
+        names: Iterable[str] | None = None,
+        end_us: int | None = None,
+    ) -> TimeseriesWindow:
+        """Copy the counts of the window of buckets ending with end_us's bucket.
+
+        Cost is O(names x buckets); no task data is read. Build the response
+        with ``TimeseriesWindow.to_model()``, which needs no lock.
+
+        Args:
+            resolution: "minute" or "hour" buckets.
+            names: Task names to include; defaults to every name counted.
+                Unknown names get zero counts.
+            end_us: Time (epoch µs) whose bucket is the last one returned;
+                defaults to the latest event counted.
+
+        Returns:
+            The overall and per-name counts, oldest bucket first.
+        """
+        hourly = resolution == "hour"
+        interval_us = _HOUR_US if hourly else _MINUTE_US
+        size = self._hours if hourly else self._minutes
+        if end_us is None:
+            end_us = self._newest_us
+        first = 0 if end_us is None else end_us // interval_us - size + 1
+        buckets = range(first, first + size) if end_us is not None else range(0)
+        index = 1 if hourly else 0
+        empty = [(0,) * _KIND_COUNT] * len(buckets)
+        by_name = {
+            name: [rings[index].counts(b) for b in buckets]
+            for name, rings in self._rings.items()
+        }
+        # Overall counts are summed over names here, so ingestion updates
+        # one pair of rings per event.
+        overall = [
+            tuple(map(sum, zip(*column, strict=True)))
+            for column in zip(*by_name.values(), strict=True)
+        ] or empty
+        tasks = (
+            by_name
+            if names is None
+            else {name: by_name.get(name, empty) for name in names}
+        )
+        return TimeseriesWindow(resolution, interval_us, first, overall, tasks)
+
+
+class TimeseriesWindow(NamedTuple):
+    """Counts copied out of a TimeseriesIndex, one tuple per bucket."""
+
+    resolution: Resolution
+    interval_us: int
+    first_bucket: int
+    overall: list[tuple[int, ...]]
+    tasks: dict[str, list[tuple[int, ...]]]
+
+    def to_model(self) -> Timeseries:
+        """Build the Timeseries model."""
+        interval_us = self.interval_us
+        times = [
+            _EPOCH + timedelta(microseconds=(self.first_bucket + i) * interval_us)
+            for i in range(len(self.overall))
+        ]
+
+        def points(counts: list[tuple[int, ...]]) -> list[TimeseriesPoint]:
+            return [
+                TimeseriesPoint(
+                    timestamp=timestamp,
+                    started=started,
+                    succeeded=succeeded,
+                    failed=failed,
+                    retried=retried,
+                    revoked=revoked,
+                )
+                for timestamp, (started, succeeded, failed, retried, revoked) in zip(
+                    times, counts, strict=True
+                )
+            ]
+
+        return Timeseries(
+            resolution=self.resolution,
+            interval_seconds=interval_us // 1_000_000,
+            overall=points(self.overall),
+            tasks={name: points(counts) for name, counts in self.tasks.items()},
+        )
@@ -46,6 +46,8 @@ export interface RegisteredTask {
   module: string | null
   bound: boolean
   execution_count: number
+  success_count: number
+  failure_count: number
   registered_by: string[]
   last_run: string | null
   status: TaskStatus
@@ -64,6 +66,7 @@ export interface TaskNode {
   group_id: string | null
   chord_id: string | null
   parent_id: string | null
+  root_id: string | null
   children: string[]
   events: TaskEvent[]
   first_seen: string | null
@@ -76,6 +79,7 @@ export interface TaskListResponse {
   total: number
   limit: number
   offset: number
+  next_cursor: string | null
 }
 
 export interface TaskDetailResponse {
@@ -83,6 +87,15 @@ export interface TaskDetailResponse {
   children: TaskNode[]
 }
 
+export interface WorkflowSummary {
+  node_count: number
+  state_counts: Record<string, number>
+  first_seen: string | null
+  last_updated: string | null
+  duration_ms: number | null
+  has_failure: boolean
+}
+
 export interface GraphNode {
   task_id: string
   name: string
@@ -95,6 +108,7 @@ export interface GraphNode {
   duration_ms: number | null
   first_seen: string | null
   last_updated: string | null
+  summary?: WorkflowSummary | null
 }
 
 export interface GraphResponse {
@@ -107,6 +121,7 @@ export interface GraphListResponse {
   total: number
   limit: number
   offset: number
+  next_cursor: string | null
 }
 
 export interface HealthResponse {
@@ -115,6 +130,9 @@ export interface HealthResponse {
   consumer_running: boolean
   websocket_connections: number
   node_count: number
+  state_counts: Record<string, number>
+  estimated_memory_bytes: number
+  max_memory_bytes: number | null
 }
 
 export interface Worker {
@@ -131,9 +149,76 @@ export interface WorkerListResponse {
   total: number
 }
 
+export interface LatencySummary {
+  count: number
+  mean_ms: number | null
+  min_ms: number | null
+  max_ms: number | null
+  p50_ms: number | null
+  p95_ms: number | null
+  p99_ms: number | null
+}
+
+export interface TaskLatency {
+  name: string
+  runtime: LatencySummary
+  queue_wait: LatencySummary
+}
+
+export interface LatencyStatsResponse {
+  tasks: TaskLatency[]
+  total: number
+}
+
+export interface FetchLatencyStatsParams {
+  names?: string[]
+  from_date?: string
+  to_date?: string
+}
+
+export interface TimeseriesPoint {
+  timestamp: string
+  started: number
+  succeeded: number
+  failed: number
+  retried: number
+  revoked: number
+}
+
+export interface TimeseriesResponse {
+  resolution: 'minute' | 'hour'
+  interval_seconds: number
+  overall: TimeseriesPoint[]
+  tasks: Record<string, TimeseriesPoint[]>
+}
+
+export interface FetchTimeseriesParams {
+  resolution?: 'minute' | 'hour'
+  names?: string[]
+  to_date?: string
+}
+
+export interface FailureGroup {
+  fingerprint: string
+  exception_type: string
+  frames: string[]
+  message: string | null
+  count: number
+  first_seen: string
+  last_seen: string
+  task_names: Record<string, number>
+  sample_task_ids: string[]
+}
+
+export interface FailureGroupListResponse {
+  groups: FailureGroup[]
+  total: number
+}
+
 export interface FetchTasksParams {
   limit?: number
   offset?: number
+  cursor?: string
   state?: string
   name?: string
   from_date?: string
@@ -143,6 +228,7 @@ export interface FetchTasksParams {
 export interface FetchGraphsParams {
   limit?: number
   offset?: number
+  cursor?: string
   from_date?: string
   to_date?: string
 }
@@ -152,6 +238,7 @@ export async function fetchTasks(params?: FetchTasksParams): Promise<TaskListRes
   const searchParams = new URLSearchParams()
   if (params?.limit) searchParams.set('limit', params.limit.toString())
   if (params?.offset) searchParams.set('offset', params.offset.toString())
+  if (params?.cursor) searchParams.set('cursor', params.cursor)
   if (params?.state) searchParams.set('state', params.state)
   if (params?.name) searchParams.set('name', params.name)
   if (params?.from_date) searchParams.set('from_date', params.from_date)
@@ -173,6 +260,7 @@ export async function fetchGraphs(params?: FetchGraphsParams): Promise<GraphList
   const searchParams = new URLSearchParams()
   if (params?.limit) searchParams.set('limit', params.limit.toString())
   if (params?.offset) searchParams.set('offset', params.offset.toString())
+  if (params?.cursor) searchParams.set('cursor', params.cursor)
   if (params?.from_date) searchParams.set('from_date', params.from_date)
   if (params?.to_date) searchParams.set('to_date', params.to_date)
 
@@ -216,3 +304,45 @@ export async function fetchWorkers(hostname?: string): Promise<WorkerListRespons
   if (!response.ok) throw new Error('Failed to fetch workers')
   return response.json()
 }
+
+export async function fetchLatencyStats(
+  params?: FetchLatencyStatsParams,
+): Promise<LatencyStatsResponse> {
+  const searchParams = new URLSearchParams()
+  for (const name of params?.names ?? []) searchParams.append('name', name)
+  if (params?.from_date) searchParams.set('from_date', params.from_date)
+  if (params?.to_date) searchParams.set('to_date', params.to_date)
+
+  const url = `${API_BASE}/stats/latency${searchParams.toString() ? `?${searchParams}` : ''}`
+  const response = await fetch(url)
+  if (!response.ok) throw new Error('Failed to fetch latency stats')
+  return response.json()
+}
+
+export async function fetchTimeseries(
+  params?: FetchTimeseriesParams,
+): Promise<TimeseriesResponse> {
+  const searchParams = new URLSearchParams()
+  if (params?.resolution) searchParams.set('resolution', params.resolution)
+  for (const name of params?.names ?? []) searchParams.append('name', name)
+  if (params?.to_date) searchParams.set('to_date', params.to_date)
+
+  const url = `${API_BASE}/stats/timeseries${searchParams.toString() ? `?${searchParams}` : ''}`
+  const response = await fetch(url)
+  if (!response.ok) throw new Error('Failed to fetch timeseries')
+  return response.json()
+}
+
+export async function fetchFailureGroups(
+  limit?: number,
+  name?: string,
+): Promise<FailureGroupListResponse> {
+  const searchParams = new URLSearchParams()
+  if (limit) searchParams.set('limit', limit.toString())
+  if (name) searchParams.set('name', name)
+
+  const url = `${API_BASE}/stats/failures${searchParams.toString() ? `?${searchParams}` : ''}`
+  const response = await fetch(url)
+  if (!response.ok) throw new Error('Failed to fetch failure groups')
+  return response.json()
+}
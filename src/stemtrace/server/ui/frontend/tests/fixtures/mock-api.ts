@@ -198,6 +198,12 @@ export async function setupMockApi(
         consumer_running: true,
         websocket_connections: 0,
         node_count: tasks.length,
+        state_counts: tasks.reduce<Record<string, number>>((counts, task) => {
+          counts[task.state] = (counts[task.state] ?? 0) + 1
+          return counts
+        }, {}),
+        estimated_memory_bytes: 0,
+        max_memory_bytes: null,
       }),
     })
   })
@@ -326,6 +332,7 @@ export async function setupMockApi(
         total: filtered.length,
         limit,
         offset,
+        next_cursor: null,
       }),
     })
   })
@@ -399,6 +406,7 @@ export async function setupMockApi(
         total: rootTasks.length,
         limit: 50,
         offset: 0,
+        next_cursor: null,
       }),
     })
   })
@@ -400,6 +400,8 @@ export const DEFAULT_REGISTRY = [
     module: 'tasks',
     bound: false,
     execution_count: 5,
+    success_count: 5,
+    failure_count: 0,
     registered_by: ['worker-1'],
     last_run: new Date(Date.now() - 2 * 60 * 1000).toISOString(),
     status: 'active',
@@ -411,6 +413,8 @@ export const DEFAULT_REGISTRY = [
     module: 'tasks',
     bound: false,
     execution_count: 3,
+    success_count: 3,
+    failure_count: 0,
     registered_by: ['worker-1', 'worker-2'],
     last_run: new Date(Date.now() - 10 * 60 * 1000).toISOString(),
     status: 'active',
@@ -422,6 +426,8 @@ export const DEFAULT_REGISTRY = [
     module: 'tasks',
     bound: false,
     execution_count: 10,
+    success_count: 9,
+    failure_count: 1,
     registered_by: ['worker-1'],
     last_run: new Date(Date.now() - 30 * 60 * 1000).toISOString(),
     status: 'active',
@@ -433,6 +439,8 @@ export const DEFAULT_REGISTRY = [
     module: 'tasks',
     bound: false,
     execution_count: 2,
+    success_count: 2,
+    failure_count: 0,
     registered_by: ['worker-2'],
     last_run: new Date(Date.now() - 60 * 60 * 1000).toISOString(),
     status: 'active',
@@ -444,6 +452,8 @@ export const DEFAULT_REGISTRY = [
     module: 'tasks',
     bound: false,
     execution_count: 0,
+    success_count: 0,
+    failure_count: 0,
     registered_by: ['worker-1'],
     last_run: null,
     status: 'never_run',
@@ -455,6 +465,8 @@ export const DEFAULT_REGISTRY = [
     module: 'tasks',
     bound: false,
     execution_count: 15,
+    success_count: 0,
+    failure_count: 15,
     registered_by: [],
     last_run: new Date(Date.now() - 5 * 60 * 1000).toISOString(),
     status: 'not_registered',
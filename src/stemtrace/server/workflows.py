@@ -0,0 +1,330 @@
+"""Per-workflow summaries (task count, states, time span) kept at ingestion."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+from stemtrace.core.events import TaskState
+from stemtrace.core.graph import NodeType
+
+if TYPE_CHECKING:
+    from stemtrace.core.graph import NodeRecord, TaskGraph
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _from_us(value: int) -> datetime:
+    """UTC datetime for epoch µs."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class WorkflowSummary(BaseModel):
+    """Aggregates over the tasks of one workflow (synthetic nodes excluded)."""
+
+    root_id: str
+    node_count: int = 0
+    state_counts: dict[TaskState, int] = Field(default_factory=dict)
+    first_seen: datetime | None = None
+    last_updated: datetime | None = None
+    duration_ms: int | None = None
+    has_failure: bool = False
+
+    @classmethod
+    def from_counts(
+        cls,
+        root_id: str,
+        state_counts: dict[TaskState, int],
+        first_us: int | None,
+        last_us: int | None,
+    ) -> WorkflowSummary:
+        """Build a summary from task counts per state and a span in epoch µs."""
+        return cls(
+            root_id=root_id,
+            node_count=sum(state_counts.values()),
+            state_counts=state_counts,
+            first_seen=_from_us(first_us) if first_us is not None else None,
+            last_updated=_from_us(last_us) if last_us is not None else None,
+            duration_ms=(last_us - first_us) // 1000
+            if first_us is not None and last_us is not None
+            else None,
+            has_failure=state_counts.get(TaskState.FAILURE, 0) > 0,
+        )
+
+
+class _Summary:
+    """Mutable aggregate behind a WorkflowSummary."""
+
+    __slots__ = ("first_us", "last_us", "states")
+
+    def __init__(self) -> None:
+        # Task count per state
+        self.states: dict[TaskState, int] = {}
+        self.first_us: int | None = None
+        self.last_us: int | None = None
+
+    def add(self, node: NodeRecord) -> None:
+        """Count a task node."""
+        states = self.states
+        states[node.state] = states.get(node.state, 0) + 1
+        events = node.events
+        if not events:
+            return
+        first, last = events.timestamp_us(0), events.timestamp_us(-1)
+        if self.first_us is None or first < self.first_us:
+            self.first_us = first
+        if self.last_us is None or last > self.last_us:
+            self.last_us = last
+
+    def move(self, old: TaskState, new: TaskState) -> None:
+        """Count a task as in new rather than old state."""
+        self._decrement(old)
+        self.states[new] = self.states.get(new, 0) + 1
+
+    def _decrement(self, state: TaskState) -> None:
+        remaining = self.states.get(state, 0) - 1
+        if remaining > 0:
+            self.states[state] = remaining
+        else:
+            self.states.pop(state, None)
+
+    def to_model(self, root_id: str) -> WorkflowSummary:
+        return WorkflowSummary.from_counts(
+            root_id, dict(self.states), self.first_us, self.last_us
+        )
+
+
+class WorkflowIndex:
+    """Task count, state histogram and time span per workflow.
+
+    A workflow is what ``TaskGraph.get_workflow`` returns for its top-most
+    node; summaries are keyed by that node. Every node maps to the workflow
+    it is counted in, so an event that only moves a task's state, or adds a
+    task under a node already counted, updates one summary in O(1). Events
+    that relink other nodes (group containers created, orphans or workflow
+    members adopted, a parent replaced) are rarer; their tasks, with the
+    containers, callbacks and roots they touch, are queued and ``resolve``
+    recounts each affected workflow once, with ``get_workflow``, before the
+    next read. A time span that could shrink (a task's latest event going
+    back in time, or a task removed) is recounted the same way.
+
+    Not thread-safe; GraphStore calls it under its lock.
+    """
+
+    __slots__ = ("_member_root", "_pending", "_summaries")
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        # Top-most node ID -> summary of its workflow
+        self._summaries: dict[str, _Summary] = {}
+        # Node ID -> top-most node ID of the workflow it is counted in
+        self._member_root: dict[str, str] = {}
+        # Task IDs whose workflows need recounting (insertion-ordered set)
+        self._pending: dict[str, None] = {}
+
+    def __len__(self) -> int:
+        """Return the number of workflows summarized."""
+        return len(self._summaries)
+
+    def update(
+        self,
+        graph: TaskGraph,
+        node: NodeRecord,
+        previous: tuple[TaskState, int] | None,
+        *,
+        relinked: bool,
+    ) -> None:
+        """Count an event just applied to a task node.
+
+        Args:
+            graph: The graph the event was applied to.
+            node: The task's node, after the event.
+            previous: The task's (state, latest event time in epoch µs)
+                before the event; None if the event created the node.
+            relinked: The event may have changed links other than placing
+                a new node under its parent or root.
+        """
+        task_id = node.task_id
+        if relinked:
+            self._queue_touched(graph, node)
+            return
+        if previous is None and task_id in graph.root_ids:
+            self._member_root[task_id] = task_id
+            self._summaries[task_id] = _Summary()
+            self._summaries[task_id].add(node)
+            return
+
+        anchor = node
+        if previous is None:
+            # The node get_workflow climbs to first
+            nodes = graph.nodes
+            parent = nodes.get(node.parent_id) if node.parent_id else None
+            if parent is None and node.root_id is not None:
+                parent = nodes.get(node.root_id)
+            if parent is None:
+                return  # Waits for its parent; not in any workflow yet
+            anchor = parent
+        root = self._member_root.get(anchor.task_id)
+        summary = self._summaries.get(root) if root is not None else None
+        if summary is None or root is None:
+            self._pending[task_id] = None
+        elif previous is None:
+            self._member_root[task_id] = root
+            summary.add(node)
+        else:
+            state, last_us = previous
+            latest = node.events.timestamp_us(-1)
+            if latest < last_us and last_us == summary.last_us:
+                self._pending[task_id] = None  # The span may shrink
+                return
+            if state != node.state:
+                summary.move(state, node.state)
+            if summary.last_us is None or latest > summary.last_us:
+                summary.last_us = latest
+
+    def _queue_touched(self, graph: TaskGraph, node: NodeRecord) -> None:
+        """Queue a relinked task and every node whose workflow it may have changed.
+
+        That is the workflow it was counted in, its parent and root, and
+        the GROUP/CHORD containers holding it with their callbacks: a
+        header can move a callback under a CHORD that the header itself
+        does not climb to.
+        """
+        pending = self._pending
+        task_id = node.task_id
+        pending[task_id] = None
+        touched = [self._member_root.get(task_id), node.parent_id, node.root_id]
+        nodes = graph.nodes
+        for container_id in graph.get_containers(task_id):
+            touched += (container_id, nodes[container_id].chord_callback_id)
+        for touched_id in touched:
+            if touched_id is not None:
+                pending[touched_id] = None
+
+    def discard(self, node: NodeRecord) -> None:
+        """Stop counting a node that is being removed from the graph.
+
+        The workflow it was counted in is queued for a recount, since its
+        time span may shrink.
+        """
+        task_id = node.task_id
+        self._pending.pop(task_id, None)
+        self._summaries.pop(task_id, None)
+        root = self._member_root.pop(task_id, None)
+        if root is not None and root in self._summaries:
+            self._pending[root] = None
+
+    def resolve(self, graph: TaskGraph) -> None:
+        """Recount the workflows of queued tasks, and those they took nodes from."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        nodes = graph.nodes
+        counted: set[str] = set()
+        tops: set[str] = set()
+        losers: dict[str, None] = {}
+        for task_id in pending:
+            if task_id in nodes and task_id not in counted:
+                tops.add(self._recount(graph, task_id, counted, losers))
+        for root in losers:
+            if root in tops:
+                continue
+            if root in nodes and _climb(nodes, root, {}) == root:
+                self._recount(graph, root, counted, {})
+            else:
+                # Joined another workflow (counted above) or was removed
+                self._summaries.pop(root, None)
+
+    def summary(self, graph: TaskGraph, root_id: str) -> WorkflowSummary | None:
+        """Return the summary of the workflow topped by root_id.
+
+        Call ``resolve`` first. A root never summarized (e.g. after the
+        graph was restored from a snapshot) is counted now.
+
+        Returns:
+            The summary, or None if root_id is not in the graph.
+        """
+        summary = self._get(graph, root_id)
+        return summary.to_model(root_id) if summary is not None else None
+
+    def span(self, graph: TaskGraph, root_id: str) -> tuple[int | None, int | None]:
+        """Return the (first, latest) event time in epoch µs of root_id's workflow.
+
+        Call ``resolve`` first; (None, None) if it has no task events.
+        """
+        summary = self._get(graph, root_id)
+        if summary is None:
+            return None, None
+        return summary.first_us, summary.last_us
+
+    def _get(self, graph: TaskGraph, root_id: str) -> _Summary | None:
+        """Summary of root_id's workflow, counted now if missing."""
+        summary = self._summaries.get(root_id)
+        if summary is None and root_id in graph.nodes:
+            top = self._recount(graph, root_id, set(), {})
+            summary = self._summaries[top]
+        return summary
+
+    def _recount(
+        self,
+        graph: TaskGraph,
+        task_id: str,
+        counted: set[str],
+        losers: dict[str, None],
+    ) -> str:
+        """Rebuild the summary of task_id's workflow and return its top node.
+
+        Counts the nodes of ``get_workflow`` whose own climb ends at the
+        same top; a node reachable from two tops (e.g. a chord header
+        listed under its parent but placed in a root-level CHORD) counts
+        only where its parent links lead. The counted node IDs are added
+        to counted, and workflows that counted one of them until now to
+        losers.
+        """
+        workflow = graph.get_workflow(task_id)
+        nodes = graph.nodes
+        top = workflow[0]
+        tops = {top: top}
+        member_root = self._member_root
+        summary = _Summary()
+        for member_id in workflow:
+            if _climb(nodes, member_id, tops) != top:
+                continue
+            previous = member_root.get(member_id)
+            if previous is not None and previous != top:
+                losers[previous] = None
+            member_root[member_id] = top
+            counted.add(member_id)
+            node = nodes[member_id]
+            if node.node_type == NodeType.TASK:
+                summary.add(node)
+        self._summaries[top] = summary
+        return top
+
+
+def _climb(nodes: dict[str, NodeRecord], task_id: str, tops: dict[str, str]) -> str:
+    """Top-most node reached from task_id, as ``TaskGraph.get_workflow`` climbs.
+
+    Follows the parent, or the root_id when the parent is absent. Results
+    are memoized in tops (node ID -> top), so climbing every node of a
+    workflow costs O(nodes) rather than O(nodes x depth).
+    """
+    path: dict[str, None] = {}
+    current = task_id
+    while current not in tops:
+        path[current] = None
+        node = nodes[current]
+        parent = nodes.get(node.parent_id) if node.parent_id else None
+        if parent is None and node.root_id is not None:
+            parent = nodes.get(node.root_id)
+        if parent is None or parent.task_id in path:
+            top = current
+            break
+        current = parent.task_id
+    else:
+        top = tops[current]
+    for member_id in path:
+        tops[member_id] = top
+    return top
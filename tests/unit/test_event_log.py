@@ -0,0 +1,268 @@
+"""Tests for the columnar event log."""
+
+import pickle
+from datetime import UTC, datetime, timedelta, timezone
+from typing import Any
+
+import pytest
+from pydantic import TypeAdapter
+
+from stemtrace.core.event_log import EventLog, epoch_us, estimate_size
+from stemtrace.core.events import TaskEvent, TaskState
+
+_BASE = datetime(2024, 1, 1, 12, 30, 15, 123456, tzinfo=UTC)
+
+
+def _event(
+    state: TaskState = TaskState.STARTED, offset: int = 0, **fields: Any
+) -> TaskEvent:
+    return TaskEvent(
+        task_id="task-1",
+        name="tests.sample",
+        state=state,
+        timestamp=_BASE + timedelta(seconds=offset),
+        **fields,
+    )
+
+
+class TestEventLogRoundTrip:
+    def test_rebuilds_equal_events(self) -> None:
+        events = [
+            _event(TaskState.PENDING, 0, args=[1, "x"], kwargs={"k": [1, 2]}),
+            _event(TaskState.STARTED, 1, parent_id="p", root_id="r", trace_id="t"),
+            _event(TaskState.RETRY, 2, exception="boom", traceback="tb", retries=1),
+            _event(
+                TaskState.SUCCESS,
+                3,
+                group_id="g",
+                chord_id="g",
+                chord_callback_id="cb",
+                result={"ok": True},
+            ),
+        ]
+        log = EventLog(events)
+
+        assert len(log) == 4
+        assert log == events
+        assert list(log) == events
+        assert log[-1] == events[-1]
+        assert log[1:3] == events[1:3]
+
+    def test_preserves_timezone(self) -> None:
+        offset = timezone(timedelta(hours=2))
+        aware = _event().model_copy(update={"timestamp": _BASE.astimezone(offset)})
+        naive = _event().model_copy(update={"timestamp": _BASE.replace(tzinfo=None)})
+        log = EventLog([aware, naive])
+
+        assert log[0].timestamp == aware.timestamp
+        assert log[0].timestamp.utcoffset() == timedelta(hours=2)
+        assert log[1].timestamp == naive.timestamp
+        assert log[1].timestamp.tzinfo is None
+        # Naive timestamps are treated as UTC in the numeric column
+        assert log.timestamp_us(0) == log.timestamp_us(1) == epoch_us(_BASE)
+
+    def test_pre_epoch_timestamp(self) -> None:
+        early = datetime(1960, 5, 1, 0, 0, 0, 1, tzinfo=UTC)
+        log = EventLog([_event().model_copy(update={"timestamp": early})])
+        assert log.timestamp(0) == early
+        assert log.timestamp_us(0) < 0
+
+    def test_equality_with_other_types(self) -> None:
+        log = EventLog([_event()])
+        assert log == EventLog([_event()])
+        assert log == (_event(),)
+        assert log != [_event(offset=1)]
+        assert log != []
+        assert log != "not events"
+
+
+class TestEventLogColumns:
+    def test_column_accessors(self) -> None:
+        log = EventLog(
+            [
+                _event(TaskState.PENDING, 0),
+                _event(TaskState.STARTED, 5, kwargs={"a": 1}),
+            ]
+        )
+        assert log.state(0) == TaskState.PENDING
+        assert log.state(-1) == TaskState.STARTED
+        assert log.timestamp(-1) == _BASE + timedelta(seconds=5)
+        assert log.timestamp_us(1) - log.timestamp_us(0) == 5_000_000
+        assert not log.has_arguments(0)
+        assert log.has_arguments(1)
+        assert log.has_payload(1)
+
+    def test_clear_payload_keeps_summary(self) -> None:
+        log = EventLog([_event(TaskState.RETRY, 0, exception="boom", retries=3)])
+        log.clear_payload(0)
+
+        event = log[0]
+        assert event.state == TaskState.RETRY
+        assert event.timestamp == _BASE
+        assert event.retries == 3
+        assert event.exception is None
+        assert not log.has_payload(0)
+
+    def test_retries_outside_unsigned_32_bit_range(self) -> None:
+        counts = [-1, 2**32, 2**63 - 1]
+        events = [_event(retries=count) for count in counts]
+        log = EventLog(events)
+        log.append(_event(retries=-5))
+        log.insert(0, _event(retries=2**40))
+        log[1] = _event(retries=-(2**40))
+
+        assert [e.retries for e in log] == [2**40, -(2**40), 2**32, 2**63 - 1, -5]
+        assert pickle.loads(pickle.dumps(log)) == log
+        # Beyond the signed 64-bit column the count is clamped, not rejected
+        assert EventLog([_event(retries=2**70)])[0].retries == 2**63 - 1
+        assert EventLog([_event(retries=-(2**70))])[0].retries == -(2**63)
+
+    def test_consecutive_rows_share_links(self) -> None:
+        log = EventLog(
+            [
+                _event(TaskState.PENDING, 0, root_id="r"),
+                _event(TaskState.STARTED, 1, root_id="r"),
+                _event(TaskState.SUCCESS, 2, root_id="r", parent_id="p"),
+            ]
+        )
+        assert log._links[0] is log._links[1]
+        assert log._links[1] is not log._links[2]
+
+
+class TestEventLogMutation:
+    def test_delete_insert_and_set(self) -> None:
+        log = EventLog([_event(offset=i) for i in range(4)])
+
+        del log[1]
+        assert [e.timestamp for e in log] == [
+            _BASE + timedelta(seconds=s) for s in (0, 2, 3)
+        ]
+
+        log.insert(0, _event(TaskState.PENDING, -1))
+        assert log.state(0) == TaskState.PENDING
+        assert len(log) == 4
+
+        log[-1] = _event(TaskState.SUCCESS, 9, result=1)
+        assert log[-1].result == 1
+
+        del log[:2]
+        assert len(log) == 2
+
+        log.clear()
+        assert len(log) == 0
+        assert log == []
+
+    def test_index_errors(self) -> None:
+        log = EventLog([_event()])
+        with pytest.raises(IndexError):
+            log[1]
+        with pytest.raises(IndexError):
+            log[-2]
+        with pytest.raises(TypeError):
+            log[0:1] = [_event()]
+
+    def test_copy_is_independent(self) -> None:
+        log = EventLog([_event(TaskState.STARTED, 0, args=[1])])
+        clone = log.copy()
+        log.append(_event(TaskState.SUCCESS, 1))
+        log.clear_payload(0)
+
+        assert len(clone) == 1
+        assert clone[0].args == [1]
+        assert clone.nbytes == clone._count_bytes()
+
+    def test_pickle_round_trip(self) -> None:
+        events = [
+            _event(TaskState.STARTED, 0, args=[1], parent_id="p"),
+            _event(TaskState.RETRY, 1, exception="boom", retries=2),
+        ]
+        restored = pickle.loads(pickle.dumps(EventLog(events)))
+
+        assert restored == events
+        assert restored.nbytes == EventLog(events).nbytes
+        restored.append(_event(TaskState.SUCCESS, 2))
+        assert restored.state(-1) == TaskState.SUCCESS
+
+
+class TestEventLogSize:
+    def test_payloads_add_to_nbytes(self) -> None:
+        bare = EventLog([_event(TaskState.STARTED, 0)])
+        loaded = EventLog([_event(TaskState.STARTED, 0, args=["x" * 10_000])])
+
+        assert bare.nbytes > 0
+        assert loaded.nbytes - bare.nbytes > 10_000
+
+    def test_shared_links_counted_once(self) -> None:
+        one = EventLog([_event(TaskState.PENDING, 0)])
+        two = EventLog([_event(TaskState.PENDING, 0), _event(TaskState.STARTED, 1)])
+        split = EventLog(
+            [_event(TaskState.PENDING, 0), _event(TaskState.STARTED, 1, root_id="r")]
+        )
+        assert two.nbytes - one.nbytes < split.nbytes - one.nbytes
+
+    def test_clear_payload_releases_bytes(self) -> None:
+        log = EventLog([_event(TaskState.RETRY, 0, traceback="tb" * 5_000)])
+        before = log.nbytes
+        log.clear_payload(0)
+        assert before - log.nbytes > 10_000
+        assert log.nbytes == EventLog([log[0]]).nbytes
+
+    def test_incremental_nbytes_matches_recount(self) -> None:
+        log = EventLog()
+        for i in range(6):
+            log.append(
+                _event(offset=i, root_id="r" if i > 2 else None, kwargs={"i": 1000 + i})
+            )
+        log.clear_payload(4)
+        assert log.nbytes == log._count_bytes()
+
+        before = log.nbytes
+        del log[1]
+        log.insert(2, _event(TaskState.RETRY, 9, root_id="other"))
+        log[0] = _event(TaskState.PENDING, -1, args=["abc"])
+        assert log.nbytes == log._count_bytes()
+        del log[3:5]
+        assert log.nbytes < before
+
+        log.clear()
+        assert log.nbytes == 0
+
+    def test_extend_matches_appends(self) -> None:
+        events = [
+            _event(offset=i, root_id="r" if i > 2 else None, kwargs={"i": 1000 + i})
+            for i in range(6)
+        ]
+        appended = EventLog(events[:2])
+        for event in events[2:]:
+            appended.append(event)
+
+        extended = EventLog(events[:2])
+        extended.extend(events[2:])
+
+        assert extended == appended
+        assert extended.nbytes == appended.nbytes == extended._count_bytes()
+        # Equal links are shared with the previous row, across the two batches
+        assert extended._links[2] is extended._links[1]
+        assert extended._links[4] is extended._links[3]
+        assert extended._links[3] is not extended._links[2]
+
+    def test_estimate_size(self) -> None:
+        assert estimate_size(None) == estimate_size(True) == estimate_size(7) == 0
+        assert estimate_size(10**6) > 0
+        text = "y" * 1_000
+        assert estimate_size({"k": [text, (text,)]}) > 2 * len(text)
+
+
+class TestEventLogPydantic:
+    def test_validates_from_list_and_serializes_to_list(self) -> None:
+        adapter = TypeAdapter(EventLog)
+        events = [_event(TaskState.PENDING, args=[1]), _event(TaskState.SUCCESS, 1)]
+
+        log = adapter.validate_python(events)
+        assert isinstance(log, EventLog)
+        assert log == events
+
+        dumped = adapter.dump_python(log, mode="json")
+        assert isinstance(dumped, list)
+        assert dumped[0]["args"] == [1]
+        assert adapter.validate_json(adapter.dump_json(log)) == events
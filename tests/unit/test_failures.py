@@ -0,0 +1,197 @@
+"""Tests for exception fingerprinting and failure groups."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from stemtrace.core.events import TaskEvent, TaskState
+from stemtrace.server.api.routes import create_api_router
+from stemtrace.server.failures import FailureIndex, fingerprint
+from stemtrace.server.store import GraphStore
+
+_BASE = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _traceback(root: str, line: int, error: str) -> str:
+    return (
+        "Traceback (most recent call last):\n"
+        f'  File "{root}/celery/app/trace.py", line 453, in trace_task\n'
+        "    R = retval = fun(*args, **kwargs)\n"
+        f'  File "{root}/myapp/tasks.py", line {line}, in charge\n'
+        "    gateway.charge(order)\n"
+        f'  File "{root}/myapp/gateway.py", line {line + 7}, in charge\n'
+        "    raise PaymentError(order.id)\n"
+        f"{error}\n"
+    )
+
+
+def _failure(
+    task_id: str,
+    seconds: int,
+    *,
+    name: str = "myapp.tasks.charge",
+    exception: str | None = "PaymentError: order 1 declined",
+    traceback: str | None = None,
+) -> TaskEvent:
+    return TaskEvent(
+        task_id=task_id,
+        name=name,
+        state=TaskState.FAILURE,
+        timestamp=_BASE + timedelta(seconds=seconds),
+        exception=exception,
+        traceback=traceback
+        if traceback is not None
+        else _traceback("/srv/app", 10, "myapp.errors.PaymentError: order 1"),
+    )
+
+
+class TestFingerprint:
+    def test_ignores_message_line_numbers_and_install_path(self) -> None:
+        first = fingerprint(
+            "PaymentError: order 1 declined",
+            _traceback("/srv/a/site-packages", 10, "PaymentError: order 1"),
+        )
+        second = fingerprint(
+            "PaymentError: order 99 declined",
+            _traceback("/opt/venv/lib/site-packages", 42, "PaymentError: order 99"),
+        )
+
+        assert first == second
+        key, exception_type, frames = first
+        assert exception_type == "PaymentError"
+        assert frames == [
+            "app/trace.py in trace_task",
+            "myapp/tasks.py in charge",
+            "myapp/gateway.py in charge",
+        ]
+        assert len(key) == 16
+
+    def test_type_and_frames_separate_groups(self) -> None:
+        traceback = _traceback("/srv", 10, "X")
+        base = fingerprint("PaymentError: x", traceback)[0]
+        assert fingerprint("TimeoutError: x", traceback)[0] != base
+        other_place = traceback.replace("in charge", "in refund")
+        assert fingerprint("PaymentError: x", other_place)[0] != base
+
+    def test_type_from_traceback_or_unknown(self) -> None:
+        traceback = _traceback("/srv", 1, "requests.exceptions.Timeout: slow")
+        assert fingerprint(None, traceback)[1] == "requests.exceptions.Timeout"
+        assert fingerprint("connection reset by peer", None) == fingerprint(None, None)
+        assert fingerprint(None, None)[1:] == ("UnknownError", [])
+
+
+class TestFailureIndex:
+    def test_groups_and_ranking(self) -> None:
+        index = FailureIndex()
+        for i in range(5):
+            index.add(_failure(f"pay-{i}", i))
+        for i in range(2):
+            index.add(
+                _failure(
+                    f"sync-{i}",
+                    10 + i,
+                    name="myapp.tasks.sync",
+                    exception="TimeoutError: slow",
+                )
+            )
+        index.add(_failure("pay-x", 20, name="myapp.tasks.sync"))
+
+        groups = index.top(10)
+        assert [g.count for g in groups] == [6, 2]
+        top = groups[0]
+        assert top.exception_type == "PaymentError"
+        assert top.task_names == {"myapp.tasks.charge": 5, "myapp.tasks.sync": 1}
+        assert top.sample_task_ids == ["pay-x", "pay-4", "pay-3", "pay-2", "pay-1"]
+        assert top.first_seen == _BASE
+        assert top.last_seen == _BASE + timedelta(seconds=20)
+
+        by_name = index.top(10, "myapp.tasks.sync")
+        assert [(g.exception_type, g.count) for g in by_name] == [
+            ("TimeoutError", 2),
+            ("PaymentError", 1),
+        ]
+        assert index.top(1) == groups[:1]
+
+    def test_naive_and_aware_timestamps_share_a_group(self) -> None:
+        index = FailureIndex()
+        index.add(_failure("aware", 5))
+        naive = _failure("naive", 0)
+        index.add(
+            naive.model_copy(update={"timestamp": naive.timestamp.replace(tzinfo=None)})
+        )
+        index.add(
+            _failure("late", 0).model_copy(
+                update={"timestamp": datetime(2024, 1, 1, 0, 0, 9)}
+            )
+        )
+
+        (group,) = index.top(10)
+        assert group.count == 3
+        assert group.first_seen == _BASE
+        assert group.last_seen == _BASE + timedelta(seconds=9)
+        assert group.sample_task_ids == ["late", "naive", "aware"]
+
+    def test_least_recently_seen_group_dropped(self) -> None:
+        index = FailureIndex(max_groups=2)
+        index.add(_failure("a", 0, exception="AError: x"))
+        index.add(_failure("b", 1, exception="BError: x"))
+        index.add(_failure("a2", 2, exception="AError: x"))
+        index.add(_failure("c", 3, exception="CError: x"))
+
+        assert len(index) == 2
+        assert {g.exception_type for g in index.top(10)} == {"AError", "CError"}
+
+    def test_invalid_max_groups(self) -> None:
+        with pytest.raises(ValueError, match="max_groups"):
+            FailureIndex(max_groups=0)
+
+
+class TestStoreFailureGroups:
+    def test_only_failures_counted_and_survive_eviction(self) -> None:
+        store = GraphStore(max_nodes=5)
+        for i in range(20):
+            store.add_event(
+                _failure(f"t{i}", i).model_copy(update={"state": TaskState.RETRY})
+            )
+            store.add_event(_failure(f"t{i}", i))
+
+        assert store.node_count <= 5
+        groups = store.get_failure_groups()
+        assert len(groups) == 1
+        assert groups[0].count == 20
+        assert groups[0].sample_task_ids[0] == "t19"
+
+    def test_naive_failure_after_aware_is_stored(self) -> None:
+        store = GraphStore()
+        store.add_event(_failure("aware", 1))
+        naive = _failure("naive", 2)
+        store.add_event(
+            naive.model_copy(update={"timestamp": naive.timestamp.replace(tzinfo=None)})
+        )
+
+        assert store.get_node("naive") is not None
+        assert store.get_failure_groups()[0].count == 2
+
+
+def test_failures_endpoint() -> None:
+    store = GraphStore()
+    store.add_event(_failure("a", 0))
+    store.add_event(_failure("b", 1))
+    store.add_event(_failure("c", 2, exception="KeyError: 'x'", traceback=""))
+    app = FastAPI()
+    app.include_router(create_api_router(store))
+    client = TestClient(app)
+
+    data = client.get("/api/stats/failures").json()
+    assert data["total"] == 2
+    assert [g["exception_type"] for g in data["groups"]] == ["PaymentError", "KeyError"]
+    assert data["groups"][0]["count"] == 2
+    assert data["groups"][0]["message"] == "PaymentError: order 1 declined"
+    assert data["groups"][1]["frames"] == []
+
+    data = client.get("/api/stats/failures", params={"limit": 1}).json()
+    assert data["total"] == 1
+    data = client.get("/api/stats/failures", params={"name": "other"}).json()
+    assert data["groups"] == []
@@ -1,12 +1,77 @@
 """Tests for task graph models."""
 
-from datetime import UTC, datetime
+import itertools
+import random
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
 
 import pytest
 from pydantic import ValidationError
 
+from stemtrace.core.event_log import EventLog
 from stemtrace.core.events import TaskEvent, TaskState
-from stemtrace.core.graph import NodeType, TaskGraph, TaskNode
+from stemtrace.core.graph import (
+    NodeRecord,
+    NodeType,
+    OrderedIdSet,
+    TaskGraph,
+    TaskNode,
+)
+
+
+def _full_state(graph: TaskGraph) -> tuple[object, ...]:
+    """Everything a graph holds, order included, private indexes too."""
+    return (
+        graph.model_dump(),
+        {task_id: node.events.nbytes for task_id, node in graph.nodes.items()},
+        graph._group_members,
+        graph._member_of,
+        {
+            group_id: (stats.states, stats.real_parents)
+            for group_id, stats in graph._group_stats.items()
+        },
+        graph._chord_callbacks,
+        graph._workflows,
+        graph._orphans,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _bulk_build_matches_incremental(
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[None]:
+    """Rebuild every graph a test fed through add_event with from_events.
+
+    Turns the whole module into an equivalence corpus for the bulk builder.
+    Graphs that had nodes removed, or started from a bulk build, are skipped.
+    """
+    built: dict[int, tuple[TaskGraph, list[TaskEvent]]] = {}
+    edited: set[int] = set()
+    add_event = TaskGraph.add_event
+    remove_node = TaskGraph.remove_node
+    from_events = TaskGraph.from_events
+
+    def marking_from_events(events: Iterable[TaskEvent]) -> TaskGraph:
+        graph = from_events(events)
+        edited.add(id(graph))
+        return graph
+
+    def recording_add_event(self: TaskGraph, event: TaskEvent) -> bool:
+        if id(self) not in edited:
+            built.setdefault(id(self), (self, []))[1].append(event)
+        return add_event(self, event)
+
+    def forgetting_remove_node(self: TaskGraph, task_id: str) -> NodeRecord | None:
+        edited.add(id(self))
+        built.pop(id(self), None)
+        return remove_node(self, task_id)
+
+    monkeypatch.setattr(TaskGraph, "add_event", recording_add_event)
+    monkeypatch.setattr(TaskGraph, "remove_node", forgetting_remove_node)
+    monkeypatch.setattr(TaskGraph, "from_events", marking_from_events)
+    yield
+    for graph, events in built.values():
+        assert _full_state(from_events(events)) == _full_state(graph)
 
 
 class TestNodeType:
@@ -20,6 +85,63 @@ class TestNodeType:
         assert NodeType.GROUP.lower() == "group"
 
 
+class TestOrderedIdSet:
+    def test_preserves_insertion_order(self) -> None:
+        ids = OrderedIdSet(["b", "a", "c"])
+        assert list(ids) == ["b", "a", "c"]
+        assert ids == ["b", "a", "c"]
+        assert ids != ["a", "b", "c"]
+
+    def test_ignores_duplicates(self) -> None:
+        ids = OrderedIdSet()
+        ids.append("a")
+        ids.add("b")
+        ids.append("a")
+        assert ids == ["a", "b"]
+        assert len(ids) == 2
+
+    def test_remove_and_discard(self) -> None:
+        ids = OrderedIdSet(["a", "b", "c"])
+        ids.remove("b")
+        ids.discard("missing")
+        assert ids == ["a", "c"]
+        with pytest.raises(ValueError):
+            ids.remove("missing")
+
+    def test_positional_access(self) -> None:
+        ids = OrderedIdSet(["a", "b", "c"])
+        assert ids[0] == "a"
+        assert ids[1] == "b"
+        assert ids[-1] == "c"
+        with pytest.raises(IndexError):
+            ids[3]
+
+    def test_equality_with_other_sets_is_order_sensitive(self) -> None:
+        assert OrderedIdSet(["a", "b"]) == OrderedIdSet(["a", "b"])
+        assert OrderedIdSet(["a", "b"]) != OrderedIdSet(["b", "a"])
+
+    def test_serializes_as_list(self) -> None:
+        node = TaskNode(
+            task_id="task-1",
+            name="test",
+            state=TaskState.STARTED,
+            children=["c1", "c2"],
+        )
+        assert isinstance(node.children, OrderedIdSet)
+        assert node.model_dump()["children"] == ["c1", "c2"]
+        assert node.model_dump(mode="json")["children"] == ["c1", "c2"]
+        assert TaskNode.model_validate_json(node.model_dump_json()) == node
+
+    def test_rejects_non_string_ids(self) -> None:
+        with pytest.raises(ValidationError):
+            TaskNode(
+                task_id="task-1",
+                name="test",
+                state=TaskState.STARTED,
+                children=[1, 2],  # type: ignore[list-item]
+            )
+
+
 class TestTaskNode:
     def test_creation_with_required_fields(self) -> None:
         node = TaskNode(
@@ -102,6 +224,95 @@ class TestTaskNode:
         assert len(node.children) == 2
 
 
+class TestNodeRecord:
+    def test_graph_stores_records(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(
+            TaskEvent(
+                task_id="task-1",
+                name="myapp.tasks.process",
+                state=TaskState.STARTED,
+                timestamp=datetime.now(UTC),
+            )
+        )
+        assert isinstance(graph.nodes["task-1"], NodeRecord)
+        assert not hasattr(graph.nodes["task-1"], "__dict__")
+        assert isinstance(graph.nodes["task-1"].events, EventLog)
+
+    def test_to_model_is_detached(self) -> None:
+        record = NodeRecord(
+            task_id="task-1",
+            name="test",
+            state=TaskState.STARTED,
+            children=OrderedIdSet(["c1"]),
+        )
+        node = record.to_model()
+        assert isinstance(node, TaskNode)
+        assert node.children == ["c1"]
+
+        node.children.append("c2")
+        record.children.append("c3")
+        assert record.children == ["c1", "c3"]
+        assert node.children == ["c1", "c2"]
+
+    def test_copy_is_detached(self) -> None:
+        record = NodeRecord(
+            task_id="task-1",
+            name="test",
+            state=TaskState.STARTED,
+            children=OrderedIdSet(["c1"]),
+        )
+        clone = record.copy()
+        record.children.add("c2")
+        record.events.append(
+            TaskEvent(
+                task_id="task-1",
+                name="test",
+                state=TaskState.SUCCESS,
+                timestamp=datetime.now(UTC),
+            )
+        )
+        record.state = TaskState.SUCCESS
+
+        assert clone.children == ["c1"]
+        assert len(clone.events) == 0
+        assert (
+            clone.to_model()
+            == NodeRecord(
+                task_id="task-1",
+                name="test",
+                state=TaskState.STARTED,
+                children=OrderedIdSet(["c1"]),
+            ).to_model()
+        )
+
+    def test_model_roundtrip(self) -> None:
+        node = TaskNode(
+            task_id="group:g",
+            name="group",
+            state=TaskState.SUCCESS,
+            node_type=NodeType.GROUP,
+            group_id="g",
+            children=["a", "b"],
+        )
+        record = NodeRecord.from_model(node)
+        assert record.to_model() == node
+
+    def test_graph_validates_task_nodes_into_records(self) -> None:
+        graph = TaskGraph.model_validate(
+            {
+                "nodes": {
+                    "task-1": TaskNode(
+                        task_id="task-1", name="test", state=TaskState.SUCCESS
+                    )
+                },
+                "root_ids": ["task-1"],
+            }
+        )
+        assert isinstance(graph.nodes["task-1"], NodeRecord)
+        assert graph.model_dump()["nodes"]["task-1"]["state"] == TaskState.SUCCESS
+
+
 class TestTaskGraphBasics:
     def test_empty_graph(self) -> None:
         graph = TaskGraph()
@@ -202,7 +413,7 @@ class TestTaskGraphParentChild:
         assert graph.nodes["child-1"].parent_id == "parent-1"
         assert "parent-1" not in graph.nodes
 
-    def test_child_before_parent_no_backlink(self) -> None:
+    def test_child_before_parent_backlinks(self) -> None:
         graph = TaskGraph()
         graph.add_event(
             TaskEvent(
@@ -221,9 +432,11 @@ class TestTaskGraphParentChild:
                 timestamp=datetime.now(UTC),
             )
         )
-        # Child knows parent, but parent doesn't know child (no back-linking)
+        # Orphan is linked when the parent arrives
         assert graph.nodes["child-1"].parent_id == "parent-1"
-        assert "child-1" not in graph.nodes["parent-1"].children
+        assert graph.nodes["parent-1"].children == ["child-1"]
+        assert graph.root_ids == ["parent-1"]
+        assert graph._orphans == {}
 
     def test_multiple_children(self) -> None:
         graph = TaskGraph()
@@ -1247,9 +1460,9 @@ class TestGraphCoverageEdgeCases:
     """Targeted tests to cover edge-case branches in TaskGraph."""
 
     def test_compute_group_state_with_no_known_members_returns_pending(self) -> None:
-        """If member IDs aren't present in the graph, group state should be PENDING."""
+        """If a group has no tracked members, group state should be PENDING."""
         graph = TaskGraph()
-        assert graph._compute_group_state(["missing-task"]) == TaskState.PENDING
+        assert graph._compute_group_state("missing-group") == TaskState.PENDING
 
     def test_group_state_any_retry(self) -> None:
         """GROUP state should be RETRY when any member is RETRY and none are PENDING/STARTED."""
@@ -1398,3 +1611,562 @@ class TestGraphCoverageEdgeCases:
         assert graph.nodes[callback_id].parent_id == chord_node_id
         assert callback_id in graph.nodes[chord_node_id].children
         assert callback_id not in graph.root_ids
+
+
+class TestWideFanOut:
+    """Membership bookkeeping must not degrade with very wide groups."""
+
+    def test_wide_group_keeps_every_member_once(self) -> None:
+        graph = TaskGraph()
+        group_id = "wide"
+        for idx in range(2000):
+            graph.add_event(
+                TaskEvent(
+                    task_id=f"member-{idx}",
+                    name="myapp.tasks.member",
+                    state=TaskState.PENDING,
+                    timestamp=datetime.now(UTC),
+                    group_id=group_id,
+                )
+            )
+            graph.add_event(
+                TaskEvent(
+                    task_id=f"member-{idx}",
+                    name="myapp.tasks.member",
+                    state=TaskState.SUCCESS,
+                    timestamp=datetime.now(UTC),
+                    group_id=group_id,
+                )
+            )
+
+        group_node = graph.nodes[f"group:{group_id}"]
+        assert len(group_node.children) == 2000
+        assert group_node.children[0] == "member-0"
+        assert group_node.children[-1] == "member-1999"
+        assert len(graph.get_group_members(group_id)) == 2000
+        assert graph.root_ids == [f"group:{group_id}"]
+
+
+class TestGroupAggregates:
+    """GROUP/CHORD state and parent come from incrementally maintained counters."""
+
+    def _member(
+        self,
+        task_id: str,
+        state: TaskState,
+        *,
+        group_id: str | None = "agg",
+        parent_id: str | None = None,
+    ) -> TaskEvent:
+        return TaskEvent(
+            task_id=task_id,
+            name="myapp.tasks.member",
+            state=state,
+            timestamp=datetime.now(UTC),
+            group_id=group_id,
+            parent_id=parent_id,
+        )
+
+    def test_counters_track_member_transitions(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._member("m1", TaskState.PENDING))
+        graph.add_event(self._member("m2", TaskState.PENDING))
+        graph.add_event(self._member("m1", TaskState.SUCCESS))
+
+        stats = graph._group_stats["agg"]
+        assert stats.states == {TaskState.PENDING: 1, TaskState.SUCCESS: 1}
+        assert graph.nodes["group:agg"].state == TaskState.PENDING
+
+        graph.add_event(self._member("m2", TaskState.SUCCESS))
+        assert stats.states == {TaskState.SUCCESS: 2}
+        assert graph.nodes["group:agg"].state == TaskState.SUCCESS
+
+    def test_state_refreshes_on_member_event_without_group_id(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._member("m1", TaskState.SUCCESS))
+        graph.add_event(self._member("m2", TaskState.STARTED))
+        assert graph.nodes["group:agg"].state == TaskState.STARTED
+
+        graph.add_event(self._member("m2", TaskState.FAILURE, group_id=None))
+        assert graph.nodes["group:agg"].state == TaskState.FAILURE
+
+    def test_parent_histogram_ignores_group_parent(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._member("m1", TaskState.PENDING))
+        graph.add_event(self._member("m2", TaskState.PENDING))
+        stats = graph._group_stats["agg"]
+        # Members point at the synthetic node, which is not a real parent.
+        assert graph.nodes["m1"].parent_id == "group:agg"
+        assert not stats.real_parents
+
+        graph.add_event(self._member("m1", TaskState.STARTED, parent_id="p"))
+        assert stats.real_parents == {"p": 1}
+        graph.add_event(self._member("m2", TaskState.STARTED, parent_id="p"))
+        assert stats.real_parents == {"p": 2}
+        assert graph.nodes["group:agg"].parent_id == "p"
+
+    def test_remove_node_updates_counters(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._member("m1", TaskState.FAILURE))
+        graph.add_event(self._member("m2", TaskState.SUCCESS))
+        assert graph.nodes["group:agg"].state == TaskState.FAILURE
+
+        removed = graph.remove_node("m1")
+
+        assert removed is not None
+        assert removed.task_id == "m1"
+        assert "m1" not in graph.nodes
+        assert "m1" not in graph.nodes["group:agg"].children
+        assert graph.get_group_members("agg") == ["m2"]
+        assert graph._group_stats["agg"].states == {TaskState.SUCCESS: 1}
+        assert graph.nodes["group:agg"].state == TaskState.SUCCESS
+
+    def test_remove_node_unlinks_members_and_callbacks_from_container(self) -> None:
+        graph = TaskGraph()
+        for task_id in ("m1", "m2"):
+            graph.add_event(self._member(task_id, TaskState.STARTED))
+        for task_id in ("m1", "m2"):
+            graph.add_event(self._member(task_id, TaskState.SUCCESS, parent_id="p"))
+        graph.add_event(
+            TaskEvent(
+                task_id="m1",
+                name="myapp.tasks.member",
+                state=TaskState.SUCCESS,
+                timestamp=datetime.now(UTC),
+                group_id="agg",
+                chord_callback_id="cb",
+            )
+        )
+        graph.add_event(
+            TaskEvent(
+                task_id="cb",
+                name="myapp.tasks.callback",
+                state=TaskState.SUCCESS,
+                timestamp=datetime.now(UTC),
+                parent_id="p",
+            )
+        )
+        chord = graph.nodes["group:agg"]
+        # Listed by the container, but their parent is the absent "p"
+        assert list(chord.children) == ["m1", "m2", "cb"]
+        assert {graph.nodes[t].parent_id for t in chord.children} == {"p"}
+        assert graph.get_workflow("m1") == ["m1", "group:agg", "cb", "m2"]
+
+        graph.remove_node("m1")
+        graph.remove_node("cb")
+        assert list(chord.children) == ["m2"]
+
+        graph.remove_node("group:agg")
+        assert graph._chord_callbacks == {}
+
+    def test_remove_last_member_drops_group_bookkeeping(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._member("m1", TaskState.SUCCESS))
+        graph.remove_node("m1")
+        assert "agg" not in graph._group_members
+        assert "agg" not in graph._group_stats
+        assert "m1" not in graph._member_of
+
+    def test_remove_missing_node_returns_none(self) -> None:
+        assert TaskGraph().remove_node("missing") is None
+
+    def test_chord_callback_index(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(
+            TaskEvent(
+                task_id="header-1",
+                name="myapp.tasks.header",
+                state=TaskState.SUCCESS,
+                timestamp=datetime.now(UTC),
+                group_id="cg",
+                chord_callback_id="callback",
+            )
+        )
+        assert graph._chord_callbacks == {"callback": "group:cg"}
+
+        graph.add_event(
+            TaskEvent(
+                task_id="callback",
+                name="myapp.tasks.callback",
+                state=TaskState.SUCCESS,
+                timestamp=datetime.now(UTC),
+            )
+        )
+        assert graph.nodes["callback"].parent_id == "group:cg"
+        assert "callback" in graph.nodes["group:cg"].children
+
+        graph.remove_node("group:cg")
+        assert graph._chord_callbacks == {}
+
+
+class TestWorkflowIndex:
+    """Tasks are indexed by root_id so a workflow is found without link walks."""
+
+    def _task(
+        self,
+        task_id: str,
+        *,
+        root_id: str | None,
+        parent_id: str | None = None,
+        state: TaskState = TaskState.STARTED,
+        group_id: str | None = None,
+    ) -> TaskEvent:
+        return TaskEvent(
+            task_id=task_id,
+            name="myapp.tasks.step",
+            state=state,
+            timestamp=datetime.now(UTC),
+            root_id=root_id,
+            parent_id=parent_id,
+            group_id=group_id,
+        )
+
+    def test_members_indexed_by_root(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._task("root", root_id="root"))
+        graph.add_event(self._task("a", root_id="root", parent_id="root"))
+        graph.add_event(self._task("b", root_id="root", parent_id="a"))
+        graph.add_event(self._task("other", root_id="other"))
+
+        assert graph.get_workflow_members("root") == ["root", "a", "b"]
+        assert graph.get_workflow_members("other") == ["other"]
+        assert graph.get_workflow_members("missing") == []
+        assert graph.nodes["b"].root_id == "root"
+
+    def test_first_root_id_wins(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._task("a", root_id=None))
+        graph.add_event(self._task("a", root_id="root"))
+        graph.add_event(self._task("a", root_id="elsewhere"))
+
+        assert graph.nodes["a"].root_id == "root"
+        assert graph.get_workflow_members("root") == ["a"]
+        assert graph.get_workflow_members("elsewhere") == []
+
+    def test_parentless_member_not_listed_as_root(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._task("root", root_id="root"))
+        # PENDING events don't carry parent_id; root_id places the task.
+        graph.add_event(self._task("a", root_id="root", state=TaskState.PENDING))
+
+        assert graph.root_ids == ["root"]
+
+    def test_members_adopted_when_root_arrives_late(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._task("a", root_id="root", state=TaskState.PENDING))
+        assert "a" in graph.root_ids
+
+        graph.add_event(self._task("root", root_id="root"))
+        assert graph.root_ids == ["root"]
+        assert graph.get_workflow_members("root") == ["a", "root"]
+
+    def test_members_become_roots_when_root_removed(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._task("root", root_id="root"))
+        graph.add_event(self._task("a", root_id="root", state=TaskState.PENDING))
+        graph.add_event(self._task("b", root_id="root", parent_id="root"))
+
+        graph.remove_node("root")
+
+        assert graph.root_ids == ["a"]
+        assert graph.get_workflow_members("root") == ["a", "b"]
+
+    def test_removing_last_member_drops_index_entry(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._task("root", root_id="root"))
+        graph.remove_node("root")
+        assert "root" not in graph._workflows
+
+    def test_group_node_inherits_root(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._task("m1", root_id="root", group_id="g"))
+        graph.add_event(self._task("m2", root_id="root", group_id="g"))
+
+        assert graph.nodes["group:g"].root_id == "root"
+        # Synthetic nodes aren't indexed; they are reached through members.
+        assert graph.get_workflow_members("root") == ["m1", "m2"]
+
+    def test_get_workflow_from_any_member(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._task("root", root_id="root"))
+        graph.add_event(self._task("a", root_id="root", parent_id="root"))
+        graph.add_event(self._task("m1", root_id="root", parent_id="a", group_id="g"))
+        graph.add_event(self._task("m2", root_id="root", parent_id="a", group_id="g"))
+        # Parent never arrives; only root_id ties it to the workflow.
+        graph.add_event(self._task("lost", root_id="root", parent_id="missing"))
+        graph.add_event(self._task("other", root_id="other"))
+
+        expected = {"root", "a", "group:g", "m1", "m2", "lost"}
+        for task_id in expected:
+            workflow = graph.get_workflow(task_id)
+            assert workflow[0] == "root"
+            assert sorted(workflow) == sorted(expected)
+        assert graph.get_workflow("other") == ["other"]
+        assert graph.get_workflow("missing") == []
+
+    def test_get_workflow_without_root_ids(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._task("c", root_id=None, parent_id="b"))
+        graph.add_event(self._task("b", root_id=None, parent_id="a"))
+        graph.add_event(self._task("a", root_id=None))
+
+        assert graph.get_workflow("c") == ["a", "b", "c"]
+
+    def test_root_id_survives_model_roundtrip(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._task("a", root_id="root"))
+        node = graph.nodes["a"].to_model()
+        assert node.root_id == "root"
+        assert NodeRecord.from_model(node).root_id == "root"
+
+
+def _workflow_events(*, with_root_id: bool) -> list[TaskEvent]:
+    """Lifecycle events for root -> (a -> (c -> d), b).
+
+    PENDING events don't know the parent, as with Celery's task_sent.
+    """
+    parents = {"root": None, "a": "root", "b": "root", "c": "a", "d": "c"}
+    events = []
+    for task_id, parent_id in parents.items():
+        for state in (TaskState.PENDING, TaskState.STARTED, TaskState.SUCCESS):
+            events.append(
+                TaskEvent(
+                    task_id=task_id,
+                    name=f"myapp.tasks.{task_id}",
+                    state=state,
+                    timestamp=datetime(2024, 1, 1, tzinfo=UTC),
+                    parent_id=None if state == TaskState.PENDING else parent_id,
+                    root_id="root" if with_root_id else None,
+                )
+            )
+    return events
+
+
+def _structure(graph: TaskGraph) -> tuple[object, ...]:
+    """Order-insensitive view of the graph's shape."""
+    return (
+        set(graph.root_ids),
+        {
+            task_id: (node.parent_id, set(node.children), node.root_id)
+            for task_id, node in graph.nodes.items()
+        },
+        {k: set(v) for k, v in graph._orphans.items()},
+    )
+
+
+def _build(events: list[TaskEvent]) -> TaskGraph:
+    graph = TaskGraph()
+    for event in events:
+        graph.add_event(event)
+    return graph
+
+
+class TestOrphanIndex:
+    """Children that arrive before their parent are linked when it shows up."""
+
+    def _event(self, task_id: str, parent_id: str | None = None) -> TaskEvent:
+        return TaskEvent(
+            task_id=task_id,
+            name="myapp.tasks.step",
+            state=TaskState.STARTED,
+            timestamp=datetime.now(UTC),
+            parent_id=parent_id,
+        )
+
+    def test_orphans_wait_for_parent(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._event("c1", parent_id="p"))
+        graph.add_event(self._event("c2", parent_id="p"))
+        assert graph._orphans == {"p": ["c1", "c2"]}
+
+        graph.add_event(self._event("p"))
+        assert graph.nodes["p"].children == ["c1", "c2"]
+        assert graph._orphans == {}
+
+    def test_removed_orphan_stops_waiting(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._event("c1", parent_id="p"))
+        graph.remove_node("c1")
+        assert graph._orphans == {}
+
+        graph.add_event(self._event("p"))
+        assert graph.nodes["p"].children == []
+
+    def test_reparented_orphan_stops_waiting(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._event("m1", parent_id="p"))
+        assert graph._orphans == {"p": ["m1"]}
+
+        # Group containers re-parent their members
+        graph.add_event(
+            self._event("m1", parent_id="p").model_copy(update={"group_id": "g"})
+        )
+        graph.add_event(
+            self._event("m2", parent_id="p").model_copy(update={"group_id": "g"})
+        )
+        assert graph.nodes["m1"].parent_id == "group:g"
+        # Only the GROUP node waits for the parent now
+        assert graph._orphans == {"p": ["group:g"]}
+
+        graph.add_event(self._event("p"))
+        assert graph.nodes["p"].children == ["group:g"]
+
+    def test_children_wait_again_when_parent_removed(self) -> None:
+        graph = TaskGraph()
+        graph.add_event(self._event("p"))
+        graph.add_event(self._event("c", parent_id="p"))
+
+        graph.remove_node("p")
+        assert graph._orphans == {"p": ["c"]}
+
+        graph.add_event(self._event("p"))
+        assert graph.nodes["p"].children == ["c"]
+
+    def test_add_event_reports_relinking(self) -> None:
+        graph = TaskGraph()
+        assert graph.add_event(self._event("c", parent_id="p")) is False
+        assert graph.add_event(self._event("c", parent_id="p")) is False
+        # p adopts its waiting child
+        assert graph.add_event(self._event("p")) is True
+        assert graph.add_event(self._event("c2", parent_id="p")) is False
+        grouped = self._event("m1", parent_id="p").model_copy(update={"group_id": "g"})
+        assert graph.add_event(grouped) is False
+        # The second member creates the GROUP container, re-parenting m1
+        second = grouped.model_copy(update={"task_id": "m2"})
+        assert graph.add_event(second) is True
+        assert graph.nodes["m1"].parent_id == "group:g"
+        assert graph.add_event(self._event("c2", parent_id="p")) is False
+
+    @pytest.mark.parametrize("with_root_id", [False, True])
+    def test_every_order_of_small_workflow_yields_same_graph(
+        self, with_root_id: bool
+    ) -> None:
+        # root/a/b STARTED plus a and b PENDING (no parent): 6! = 720 orders
+        events = [
+            e
+            for e in _workflow_events(with_root_id=with_root_id)
+            if e.task_id in {"root", "a", "b"} and e.state != TaskState.SUCCESS
+        ]
+        expected = _structure(_build(events))
+        for order in itertools.permutations(events):
+            assert _structure(_build(list(order))) == expected
+
+    @pytest.mark.parametrize("with_root_id", [False, True])
+    @pytest.mark.parametrize("seed", range(50))
+    def test_shuffled_workflow_yields_same_graph(
+        self, seed: int, with_root_id: bool
+    ) -> None:
+        events = _workflow_events(with_root_id=with_root_id)
+        expected = _structure(_build(events))
+
+        shuffled = list(events)
+        random.Random(seed).shuffle(shuffled)
+        assert _structure(_build(shuffled)) == expected
+        assert expected[0] == {"root"}
+        assert expected[2] == {}
+
+
+def _celery_like_events(seed: int, workflows: int = 15) -> list[TaskEvent]:
+    """Workflows with plain children, groups and chords, lightly reordered.
+
+    PENDING events lack the parent; STARTED and later events carry it. Some
+    workflows are shuffled, so parents, groups and callbacks arrive late.
+    """
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1, tzinfo=UTC)
+    events: list[TaskEvent] = []
+    for w in range(workflows):
+        root = f"wf{w}"
+        # task_id -> (parent_id, group_id, chord_callback_id)
+        tasks: dict[str, tuple[str | None, str | None, str | None]] = {
+            root: (None, None, None)
+        }
+        for c in range(rng.randrange(3)):
+            tasks[f"{root}-c{c}"] = (root, None, None)
+        if rng.random() < 0.6:
+            parent = root if rng.random() < 0.8 else None
+            for m in range(rng.randrange(1, 4)):
+                tasks[f"{root}-g{m}"] = (parent, f"{root}-group", None)
+        if rng.random() < 0.5:
+            callback = f"{root}-callback"
+            for h in range(rng.randrange(1, 4)):
+                tasks[f"{root}-h{h}"] = (root, f"{root}-chord", callback)
+            tasks[callback] = (None, None, None)
+
+        workflow: list[TaskEvent] = []
+        for task_id, (parent_id, group_id, callback_id) in tasks.items():
+            outcomes = [TaskState.SUCCESS]
+            if rng.random() < 0.2:
+                outcomes = [TaskState.RETRY, TaskState.STARTED, TaskState.FAILURE]
+            for step, state in enumerate(
+                [TaskState.PENDING, TaskState.STARTED, *outcomes]
+            ):
+                workflow.append(
+                    TaskEvent(
+                        task_id=task_id,
+                        name="myapp.tasks.step",
+                        state=state,
+                        timestamp=base + timedelta(seconds=len(events) + step),
+                        parent_id=None if step == 0 else parent_id,
+                        root_id=root if rng.random() < 0.7 else None,
+                        # Some senders only tag members from STARTED on
+                        group_id=group_id if step or rng.random() < 0.7 else None,
+                        chord_id=group_id if callback_id else None,
+                        chord_callback_id=callback_id if step < 2 else None,
+                    )
+                )
+        if rng.random() < 0.4:
+            rng.shuffle(workflow)
+        events += workflow
+    return events
+
+
+class TestFromEvents:
+    """TaskGraph.from_events builds the same graph as add_event per event.
+
+    The module-level fixture also checks this for every graph built above.
+    """
+
+    @pytest.mark.parametrize("seed", range(40))
+    def test_matches_incremental_build(self, seed: int) -> None:
+        events = _celery_like_events(seed)
+
+        assert _full_state(TaskGraph.from_events(events)) == _full_state(_build(events))
+
+    def test_accepts_any_iterable(self) -> None:
+        events = _celery_like_events(0, workflows=3)
+
+        bulk = TaskGraph.from_events(iter(events))
+
+        assert _full_state(bulk) == _full_state(_build(events))
+
+    def test_chord_state_refreshed_by_later_header_event(self) -> None:
+        header = TaskEvent(
+            task_id="h1",
+            name="myapp.tasks.header",
+            state=TaskState.STARTED,
+            timestamp=datetime(2024, 1, 1, tzinfo=UTC),
+            group_id="g",
+            chord_id="g",
+            chord_callback_id="cb",
+        )
+        # The CHORD is created PENDING; the next header event refreshes it
+        events = [header, header.model_copy(update={"chord_callback_id": None})]
+
+        bulk = TaskGraph.from_events(events)
+
+        assert bulk.nodes["group:g"].state == TaskState.STARTED
+        assert _full_state(bulk) == _full_state(_build(events))
+
+    def test_empty_batch(self) -> None:
+        assert _full_state(TaskGraph.from_events([])) == _full_state(TaskGraph())
+
+    def test_result_keeps_ingesting(self) -> None:
+        events = _celery_like_events(1)
+        half = len(events) // 2
+
+        graph = TaskGraph.from_events(events[:half])
+        for event in events[half:]:
+            graph.add_event(event)
+
+        assert _full_state(graph) == _full_state(_build(events))
@@ -0,0 +1,195 @@
+"""Tests for GraphStore secondary indexes."""
+
+import random
+
+import pytest
+
+from stemtrace.core.events import TaskState
+from stemtrace.server.indexes import (
+    NodeIdIndex,
+    SortedKeyList,
+    TaskNameIndex,
+    TrigramIndex,
+)
+
+
+@pytest.fixture
+def small_buckets(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Shrink buckets so a few hundred keys exercise splits and merges."""
+    monkeypatch.setattr(SortedKeyList, "_LOAD", 4)
+
+
+class TestSortedKeyList:
+    def test_empty(self) -> None:
+        keys: SortedKeyList[int] = SortedKeyList()
+        assert len(keys) == 0
+        assert 1 not in keys
+        assert list(keys.descending()) == []
+        assert list(keys.ascending()) == []
+        assert keys.count_at_least(0) == 0
+        keys.discard(1)
+
+    def test_add_and_discard(self) -> None:
+        keys: SortedKeyList[int] = SortedKeyList()
+        for value in (5, 1, 3, 3):
+            keys.add(value)
+
+        assert len(keys) == 4
+        assert list(keys.ascending()) == [1, 3, 3, 5]
+        assert 3 in keys
+
+        keys.discard(3)
+        keys.discard(4)
+        assert list(keys.descending()) == [5, 3, 1]
+
+    @pytest.mark.usefixtures("small_buckets")
+    def test_matches_sorted_list(self) -> None:
+        rng = random.Random(34)
+        keys: SortedKeyList[tuple[int, str]] = SortedKeyList()
+        expected: list[tuple[int, str]] = []
+
+        for step in range(2000):
+            if expected and rng.random() < 0.4:
+                key = expected.pop(rng.randrange(len(expected)))
+                keys.discard(key)
+            else:
+                key = (rng.randrange(200), f"task-{step}")
+                keys.add(key)
+                expected.append(key)
+            expected.sort()
+            assert len(keys) == len(expected)
+
+            if step % 50 == 0:
+                assert list(keys.ascending()) == expected
+                assert list(keys.descending()) == expected[::-1]
+
+        low, high = (50, ""), (150, "~")
+        assert keys.count_at_least(low) == sum(1 for k in expected if k >= low)
+        assert list(keys.descending(low)) == [k for k in reversed(expected) if k >= low]
+        assert list(keys.ascending(low, high)) == [
+            k for k in expected if low <= k <= high
+        ]
+
+    @pytest.mark.usefixtures("small_buckets")
+    def test_descending_offset(self) -> None:
+        keys: SortedKeyList[int] = SortedKeyList()
+        for value in range(50):
+            keys.add(value)
+
+        for offset in (0, 3, 4, 9, 49, 50, 80):
+            assert (
+                list(keys.descending(offset=offset)) == list(range(49, -1, -1))[offset:]
+            )
+        assert list(keys.descending(20, offset=10)) == list(range(39, 19, -1))
+        assert list(keys.descending(45, offset=10)) == []
+
+    @pytest.mark.usefixtures("small_buckets")
+    def test_descending_below(self) -> None:
+        keys: SortedKeyList[int] = SortedKeyList()
+        for value in range(0, 100, 2):
+            keys.add(value)
+        expected = list(range(98, -1, -2))
+
+        for below in (-1, 0, 1, 7, 8, 50, 97, 98, 99, 200):
+            for offset in (0, 1, 5):
+                assert (
+                    list(keys.descending(below=below, offset=offset))
+                    == [k for k in expected if k < below][offset:]
+                ), (below, offset)
+        assert list(keys.descending(40, below=50)) == [48, 46, 44, 42, 40]
+        assert list(keys.descending(60, below=50)) == []
+
+
+class TestNodeIdIndex:
+    def test_add_move_discard(self) -> None:
+        index: NodeIdIndex[str] = NodeIdIndex()
+        assert index.add("PENDING", "a")
+        assert not index.add("PENDING", "b")
+        index.move("PENDING", "SUCCESS", "a")
+
+        assert index.counts() == {"PENDING": 1, "SUCCESS": 1}
+        assert set(index.get("SUCCESS")) == {"a"}
+        assert index.count("FAILURE") == 0
+        assert not index.get("FAILURE")
+
+        assert index.discard("PENDING", "b")
+        assert not index.discard("PENDING", "missing")
+        assert "PENDING" not in index
+        assert list(index) == ["SUCCESS"]
+        assert len(index) == 1
+
+    def test_move_to_same_key_is_noop(self) -> None:
+        index: NodeIdIndex[str] = NodeIdIndex()
+        index.add("k", "a")
+        index.move("k", "k", "a")
+        assert index.counts() == {"k": 1}
+
+
+class TestTaskNameIndex:
+    def test_add_update_discard(self) -> None:
+        index = TaskNameIndex()
+        assert index.add("tests.a", (1, "a-0"), TaskState.STARTED)
+        assert not index.add("tests.a", (2, "a-1"), TaskState.STARTED)
+        assert index.add("tests.b", (3, "b-0"), TaskState.PENDING)
+
+        index.update(
+            "tests.a", ((1, "a-0"), TaskState.STARTED), ((4, "a-0"), TaskState.SUCCESS)
+        )
+        assert index.count("tests.a") == 2
+        assert index.last("tests.a") == (4, "a-0")
+        assert list(index.descending("tests.a")) == [(4, "a-0"), (2, "a-1")]
+        assert list(index.descending("tests.a", (3, ""))) == [(4, "a-0")]
+        assert index.state_counts("tests.a") == {
+            TaskState.STARTED: 1,
+            TaskState.SUCCESS: 1,
+        }
+
+        assert not index.discard("tests.a", (4, "a-0"), TaskState.SUCCESS)
+        assert index.state_counts("tests.a") == {TaskState.STARTED: 1}
+        assert index.discard("tests.b", (3, "b-0"), TaskState.PENDING)
+        assert list(index) == ["tests.a"]
+        assert "tests.b" not in index
+
+    def test_missing_name(self) -> None:
+        index = TaskNameIndex()
+        assert index.count("nope") == 0
+        assert index.last("nope") is None
+        assert index.state_counts("nope") == {}
+        assert list(index.descending("nope")) == []
+        assert not index.discard("nope", (1, "x"), TaskState.STARTED)
+        assert len(index) == 0
+
+
+class TestTrigramIndex:
+    _NAMES = (
+        "myapp.tasks.add",
+        "myapp.tasks.multiply",
+        "otherapp.tasks.Process",
+        "billing.invoices.send_invoice",
+        "ab",
+    )
+
+    def test_matches_substring_scan(self) -> None:
+        index = TrigramIndex()
+        for name in self._NAMES:
+            index.add(name)
+
+        queries = ["", "a", "ab", "app", "TASKS", "process", "send_inv", "xyz"]
+        queries += [name[i:j] for name in self._NAMES for i, j in ((0, 4), (3, 9))]
+        for query in queries:
+            expected = {n for n in self._NAMES if query.lower() in n.lower()}
+            assert index.search(query) == expected, query
+
+    def test_discard(self) -> None:
+        index = TrigramIndex()
+        index.add("myapp.tasks.add")
+        index.add("myapp.tasks.add")
+        index.add("myapp.tasks.multiply")
+        index.discard("myapp.tasks.add")
+        index.discard("never.added")
+
+        assert len(index) == 1
+        assert index.search("tasks") == {"myapp.tasks.multiply"}
+        assert index.search(".add") == set()
+        index.discard("myapp.tasks.multiply")
+        assert index._grams == {}
@@ -181,6 +181,16 @@ class TestInit:
                 prefix: str = "/stemtrace",
                 ttl: int = 86400,
                 max_nodes: int = 10000,
+                max_events_per_node: int | None = None,
+                compact_event_history: bool = False,
+                protect_active_workflows: bool = False,
+                max_memory_bytes: int | None = None,
+                retention_seconds: float | None = None,
+                payload_dir: str | None = None,
+                max_payload_bytes: int | None = None,
+                store_path: str | None = None,
+                snapshot_path: str | None = None,
+                snapshot_interval: float = 60.0,
                 auth_dependency: object = None,
                 form_auth_config: object = None,
                 node_alias_from_arguments: str | None = None,
@@ -193,6 +203,16 @@ class TestInit:
                     prefix,
                     ttl,
                     max_nodes,
+                    max_events_per_node,
+                    compact_event_history,
+                    protect_active_workflows,
+                    max_memory_bytes,
+                    retention_seconds,
+                    payload_dir,
+                    max_payload_bytes,
+                    store_path,
+                    snapshot_path,
+                    snapshot_interval,
                     auth_dependency,
                     form_auth_config,
                     node_alias_from_arguments,
@@ -0,0 +1,224 @@
+"""Tests for latency sketches and the per-name latency index."""
+
+import random
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from stemtrace.core.events import TaskEvent, TaskState
+from stemtrace.server.api.routes import create_api_router
+from stemtrace.server.latency import LatencyIndex, LatencySketch
+from stemtrace.server.store import GraphStore
+
+_BASE = datetime(2024, 1, 1, tzinfo=UTC)
+_HOUR_US = 3600 * 1_000_000
+
+
+def _exact(values: list[float], q: float) -> float:
+    """The sample value at the rank LatencySketch.quantile estimates."""
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+def _event(
+    task_id: str,
+    state: TaskState,
+    seconds: float,
+    *,
+    name: str = "myapp.tasks.process",
+    retries: int = 0,
+) -> TaskEvent:
+    return TaskEvent(
+        task_id=task_id,
+        name=name,
+        state=state,
+        timestamp=_BASE + timedelta(seconds=seconds),
+        retries=retries,
+    )
+
+
+def _run(
+    store: GraphStore,
+    task_id: str,
+    sent: float,
+    wait: float,
+    runtime: float,
+    name: str = "myapp.tasks.process",
+) -> None:
+    """Feed PENDING, STARTED and SUCCESS events for one task."""
+    store.add_event(_event(task_id, TaskState.PENDING, sent, name=name))
+    store.add_event(_event(task_id, TaskState.STARTED, sent + wait, name=name))
+    store.add_event(
+        _event(task_id, TaskState.SUCCESS, sent + wait + runtime, name=name)
+    )
+
+
+class TestLatencySketch:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_quantiles_within_relative_accuracy(self, seed: int) -> None:
+        rng = random.Random(seed)
+        values = [rng.lognormvariate(-3, 2) for _ in range(5000)]
+        sketch = LatencySketch()
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.0, 0.5, 0.95, 0.99, 1.0):
+            estimate = sketch.quantile(q)
+            assert estimate is not None
+            assert estimate == pytest.approx(_exact(values, q), rel=0.0101)
+        assert sketch.count == len(values)
+        assert sketch.minimum == min(values)
+        assert sketch.maximum == max(values)
+
+    def test_merge_equals_single_sketch(self) -> None:
+        rng = random.Random(7)
+        values = [rng.expovariate(2) for _ in range(2000)]
+        whole = LatencySketch()
+        parts = [LatencySketch() for _ in range(4)]
+        for i, value in enumerate(values):
+            whole.add(value)
+            parts[i % 4].add(value)
+        merged = LatencySketch()
+        for part in parts:
+            merged.merge(part)
+
+        assert merged.summary().model_dump() == pytest.approx(
+            whole.summary().model_dump()
+        )
+
+    def test_tiny_and_empty(self) -> None:
+        sketch = LatencySketch()
+        assert sketch.quantile(0.5) is None
+        assert sketch.summary().count == 0
+
+        sketch.add(0.0)
+        sketch.add(2.0)
+        assert sketch.quantile(0.0) == 0.0
+        assert sketch.quantile(1.0) == pytest.approx(2.0, rel=0.01)
+
+    def test_negative_rejected(self) -> None:
+        with pytest.raises(ValueError, match="negative"):
+            LatencySketch().add(-1.0)
+
+
+class TestLatencyIndex:
+    def test_window_drops_old_buckets(self) -> None:
+        index = LatencyIndex(bucket_seconds=3600, buckets=3)
+        for hour in range(5):
+            index.add_runtime("a", hour * _HOUR_US, float(hour + 1))
+        index.add_runtime("b", 0, 1.0)  # before the window
+
+        stats = index.stats()
+        assert list(stats) == ["a"]
+        assert stats["a"].runtime.count == 3
+        assert stats["a"].runtime.minimum == 3.0
+
+    def test_range_selects_buckets(self) -> None:
+        index = LatencyIndex(bucket_seconds=3600, buckets=24)
+        for hour in range(4):
+            index.add_queue_wait("a", hour * _HOUR_US + 10, float(hour + 1))
+
+        stats = index.stats(["a", "missing"], _HOUR_US, 2 * _HOUR_US)
+        assert stats["a"].queue_wait.count == 2
+        assert stats["a"].queue_wait.maximum == 3.0
+        assert stats["a"].runtime.count == 0
+        assert stats["missing"].queue_wait.p50 is None
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [({"bucket_seconds": 0}, "bucket_seconds"), ({"buckets": 0}, "buckets")],
+    )
+    def test_invalid_options(self, kwargs: dict, match: str) -> None:
+        with pytest.raises(ValueError, match=match):
+            LatencyIndex(**kwargs)
+
+
+class TestStoreLatency:
+    def test_runtime_and_queue_wait(self) -> None:
+        store = GraphStore()
+        for i in range(100):
+            _run(store, f"t{i}", sent=i * 10, wait=0.5, runtime=1 + i / 100)
+
+        stats = store.get_latency_stats()["myapp.tasks.process"]
+        assert stats.runtime.count == 100
+        assert stats.runtime.p50 == pytest.approx(1.49, rel=0.011)
+        assert stats.runtime.p99 == pytest.approx(1.98, rel=0.011)
+        assert stats.queue_wait.count == 100
+        assert stats.queue_wait.p95 == pytest.approx(0.5, rel=0.011)
+
+    def test_retries_count_runtime_only(self) -> None:
+        store = GraphStore()
+        store.add_event(_event("t", TaskState.PENDING, 0))
+        store.add_event(_event("t", TaskState.STARTED, 1))
+        store.add_event(_event("t", TaskState.RETRY, 3))
+        store.add_event(_event("t", TaskState.PENDING, 4, retries=1))
+        store.add_event(_event("t", TaskState.STARTED, 10, retries=1))
+        store.add_event(_event("t", TaskState.FAILURE, 12, retries=1))
+
+        stats = store.get_latency_stats()["myapp.tasks.process"]
+        assert stats.queue_wait.count == 1
+        assert stats.queue_wait.maximum == 1.0
+        assert stats.runtime.count == 1
+        assert stats.runtime.maximum == 2.0
+
+    def test_started_without_queued_event_has_no_wait(self) -> None:
+        store = GraphStore()
+        store.add_event(_event("t", TaskState.STARTED, 0))
+        store.add_event(_event("t", TaskState.SUCCESS, 5))
+
+        stats = store.get_latency_stats()["myapp.tasks.process"]
+        assert stats.queue_wait.count == 0
+        assert stats.runtime.maximum == 5.0
+
+    def test_survives_eviction(self) -> None:
+        store = GraphStore(max_nodes=10)
+        for i in range(50):
+            _run(store, f"t{i}", sent=i * 10, wait=1, runtime=2)
+
+        assert store.node_count <= 10
+        stats = store.get_latency_stats(["myapp.tasks.process"])
+        assert stats["myapp.tasks.process"].runtime.count == 50
+
+    def test_date_range(self) -> None:
+        store = GraphStore()
+        _run(store, "early", sent=0, wait=1, runtime=1)
+        _run(store, "late", sent=7200, wait=1, runtime=3)
+
+        stats = store.get_latency_stats(
+            from_date=_BASE + timedelta(hours=2),
+            to_date=_BASE + timedelta(hours=3),
+        )
+        assert stats["myapp.tasks.process"].runtime.count == 1
+        assert stats["myapp.tasks.process"].runtime.maximum == 3.0
+
+
+def test_latency_endpoint() -> None:
+    store = GraphStore()
+    _run(store, "a", sent=0, wait=0.25, runtime=2, name="tasks.b")
+    _run(store, "b", sent=0, wait=0.25, runtime=2, name="tasks.a")
+    app = FastAPI()
+    app.include_router(create_api_router(store))
+    client = TestClient(app)
+
+    data = client.get("/api/stats/latency").json()
+    assert data["total"] == 2
+    assert [t["name"] for t in data["tasks"]] == ["tasks.a", "tasks.b"]
+    runtime = data["tasks"][0]["runtime"]
+    assert runtime["count"] == 1
+    assert runtime["p50_ms"] == pytest.approx(2000)
+    assert data["tasks"][0]["queue_wait"]["max_ms"] == pytest.approx(250)
+
+    data = client.get(
+        "/api/stats/latency", params={"name": ["tasks.a", "tasks.c"]}
+    ).json()
+    assert [t["name"] for t in data["tasks"]] == ["tasks.a", "tasks.c"]
+    assert data["tasks"][1]["runtime"] == {
+        "count": 0,
+        "mean_ms": None,
+        "min_ms": None,
+        "max_ms": None,
+        "p50_ms": None,
+        "p95_ms": None,
+        "p99_ms": None,
+    }
@@ -0,0 +1,240 @@
+"""Tests for memory-mapped payload segments and stores that spill to them."""
+
+import pickle
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from stemtrace.core.event_log import EventLog
+from stemtrace.core.events import TaskEvent, TaskState
+from stemtrace.server.fastapi.extension import StemtraceExtension
+from stemtrace.server.payload_segments import PayloadSegmentLog
+from stemtrace.server.snapshot import capture_snapshot, restore_snapshot
+from stemtrace.server.store import GraphStore
+
+_BASE = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _events(count: int, payload_size: int = 200) -> list[TaskEvent]:
+    events: list[TaskEvent] = []
+    for i in range(count):
+        task_id = f"task-{i}"
+        events.append(
+            TaskEvent(
+                task_id=task_id,
+                name="myapp.tasks.process",
+                state=TaskState.STARTED,
+                timestamp=_BASE + timedelta(seconds=2 * i),
+                args=[i, "x" * payload_size],
+                kwargs={"n": i},
+            )
+        )
+        events.append(
+            TaskEvent(
+                task_id=task_id,
+                name="myapp.tasks.process",
+                state=TaskState.SUCCESS,
+                timestamp=_BASE + timedelta(seconds=2 * i + 1),
+                result={"value": "y" * payload_size},
+            )
+        )
+    return events
+
+
+def _fill(store: GraphStore, events: list[TaskEvent]) -> GraphStore:
+    for event in events:
+        store.add_event(event)
+    return store
+
+
+@pytest.fixture
+def segments(tmp_path: Path) -> Path:
+    return tmp_path / "payloads"
+
+
+class TestPayloadSegmentLog:
+    def test_round_trip_and_rollover(self, segments: Path) -> None:
+        log = PayloadSegmentLog(segments, segment_bytes=1024)
+        payloads = [([i, "x" * 300], None, None, None, None) for i in range(10)]
+        refs = [log.store_payload(payload) for payload in payloads]
+
+        assert [log.load_payload(ref) for ref in refs] == payloads
+        assert log.segment_count > 1
+        assert len(list(log.directory.iterdir())) == log.segment_count
+        assert refs[0].has_arguments
+
+    def test_oversized_payload_gets_own_segment(self, segments: Path) -> None:
+        log = PayloadSegmentLog(segments, segment_bytes=64)
+        payload = (None, None, "r" * 1000, None, None)
+        ref = log.store_payload(payload)
+
+        assert log.load_payload(ref) == payload
+        assert not ref.has_arguments
+
+    def test_budget_drops_oldest_segments(self, segments: Path) -> None:
+        log = PayloadSegmentLog(segments, segment_bytes=1024, max_bytes=2048)
+        refs = [
+            log.store_payload(([i, "x" * 300], None, None, None, None))
+            for i in range(20)
+        ]
+
+        assert log.nbytes <= 2048 + 1024
+        assert log.load_payload(refs[0]) is None
+        assert log.load_payload(refs[-1]) is not None
+        assert len(list(log.directory.iterdir())) == log.segment_count
+
+    def test_close_deletes_files(self, segments: Path) -> None:
+        log = PayloadSegmentLog(segments)
+        ref = log.store_payload(([1], None, None, None, None))
+        log.close()
+
+        assert list(segments.iterdir()) == []
+        assert log.load_payload(ref) is None
+
+    def test_logs_sharing_a_directory_keep_their_own_files(
+        self, segments: Path
+    ) -> None:
+        segments.mkdir()
+        (segments / "keep.txt").write_text("unrelated")
+        first = PayloadSegmentLog(segments)
+        ref = first.store_payload(([1], None, None, None, None))
+
+        second = PayloadSegmentLog(segments)
+        second.store_payload(([2], None, None, None, None))
+        second.close()
+
+        assert first.directory != second.directory
+        assert first.load_payload(ref) == ([1], None, None, None, None)
+        first.close()
+        assert [p.name for p in segments.iterdir()] == ["keep.txt"]
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [
+            ({"segment_bytes": 0}, "segment_bytes"),
+            ({"max_bytes": -1}, "max_bytes"),
+        ],
+    )
+    def test_invalid_options(self, segments: Path, kwargs: dict, match: str) -> None:
+        with pytest.raises(ValueError, match=match):
+            PayloadSegmentLog(segments, **kwargs)
+
+
+class TestSpilledEventLog:
+    def test_spill_keeps_events_and_lowers_estimate(self, segments: Path) -> None:
+        events = _events(1)
+        log = EventLog(events)
+        before = log.nbytes
+
+        payloads = PayloadSegmentLog(segments)
+        for row in range(len(log)):
+            log.spill_payload(row, payloads)
+
+        assert log == events
+        assert log.nbytes < before
+        assert log.has_arguments(0)
+        assert not log.has_arguments(1)
+
+    def test_pickle_inlines_spilled_payloads(self, segments: Path) -> None:
+        events = _events(2)
+        payloads = PayloadSegmentLog(segments)
+        log = EventLog(events)
+        for row in range(len(log)):
+            log.spill_payload(row, payloads)
+
+        data = pickle.dumps(log)
+        payloads.close()
+        restored = pickle.loads(data)
+
+        assert restored == events
+        assert restored.nbytes > log.nbytes
+
+
+class TestStoreWithPayloadSegments:
+    def test_events_read_back_with_payloads(self, segments: Path) -> None:
+        events = _events(50)
+        spilled = _fill(GraphStore(payload_dir=segments), events)
+        inline = _fill(GraphStore(), events)
+
+        assert spilled.estimated_bytes < inline.estimated_bytes
+        for i in (0, 25, 49):
+            node = spilled.get_node(f"task-{i}")
+            expected = inline.get_node(f"task-{i}")
+            assert node is not None
+            assert expected is not None
+            assert node.model_dump() == expected.model_dump()
+
+    def test_dropped_segments_lose_payloads_only(self, segments: Path) -> None:
+        store = GraphStore(payload_dir=segments, max_payload_bytes=1)
+        # Small segments, so the budget has old ones to drop
+        store._payloads = PayloadSegmentLog(segments, segment_bytes=1024, max_bytes=1)
+        events = _events(20)
+        _fill(store, events)
+
+        oldest = store.get_node("task-0")
+        assert oldest is not None
+        assert [e.state for e in oldest.events] == [
+            TaskState.STARTED,
+            TaskState.SUCCESS,
+        ]
+        assert oldest.events[0].args is None
+        newest = store.get_node("task-19")
+        assert newest is not None
+        assert newest.events[-1].result == events[-1].result
+
+    def test_compaction_with_spilled_rows(self, segments: Path) -> None:
+        store = GraphStore(payload_dir=segments, compact_event_history=True)
+        retry = TaskEvent(
+            task_id="task-0",
+            name="myapp.tasks.process",
+            state=TaskState.RETRY,
+            timestamp=_BASE + timedelta(seconds=1),
+            exception="boom " * 20,
+        )
+        started, success = _events(1)
+        for event in (started, retry, success.model_copy(update={"retries": 1})):
+            store.add_event(event)
+
+        node = store.get_node("task-0")
+        assert node is not None
+        # The args anchor survives compaction, the intermediate retry does not
+        assert node.events[0].args == started.args
+        assert node.events[1].exception is None
+        assert node.events[2].result == success.result
+
+    def test_snapshot_round_trip_respills(self, tmp_path: Path) -> None:
+        events = _events(10)
+        original = _fill(GraphStore(payload_dir=tmp_path / "a"), events)
+        snapshot = pickle.loads(pickle.dumps(capture_snapshot(original)))
+        original.close()
+
+        restored = GraphStore(payload_dir=tmp_path / "b")
+        restore_snapshot(snapshot, restored)
+
+        node = restored.get_node("task-3")
+        assert node is not None
+        assert list(node.events) == events[6:8]
+        assert (
+            restored.estimated_bytes
+            == _fill(GraphStore(payload_dir=tmp_path / "c"), events).estimated_bytes
+        )
+
+    def test_close_removes_segment_files(self, segments: Path) -> None:
+        store = _fill(GraphStore(payload_dir=segments), _events(5))
+        assert any(segments.iterdir())
+
+        store.close()
+
+        assert list(segments.iterdir()) == []
+
+    def test_budget_requires_directory(self) -> None:
+        with pytest.raises(ValueError, match="payload_dir"):
+            GraphStore(max_payload_bytes=1024)
+
+
+def test_extension_rejects_payload_dir_with_store_path(segments: Path) -> None:
+    with pytest.raises(ValueError, match="store_path"):
+        StemtraceExtension(
+            "memory://", payload_dir=str(segments), store_path="history.db"
+        )
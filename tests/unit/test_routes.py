@@ -73,6 +73,7 @@ class TestHealthEndpoint:
         data = response.json()
         assert data["status"] == "ok"
         assert data["node_count"] == 0
+        assert data["state_counts"] == {}
 
     def test_health_with_consumer_and_ws(self, store: GraphStore) -> None:
         mock_consumer = MagicMock()
@@ -94,6 +95,30 @@ class TestHealthEndpoint:
         assert data["consumer_running"] is True
         assert data["websocket_connections"] == 5
 
+    def test_health_state_counts(
+        self, client: TestClient, store: GraphStore, make_event: type
+    ) -> None:
+        store.add_event(make_event.create("task-1", state=TaskState.FAILURE))
+        store.add_event(make_event.create("task-2", state=TaskState.FAILURE))
+        store.add_event(make_event.create("task-3", state=TaskState.SUCCESS))
+
+        data = client.get("/api/health").json()
+        assert data["state_counts"] == {"FAILURE": 2, "SUCCESS": 1}
+
+    def test_health_memory_estimate(self, store: GraphStore, make_event: type) -> None:
+        budget_store = GraphStore(max_memory_bytes=1024**3)
+        app = FastAPI()
+        app.include_router(create_api_router(budget_store))
+        client = TestClient(app)
+
+        data = client.get("/api/health").json()
+        assert data["estimated_memory_bytes"] == 0
+        assert data["max_memory_bytes"] == 1024**3
+
+        budget_store.add_event(make_event.create("task-1"))
+        data = client.get("/api/health").json()
+        assert data["estimated_memory_bytes"] == budget_store.estimated_bytes > 0
+
 
 class TestTaskListEndpoint:
     def test_list_tasks_empty(self, client: TestClient) -> None:
@@ -139,6 +164,44 @@ class TestTaskListEndpoint:
 
         assert data["offset"] == 5
 
+    def test_list_tasks_cursor_pages_are_stable(
+        self, client: TestClient, store: GraphStore, make_event: type
+    ) -> None:
+        for i in range(7):
+            store.add_event(make_event.create(f"task-{i}"))
+
+        first = client.get("/api/tasks?limit=3").json()
+        assert [t["task_id"] for t in first["tasks"]] == ["task-6", "task-5", "task-4"]
+
+        # New tasks arriving between requests don't shift the next page
+        store.add_event(make_event.create("task-7"))
+        second = client.get(f"/api/tasks?limit=3&cursor={first['next_cursor']}").json()
+        assert [t["task_id"] for t in second["tasks"]] == ["task-3", "task-2", "task-1"]
+        assert second["total"] == 8
+
+        third = client.get(f"/api/tasks?limit=3&cursor={second['next_cursor']}").json()
+        assert [t["task_id"] for t in third["tasks"]] == ["task-0"]
+        assert third["next_cursor"] is None
+
+    def test_list_tasks_cursor_with_filter(
+        self, client: TestClient, store: GraphStore, make_event: type
+    ) -> None:
+        for i in range(6):
+            state = TaskState.SUCCESS if i % 2 else TaskState.FAILURE
+            store.add_event(make_event.create(f"task-{i}", state))
+
+        first = client.get("/api/tasks?state=SUCCESS&limit=2").json()
+        cursor = first["next_cursor"]
+        second = client.get(f"/api/tasks?state=SUCCESS&limit=2&cursor={cursor}").json()
+        assert [t["task_id"] for t in second["tasks"]] == ["task-1"]
+        assert second["total"] == 3
+
+    @pytest.mark.parametrize("cursor", ["not-base64!", "bnVsbA", "WzEsMl0"])
+    def test_list_tasks_invalid_cursor(self, client: TestClient, cursor: str) -> None:
+        response = client.get(f"/api/tasks?cursor={cursor}")
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
     def test_list_tasks_filter_by_state(
         self, client: TestClient, store: GraphStore, make_event: type
     ) -> None:
@@ -176,6 +239,22 @@ class TestTaskDetailEndpoint:
         data = response.json()
         assert data["task"]["task_id"] == "task-1"
 
+    def test_get_task_includes_root_id(
+        self, client: TestClient, store: GraphStore
+    ) -> None:
+        store.add_event(
+            TaskEvent(
+                task_id="task-1",
+                name="tests.step",
+                state=TaskState.STARTED,
+                timestamp=datetime(2024, 1, 1, tzinfo=UTC),
+                root_id="workflow-root",
+            )
+        )
+
+        response = client.get("/api/tasks/task-1")
+        assert response.json()["task"]["root_id"] == "workflow-root"
+
     def test_get_task_not_found(self, client: TestClient) -> None:
         response = client.get("/api/tasks/nonexistent")
         assert response.status_code == 404
@@ -238,6 +317,35 @@ class TestGraphListEndpoint:
         assert "root-2" in root_ids
         assert "child" not in root_ids
 
+    def test_list_graphs_cursor(
+        self, client: TestClient, store: GraphStore, make_event: type
+    ) -> None:
+        for i in range(5):
+            store.add_event(make_event.create(f"root-{i}"))
+        for idx in range(2):
+            store.add_event(
+                TaskEvent(
+                    task_id=f"member-{idx}",
+                    name="tests.member",
+                    state=TaskState.STARTED,
+                    timestamp=datetime(2024, 1, 1, 0, 0, 4, 500 + idx, tzinfo=UTC),
+                    group_id="g1",
+                )
+            )
+
+        seen: list[str] = []
+        cursor = None
+        while True:
+            url = "/api/graphs?limit=2" + (f"&cursor={cursor}" if cursor else "")
+            data = client.get(url).json()
+            seen += [g["task_id"] for g in data["graphs"]]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == ["root-4", "group:g1", "root-3", "root-2", "root-1", "root-0"]
+        assert client.get("/api/graphs?cursor=%%%").status_code == 400
+
 
 class TestGraphDetailEndpoint:
     def test_get_graph(
@@ -387,6 +495,21 @@ class TestTaskRegistryEndpoint:
         assert task["last_run"] is not None
         assert "2024" in task["last_run"]  # Year from base_time
 
+    def test_registry_includes_outcome_counts(
+        self, client: TestClient, store: GraphStore, make_event: type
+    ) -> None:
+        """Registry reports success and failure counts per task name."""
+        name = "myapp.tasks.process"
+        for i, state in enumerate(
+            (TaskState.SUCCESS, TaskState.SUCCESS, TaskState.FAILURE, TaskState.STARTED)
+        ):
+            store.add_event(make_event.create(f"task-{i}", state, name=name))
+
+        task = client.get("/api/tasks/registry").json()["tasks"][0]
+        assert task["execution_count"] == 4
+        assert task["success_count"] == 2
+        assert task["failure_count"] == 1
+
     def test_registry_includes_status(
         self, client: TestClient, store: GraphStore, make_event: type
     ) -> None:
@@ -458,6 +581,28 @@ class TestTaskRegistryWithWorkers:
         assert task["status"] == "active"
         assert "worker-1" in task["registered_by"]
 
+    def test_registry_query_matches_observed_and_registered(
+        self, store: GraphStore, make_event: type
+    ) -> None:
+        worker_registry = WorkerRegistry()
+        worker_registry.register_worker(
+            hostname="worker-1",
+            pid=12345,
+            tasks=["myapp.tasks.Report", "otherapp.tasks.cleanup"],
+        )
+        store.add_event(make_event.create("task-1", name="myapp.tasks.report_daily"))
+        store.add_event(make_event.create("task-2", name="otherapp.tasks.sync"))
+
+        app = FastAPI()
+        app.include_router(create_api_router(store, worker_registry=worker_registry))
+        client = TestClient(app)
+
+        data = client.get("/api/tasks/registry?query=REPORT").json()
+        assert [t["name"] for t in data["tasks"]] == [
+            "myapp.tasks.Report",
+            "myapp.tasks.report_daily",
+        ]
+
     def test_registry_includes_task_metadata_from_worker_registry(
         self, store: GraphStore, make_event: type
     ) -> None:
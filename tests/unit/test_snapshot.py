@@ -0,0 +1,271 @@
+"""Tests for store snapshots and snapshot-driven consumer restarts."""
+
+import random
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from stemtrace.core.events import TaskEvent, TaskState, WorkerEvent, WorkerEventType
+from stemtrace.library.transports.memory import MemoryTransport
+from stemtrace.server.consumer import EventConsumer
+from stemtrace.server.fastapi.extension import StemtraceExtension
+from stemtrace.server.snapshot import (
+    capture_snapshot,
+    read_snapshot,
+    restore_snapshot,
+    write_snapshot,
+)
+from stemtrace.server.sqlite_store import SqliteGraphStore
+from stemtrace.server.store import GraphStore, WorkerRegistry
+
+_BASE = datetime(2024, 1, 1, tzinfo=UTC)
+_NAMES = ("myapp.tasks.add", "myapp.tasks.mul", "billing.send_invoice")
+
+
+def _workload(seed: int, workflows: int = 30, start: int = 0) -> list[TaskEvent]:
+    """Workflows of a root, children, sometimes a group, some children first."""
+    rng = random.Random(seed)
+    events: list[TaskEvent] = []
+    clock = start
+    for w in range(start, start + workflows):
+        root = f"wf{w}"
+        tasks: list[tuple[str, str | None, str | None]] = [(root, None, None)]
+        tasks += [(f"{root}-c{c}", root, None) for c in range(rng.randrange(3))]
+        if rng.random() < 0.5:
+            tasks += [(f"{root}-m{m}", root, f"g{w}") for m in range(3)]
+        if rng.random() < 0.3:
+            tasks.reverse()  # children before their parent (orphan index)
+        for task_id, parent_id, group_id in tasks:
+            name = rng.choice(_NAMES)
+            for state in (TaskState.STARTED, TaskState.SUCCESS):
+                clock += 1
+                events.append(
+                    TaskEvent(
+                        task_id=task_id,
+                        name=name,
+                        state=state,
+                        timestamp=_BASE + timedelta(seconds=clock),
+                        parent_id=parent_id,
+                        root_id=root,
+                        group_id=group_id,
+                    )
+                )
+    return events
+
+
+def _dump(store: GraphStore) -> dict:
+    nodes, _ = store.get_nodes(limit=10_000)
+    roots, _ = store.get_root_nodes(limit=10_000)
+    return {
+        "nodes": [n.model_dump() for n in nodes],
+        "roots": [r.task_id for r in roots],
+        "graphs": {
+            r.task_id: sorted(store.get_graph_from_root(r.task_id)) for r in roots
+        },
+        "names": store.get_task_name_stats(),
+        "states": store.get_state_counts(),
+        "bytes": store.estimated_bytes,
+        "count": store.node_count,
+    }
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path / "store.snapshot"
+
+
+class TestSnapshotRoundTrip:
+    def test_restored_store_matches_and_keeps_ingesting(self, path: Path) -> None:
+        original = GraphStore(max_nodes=10_000)
+        for event in _workload(1):
+            original.add_event(event)
+        write_snapshot(capture_snapshot(original, checkpoint="42-0"), path)
+
+        snapshot = read_snapshot(path)
+        restored = GraphStore(max_nodes=10_000)
+        restore_snapshot(snapshot, restored)
+
+        assert snapshot.checkpoint == "42-0"
+        assert _dump(restored) == _dump(original)
+        assert list(path.parent.iterdir()) == [path]
+
+        # The graph's group/workflow/orphan indexes came along intact
+        for event in _workload(2, workflows=10, start=30):
+            original.add_event(event)
+            restored.add_event(event)
+        assert _dump(restored) == _dump(original)
+
+    def test_snapshot_is_detached_from_store(self, path: Path) -> None:
+        store = GraphStore()
+        events = _workload(3, workflows=5)
+        for event in events[:-1]:
+            store.add_event(event)
+        snapshot = capture_snapshot(store)
+        store.add_event(events[-1])
+
+        write_snapshot(snapshot, path)
+        restored = GraphStore()
+        restore_snapshot(read_snapshot(path), restored)
+
+        assert restored.node_count == store.node_count
+        last = restored.get_node(events[-1].task_id)
+        assert last is not None
+        assert len(last.events) == 1
+
+    def test_restore_applies_capacity(self, path: Path) -> None:
+        original = GraphStore(max_nodes=10_000)
+        for event in _workload(4):
+            original.add_event(event)
+        write_snapshot(capture_snapshot(original), path)
+
+        restored = GraphStore(max_nodes=20)
+        restore_snapshot(read_snapshot(path), restored)
+
+        assert restored.node_count <= 20
+        newest, _ = original.get_nodes(limit=1)
+        assert restored.get_node(newest[0].task_id) is not None
+
+    def test_worker_registry_round_trip(self, path: Path) -> None:
+        registry = WorkerRegistry()
+        registry.register_worker("host", 10, ["myapp.tasks.add"])
+        registry.register_worker("host", 11, ["myapp.tasks.mul"])
+        registry.mark_shutdown("host", 11)
+        write_snapshot(capture_snapshot(GraphStore(), registry), path)
+
+        restored = WorkerRegistry()
+        restore_snapshot(read_snapshot(path), GraphStore(), restored)
+
+        assert [w.model_dump() for w in restored.get_all_workers()] == [
+            w.model_dump() for w in registry.get_all_workers()
+        ]
+
+    @pytest.mark.parametrize(
+        ("content", "match"),
+        [
+            (b"", "not a stemtrace snapshot"),
+            (b"PK\x03\x04 something else", "not a stemtrace snapshot"),
+            (b"STEMTRACE-SNAPSHOT\x00\x63", "format 99"),
+        ],
+    )
+    def test_rejects_foreign_files(
+        self, path: Path, content: bytes, match: str
+    ) -> None:
+        path.write_bytes(content)
+        with pytest.raises(ValueError, match=match):
+            read_snapshot(path)
+
+    def test_rejects_truncated_file(self, path: Path) -> None:
+        store = GraphStore()
+        for event in _workload(5):
+            store.add_event(event)
+        write_snapshot(capture_snapshot(store), path)
+        path.write_bytes(path.read_bytes()[:-100])
+
+        with pytest.raises(ValueError, match="truncated or corrupt"):
+            read_snapshot(path)
+
+
+def _run_until_drained(consumer: EventConsumer) -> None:
+    consumer.start()
+    deadline = time.monotonic() + 5
+    while consumer.is_running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    consumer.stop(timeout=1.0)
+
+
+class TestConsumerSnapshots:
+    @pytest.fixture(autouse=True)
+    def _clear_memory_transport(self) -> None:
+        MemoryTransport.clear()
+
+    def test_restart_restores_and_resumes_after_checkpoint(self, path: Path) -> None:
+        first = _workload(6, workflows=10)
+        later = _workload(7, workflows=5, start=10)
+        worker = WorkerEvent(
+            event_type=WorkerEventType.WORKER_READY,
+            hostname="host",
+            pid=10,
+            timestamp=datetime.now(UTC),
+            registered_tasks=list(_NAMES),
+        )
+        MemoryTransport.events.extend([worker, *first])
+        store, registry = GraphStore(), WorkerRegistry()
+        _run_until_drained(
+            EventConsumer(
+                "memory://", store, worker_registry=registry, snapshot_path=path
+            )
+        )
+        assert path.exists()
+
+        MemoryTransport.events.extend(later)
+        restarted, restarted_registry = GraphStore(), WorkerRegistry()
+        consumer = EventConsumer(
+            "memory://",
+            restarted,
+            worker_registry=restarted_registry,
+            snapshot_path=path,
+        )
+        _run_until_drained(consumer)
+
+        # Only the events published after the snapshot were consumed again
+        assert _dump(restarted) == _dump(_replay([*first, *later]))
+        assert restarted_registry.get_worker("host", 10) is not None
+        assert consumer.checkpoint == str(len(MemoryTransport.events))
+
+    def test_periodic_snapshots_during_consumption(self, path: Path) -> None:
+        MemoryTransport.events.extend(_workload(8, workflows=5))
+        consumer = EventConsumer(
+            "memory://", GraphStore(), snapshot_path=path, snapshot_interval=1e-6
+        )
+        consumer.start()
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert path.exists()
+        consumer.stop(timeout=1.0)
+
+    def test_unreadable_snapshot_starts_empty(self, path: Path) -> None:
+        path.write_bytes(b"garbage")
+        MemoryTransport.events.extend(_workload(9, workflows=2))
+        store = GraphStore()
+
+        _run_until_drained(EventConsumer("memory://", store, snapshot_path=path))
+
+        assert _dump(store) == _dump(_replay(MemoryTransport.events))
+        assert read_snapshot(path).checkpoint == str(len(MemoryTransport.events))
+
+    def test_invalid_interval(self) -> None:
+        with pytest.raises(ValueError, match="snapshot_interval"):
+            EventConsumer("memory://", GraphStore(), snapshot_interval=0)
+
+    def test_rejected_for_sqlite_store(self, path: Path, tmp_path: Path) -> None:
+        store = SqliteGraphStore(tmp_path / "history.db")
+        try:
+            with pytest.raises(ValueError, match="SqliteGraphStore"):
+                EventConsumer("memory://", store, snapshot_path=path)
+        finally:
+            store.close()
+
+
+def _replay(events: list) -> GraphStore:
+    store = GraphStore()
+    for event in events:
+        if isinstance(event, TaskEvent):
+            store.add_event(event)
+    return store
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"store_path": "history.db"}, "store_path"),
+        ({"embedded_consumer": False}, "embedded_consumer"),
+    ],
+)
+def test_extension_rejects_snapshot_combinations(
+    path: Path, kwargs: dict, match: str
+) -> None:
+    with pytest.raises(ValueError, match=match):
+        StemtraceExtension("memory://", snapshot_path=str(path), **kwargs)
@@ -0,0 +1,317 @@
+"""Tests for SqliteGraphStore."""
+
+import contextlib
+import random
+import sqlite3
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from stemtrace.core.events import TaskEvent, TaskState
+from stemtrace.server.fastapi.extension import StemtraceExtension
+from stemtrace.server.sqlite_store import SqliteGraphStore
+from stemtrace.server.store import GraphStore
+
+_BASE = datetime(2024, 1, 1, tzinfo=UTC)
+_NAMES = ("myapp.tasks.add", "myapp.tasks.mul", "billing.send_invoice")
+
+
+def _event(
+    task_id: str,
+    state: TaskState,
+    second: int,
+    *,
+    name: str = "tests.sample",
+    parent_id: str | None = None,
+    root_id: str | None = None,
+    group_id: str | None = None,
+) -> TaskEvent:
+    return TaskEvent(
+        task_id=task_id,
+        name=name,
+        state=state,
+        timestamp=_BASE + timedelta(seconds=second),
+        parent_id=parent_id,
+        root_id=root_id,
+        group_id=group_id,
+    )
+
+
+def _workload(seed: int, workflows: int = 40) -> list[TaskEvent]:
+    """Workflows of a root, a few children and sometimes a group, then late retries."""
+    rng = random.Random(seed)
+    events: list[TaskEvent] = []
+    clock = 0
+    for w in range(workflows):
+        root = f"wf{w}"
+        tasks: list[tuple[str, str | None, str | None]] = [(root, None, None)]
+        tasks += [(f"{root}-c{c}", root, None) for c in range(rng.randrange(4))]
+        if rng.random() < 0.4:
+            tasks += [(f"{root}-m{m}", root, f"g{w}") for m in range(3)]
+        for task_id, parent_id, group_id in tasks:
+            name = rng.choice(_NAMES)
+            for state in (TaskState.STARTED, rng.choice(_OUTCOMES)):
+                clock += 1
+                events.append(
+                    _event(
+                        task_id,
+                        state,
+                        clock,
+                        name=name,
+                        parent_id=parent_id,
+                        root_id=root,
+                        group_id=group_id,
+                    )
+                )
+    # Late retries of early workflows, long evicted from a small cache
+    for w in (0, 1, 5):
+        clock += 1
+        events.append(
+            _event(
+                f"wf{w}-late",
+                TaskState.RETRY,
+                clock,
+                name=_NAMES[0],
+                parent_id=f"wf{w}",
+                root_id=f"wf{w}",
+            )
+        )
+    return events
+
+
+_OUTCOMES = (TaskState.SUCCESS, TaskState.FAILURE)
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    return tmp_path / "stemtrace.db"
+
+
+@pytest.fixture
+def store(db_path: Path) -> Iterator[SqliteGraphStore]:
+    store = SqliteGraphStore(db_path, max_nodes=20, batch_size=7)
+    yield store
+    store.close()
+
+
+def _reference(events: list[TaskEvent]) -> GraphStore:
+    reference = GraphStore(max_nodes=100_000)
+    for event in events:
+        reference.add_event(event)
+    return reference
+
+
+def _ids(page: tuple[list, int]) -> tuple[list[str], int]:
+    nodes, total = page
+    return [node.task_id for node in nodes], total
+
+
+class TestSqliteGraphStoreParity:
+    """A small cache plus disk answers like an unbounded in-memory store."""
+
+    @pytest.fixture
+    def loaded(self, store: SqliteGraphStore) -> tuple[SqliteGraphStore, GraphStore]:
+        events = _workload(7)
+        for event in events:
+            store.add_event(event)
+        assert store.node_count < 40
+        return store, _reference(events)
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            {},
+            {"limit": 10, "offset": 25},
+            {"state": TaskState.FAILURE},
+            {"name_contains": "TASKS"},
+            {"name_contains": "invoice", "state": TaskState.SUCCESS},
+            {"name_contains": "nothing-matches"},
+            {"from_date": _BASE + timedelta(seconds=100)},
+            {"to_date": _BASE + timedelta(seconds=50)},
+            {"before": (_BASE + timedelta(seconds=120), "")},
+        ],
+    )
+    def test_get_nodes(
+        self, loaded: tuple[SqliteGraphStore, GraphStore], query: dict
+    ) -> None:
+        store, reference = loaded
+        assert _ids(store.get_nodes(**query)) == _ids(reference.get_nodes(**query))
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            {"limit": 100},
+            {"limit": 5, "offset": 3},
+            {"from_date": _BASE + timedelta(seconds=100)},
+            {"to_date": _BASE + timedelta(seconds=50)},
+            {"before": (_BASE + timedelta(seconds=150), "")},
+        ],
+    )
+    def test_get_root_nodes(
+        self, loaded: tuple[SqliteGraphStore, GraphStore], query: dict
+    ) -> None:
+        store, reference = loaded
+        assert _ids(store.get_root_nodes(**query)) == _ids(
+            reference.get_root_nodes(**query)
+        )
+
+    def test_root_workflows(self, loaded: tuple[SqliteGraphStore, GraphStore]) -> None:
+        store, reference = loaded
+        roots, total = store.get_root_workflows(limit=100)
+        expected, expected_total = reference.get_root_workflows(limit=100)
+        assert total == expected_total
+        # Evicted workflows are summarized from their stored rows
+        assert [(r.node.task_id, r.last_updated, r.summary) for r in roots] == [
+            (r.node.task_id, r.last_updated, r.summary) for r in expected
+        ]
+
+    def test_nodes_match_cached_or_not(
+        self, loaded: tuple[SqliteGraphStore, GraphStore]
+    ) -> None:
+        store, reference = loaded
+        nodes, _ = reference.get_nodes(limit=1000)
+        for expected in nodes:
+            node = store.get_node(expected.task_id)
+            assert node is not None
+            # Nodes rebuilt from disk list children in row creation order
+            assert set(node.children) == set(expected.children)
+            assert node.model_dump(exclude={"children"}) == expected.model_dump(
+                exclude={"children"}
+            ), expected.task_id
+            assert {c.task_id for c in store.get_children(expected.task_id)} == {
+                c.task_id for c in reference.get_children(expected.task_id)
+            }
+
+    def test_graphs_match(self, loaded: tuple[SqliteGraphStore, GraphStore]) -> None:
+        store, reference = loaded
+        roots, _ = reference.get_root_nodes(limit=1000)
+        for root in roots:
+            graph = store.get_graph_from_root(root.task_id)
+            expected = reference.get_graph_from_root(root.task_id)
+            assert {k: v.model_dump() for k, v in graph.items()} == {
+                k: v.model_dump() for k, v in expected.items()
+            }
+
+    def test_name_stats(self, loaded: tuple[SqliteGraphStore, GraphStore]) -> None:
+        store, reference = loaded
+        assert store.get_unique_task_names() == reference.get_unique_task_names()
+        assert store.find_task_names("MYAPP") == reference.find_task_names("MYAPP")
+        assert store.get_task_name_stats() == reference.get_task_name_stats()
+        for name in _NAMES:
+            assert store.get_task_execution_count(
+                name
+            ) == reference.get_task_execution_count(name)
+            assert store.get_last_execution_time(
+                name
+            ) == reference.get_last_execution_time(name)
+        assert store.get_task_name_stats(["unknown"])["unknown"].execution_count == 0
+
+    def test_latency_stats(self, loaded: tuple[SqliteGraphStore, GraphStore]) -> None:
+        store, reference = loaded
+        # Workflows reloaded from disk are not counted a second time
+        assert store.get_latency_stats() == reference.get_latency_stats()
+
+    def test_timeseries(self, loaded: tuple[SqliteGraphStore, GraphStore]) -> None:
+        store, reference = loaded
+        assert store.get_timeseries() == reference.get_timeseries()
+        assert store.get_timeseries("hour") == reference.get_timeseries("hour")
+
+    def test_failure_groups(self, loaded: tuple[SqliteGraphStore, GraphStore]) -> None:
+        store, reference = loaded
+        assert store.get_failure_groups() == reference.get_failure_groups()
+
+
+class TestSqliteGraphStoreCache:
+    def test_late_event_reloads_workflow(self, store: SqliteGraphStore) -> None:
+        events = [e for e in _workload(3, workflows=20) if "late" not in e.task_id]
+        for event in events:
+            store.add_event(event)
+        first = events[0]
+        assert first.task_id not in store._graph.nodes
+        count = store.get_task_execution_count(first.name)
+
+        store.add_event(_event(first.task_id, TaskState.RETRY, 10_000, name=first.name))
+
+        # The evicted task's history was reloaded before the new event applied
+        node = store.get_node(first.task_id)
+        assert node is not None
+        assert [e.state for e in node.events][-1] == TaskState.RETRY
+        assert len(node.events) == 3
+        assert node.children
+        assert store.get_task_execution_count(first.name) == count
+
+    def test_reads_see_pending_events(
+        self, store: SqliteGraphStore, db_path: Path
+    ) -> None:
+        store.add_event(_event("a", TaskState.STARTED, 1))
+        with contextlib.closing(sqlite3.connect(db_path)) as conn:
+            assert conn.execute("SELECT count(*) FROM events").fetchone()[0] == 0
+
+        nodes, total = store.get_nodes()
+        assert total == 1
+        assert [n.task_id for n in nodes] == ["a"]
+
+    def test_history_survives_reopen(self, db_path: Path) -> None:
+        store = SqliteGraphStore(db_path)
+        store.add_event(_event("a", TaskState.STARTED, 1, name=_NAMES[0]))
+        store.add_event(_event("b", TaskState.STARTED, 2, parent_id="a"))
+        store.close()
+        store.close()
+
+        reopened = SqliteGraphStore(db_path)
+        try:
+            assert reopened.node_count == 0
+            node = reopened.get_node("a")
+            assert node is not None
+            assert node.children == ["b"]
+            assert reopened.get_task_execution_count(_NAMES[0]) == 1
+
+            # The next event for "a" continues from its stored history
+            reopened.add_event(_event("a", TaskState.SUCCESS, 3, name=_NAMES[0]))
+            assert reopened.node_count == 2
+            stats = reopened.get_task_name_stats([_NAMES[0]])[_NAMES[0]]
+            assert (stats.execution_count, stats.success_count) == (1, 1)
+        finally:
+            reopened.close()
+
+    def test_purge_before(self, store: SqliteGraphStore) -> None:
+        events = _workload(3, workflows=20)
+        for event in events:
+            store.add_event(event)
+        cutoff = _BASE + timedelta(seconds=60)
+        latest: dict[str, datetime] = {}
+        for event in events:
+            latest[event.root_id or ""] = event.timestamp
+        kept = {
+            root
+            for root, timestamp in latest.items()
+            if timestamp >= cutoff or root in store._graph.nodes
+        }
+
+        deleted = store.purge_before(cutoff)
+
+        assert deleted > 0
+        nodes, total = store.get_nodes(limit=1000)
+        assert {n.root_id for n in nodes} == kept
+        assert sum(map(store.get_task_execution_count, _NAMES)) == total
+        assert store.purge_before(cutoff) == 0
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"),
+        [({"batch_size": 0}, "batch_size"), ({"read_connections": 0}, "read_")],
+    )
+    def test_invalid_options(self, db_path: Path, kwargs: dict, match: str) -> None:
+        with pytest.raises(ValueError, match=match):
+            SqliteGraphStore(db_path, **kwargs)
+
+
+def test_extension_store_path(db_path: Path) -> None:
+    extension = StemtraceExtension(
+        "memory://", embedded_consumer=False, store_path=str(db_path), max_nodes=50
+    )
+    try:
+        assert isinstance(extension.store, SqliteGraphStore)
+    finally:
+        extension.store.close()
@@ -0,0 +1,150 @@
+"""Tests for ring-buffered event counters."""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from stemtrace.core.events import TaskEvent, TaskState
+from stemtrace.server.api.routes import create_api_router
+from stemtrace.server.store import GraphStore
+from stemtrace.server.timeseries import CounterRing, TimeseriesIndex
+
+_BASE = datetime(2024, 1, 1, tzinfo=UTC)
+_MINUTE_US = 60_000_000
+_BASE_US = int(_BASE.timestamp()) * 1_000_000
+
+
+def _event(
+    task_id: str, state: TaskState, minutes: float, name: str = "tasks.a"
+) -> TaskEvent:
+    return TaskEvent(
+        task_id=task_id,
+        name=name,
+        state=state,
+        timestamp=_BASE + timedelta(minutes=minutes),
+    )
+
+
+class TestCounterRing:
+    def test_slots_are_reused_by_later_buckets(self) -> None:
+        ring = CounterRing(3)
+        ring.add(1, 0)
+        ring.add(1, 0)
+        ring.add(4, 2)  # same slot as bucket 1
+
+        assert ring.counts(1) == (0, 0, 0, 0, 0)
+        assert ring.counts(4) == (0, 0, 1, 0, 0)
+
+    def test_older_bucket_than_slot_ignored(self) -> None:
+        ring = CounterRing(3)
+        ring.add(4, 1)
+        ring.add(1, 1)
+
+        assert ring.counts(4) == (0, 1, 0, 0, 0)
+        assert ring.counts(1) == (0, 0, 0, 0, 0)
+
+
+class TestTimeseriesIndex:
+    def test_minute_and_hour_windows(self) -> None:
+        index = TimeseriesIndex(minutes=5, hours=2)
+        for minute in range(10):
+            index.add("a", TaskState.STARTED, _BASE_US + minute * _MINUTE_US)
+        index.add("b", TaskState.FAILURE, _BASE_US + 9 * _MINUTE_US)
+        index.add("b", TaskState.PENDING, _BASE_US + 9 * _MINUTE_US)
+
+        window = index.window("minute").to_model()
+        assert [p.timestamp for p in window.overall] == [
+            _BASE + timedelta(minutes=m) for m in range(5, 10)
+        ]
+        assert [p.started for p in window.tasks["a"]] == [1] * 5
+        assert [p.failed for p in window.tasks["b"]] == [0, 0, 0, 0, 1]
+        assert window.overall[-1].started == 1
+        assert window.overall[-1].failed == 1
+
+        hourly = index.window("hour").to_model()
+        assert hourly.interval_seconds == 3600
+        assert [p.started for p in hourly.overall] == [0, 10]
+
+    def test_names_and_end(self) -> None:
+        index = TimeseriesIndex(minutes=3)
+        index.add("a", TaskState.RETRY, _BASE_US)
+
+        window = index.window(
+            "minute", ["a", "missing"], _BASE_US + _MINUTE_US
+        ).to_model()
+        assert [p.retried for p in window.tasks["a"]] == [0, 1, 0]
+        assert [p.retried for p in window.tasks["missing"]] == [0, 0, 0]
+
+    def test_empty(self) -> None:
+        window = TimeseriesIndex().window().to_model()
+        assert window.overall == []
+        assert window.tasks == {}
+
+    @pytest.mark.parametrize(
+        ("kwargs", "match"), [({"minutes": 0}, "minutes"), ({"hours": 0}, "hours")]
+    )
+    def test_invalid_options(self, kwargs: dict, match: str) -> None:
+        with pytest.raises(ValueError, match=match):
+            TimeseriesIndex(**kwargs)
+
+
+class TestStoreTimeseries:
+    def test_counts_survive_eviction(self) -> None:
+        store = GraphStore(max_nodes=5)
+        for i in range(30):
+            store.add_event(_event(f"t{i}", TaskState.STARTED, i / 10))
+            outcome = TaskState.SUCCESS if i % 3 else TaskState.REVOKED
+            store.add_event(_event(f"t{i}", outcome, i / 10 + 0.01))
+
+        assert store.node_count <= 5
+        last = store.get_timeseries().overall[-3:]
+        assert sum(p.started for p in last) == 30
+        assert sum(p.succeeded for p in last) == 20
+        assert sum(p.revoked for p in last) == 10
+
+    def test_to_date(self) -> None:
+        store = GraphStore()
+        store.add_event(_event("early", TaskState.STARTED, 0))
+        store.add_event(_event("late", TaskState.STARTED, 60))
+
+        series = store.get_timeseries(to_date=_BASE + timedelta(minutes=1))
+        assert series.overall[-1].timestamp == _BASE + timedelta(minutes=1)
+        assert series.overall[-2].started == 1
+
+
+def test_timeseries_endpoint() -> None:
+    store = GraphStore()
+    store.add_event(_event("x", TaskState.STARTED, 0, name="tasks.a"))
+    store.add_event(_event("x", TaskState.FAILURE, 0.5, name="tasks.a"))
+    store.add_event(_event("y", TaskState.STARTED, 1, name="tasks.b"))
+    app = FastAPI()
+    app.include_router(create_api_router(store))
+    client = TestClient(app)
+
+    data = client.get("/api/stats/timeseries").json()
+    assert data["resolution"] == "minute"
+    assert data["interval_seconds"] == 60
+    assert len(data["overall"]) == 120
+    assert data["overall"][-2] == {
+        "timestamp": "2024-01-01T00:00:00Z",
+        "started": 1,
+        "succeeded": 0,
+        "failed": 1,
+        "retried": 0,
+        "revoked": 0,
+    }
+    assert set(data["tasks"]) == {"tasks.a", "tasks.b"}
+
+    data = client.get(
+        "/api/stats/timeseries", params={"resolution": "hour", "name": "tasks.b"}
+    ).json()
+    assert len(data["overall"]) == 48
+    assert list(data["tasks"]) == ["tasks.b"]
+    assert data["tasks"]["tasks.b"][-1]["started"] == 1
+
+    assert (
+        client.get("/api/stats/timeseries", params={"resolution": "day"}).status_code
+        == 422
+    )
@@ -109,6 +109,22 @@ class TestMemoryTransport:
 
         assert events == [started_event, success_event]
 
+    def test_consume_resumes_after_position(
+        self,
+        memory_transport: MemoryTransport,
+        started_event: TaskEvent,
+        success_event: TaskEvent,
+    ) -> None:
+        """consume(position) continues after the last event consumed."""
+        memory_transport.publish(started_event)
+        assert list(memory_transport.consume()) == [started_event]
+        position = memory_transport.position
+        assert position == "1"
+
+        memory_transport.publish(success_event)
+
+        assert list(memory_transport.consume(position)) == [success_event]
+
     def test_clear_removes_all_events(
         self,
         memory_transport: MemoryTransport,
@@ -435,6 +451,30 @@ class TestRedisTransport:
         call_args = mock_client.xread.call_args
         assert call_args[0][0] == {"test:events": "1234567890-0"}
 
+    def test_consume_sets_position(
+        self,
+        transport: RedisTransport,
+        mock_client: MagicMock,
+        sample_event: TaskEvent,
+    ) -> None:
+        """position is the ID of the last yielded message; consume() resumes after it."""
+        serialized = sample_event.model_dump_json().encode()
+        mock_client.xread.return_value = [
+            (
+                b"test:events",
+                [
+                    (b"1234567890-0", {b"data": serialized}),
+                    (b"1234567890-1", {b"data": b"not json"}),
+                ],
+            )
+        ]
+        assert transport.position is None
+
+        next(transport.consume("1234567889-0"))
+
+        assert transport.position == "1234567890-0"
+        assert mock_client.xread.call_args[0][0] == {"test:events": "1234567889-0"}
+
     def test_consume_handles_string_message_id(
         self,
         transport: RedisTransport,
@@ -0,0 +1,282 @@
+"""Tests for per-workflow summaries kept at ingestion."""
+
+import random
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from stemtrace.core.events import TaskEvent, TaskState
+from stemtrace.core.graph import NodeType, TaskGraph
+from stemtrace.server.api.routes import create_api_router
+from stemtrace.server.store import GraphStore
+from stemtrace.server.workflows import WorkflowSummary, _climb
+from tests.unit.test_graph import _celery_like_events
+
+_BASE = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _event(
+    task_id: str,
+    state: TaskState,
+    second: int,
+    *,
+    parent_id: str | None = None,
+    root_id: str | None = None,
+    group_id: str | None = None,
+) -> TaskEvent:
+    return TaskEvent(
+        task_id=task_id,
+        name="tests.sample",
+        state=state,
+        timestamp=_BASE + timedelta(seconds=second),
+        parent_id=parent_id,
+        root_id=root_id,
+        group_id=group_id,
+    )
+
+
+def _expected(graph: TaskGraph, root_id: str) -> WorkflowSummary:
+    """Summary counted from scratch: tasks whose climb ends where root_id's does."""
+    nodes = graph.nodes
+    top = _climb(nodes, root_id, {})
+    tasks = [
+        node
+        for node in nodes.values()
+        if node.node_type == NodeType.TASK and _climb(nodes, node.task_id, {}) == top
+    ]
+    return WorkflowSummary.from_counts(
+        root_id,
+        dict(Counter(node.state for node in tasks)),
+        min((node.events.timestamp_us(0) for node in tasks), default=None),
+        max((node.events.timestamp_us(-1) for node in tasks), default=None),
+    )
+
+
+def _relinking_events(seed: int, workflows: int = 6) -> list[TaskEvent]:
+    """Groups and chords whose root is often never sent, arriving shuffled.
+
+    Each workflow's events are shuffled and workflows interleave, so headers
+    regularly move an already-listed callback under a CHORD they don't climb
+    to, and eviction takes workflows apart. Timestamps are random, so a
+    task's latest event may go back in time.
+    """
+    rng = random.Random(seed)
+    streams: list[list[dict]] = []
+    for w in range(workflows):
+        root = f"r{w}"
+        # task_id -> (parent_id, group_id, chord_callback_id)
+        tasks: dict[str, tuple[str | None, str | None, str | None]] = {}
+        if rng.random() < 0.5:
+            tasks[root] = (None, None, None)
+        for m in range(rng.randrange(3)):
+            tasks[f"{root}-m{m}"] = (root, f"{root}-g", None)
+        if rng.random() < 0.7:
+            callback = f"{root}-cb"
+            for h in range(rng.randrange(1, 4)):
+                tasks[f"{root}-h{h}"] = (root, f"{root}-c", callback)
+            tasks[callback] = (root if rng.random() < 0.3 else None, None, None)
+        stream = [
+            {
+                "task_id": task_id,
+                "state": state,
+                "parent_id": parent_id if step else None,
+                "root_id": root if rng.random() < 0.3 else None,
+                "group_id": group_id if step or rng.random() < 0.5 else None,
+                "chord_callback_id": callback_id
+                if step and rng.random() < 0.7
+                else None,
+            }
+            for task_id, (parent_id, group_id, callback_id) in tasks.items()
+            for step, state in enumerate(
+                (TaskState.PENDING, TaskState.STARTED, rng.choice(_OUTCOMES))
+            )
+        ]
+        rng.shuffle(stream)
+        if stream:
+            streams.append(stream)
+    events: list[TaskEvent] = []
+    while streams:
+        stream = rng.choice(streams)
+        seconds = rng.randrange(len(events) + 5)
+        events.append(
+            TaskEvent(
+                name="tests.sample",
+                timestamp=_BASE + timedelta(seconds=seconds),
+                **stream.pop(0),
+            )
+        )
+        if not stream:
+            streams.remove(stream)
+    return events
+
+
+_OUTCOMES = (TaskState.SUCCESS, TaskState.FAILURE)
+
+
+def _summaries(store: GraphStore) -> dict[str, WorkflowSummary | None]:
+    roots, _ = store.get_root_workflows(limit=10_000)
+    return {root.node.task_id: root.summary for root in roots}
+
+
+def _recounted(store: GraphStore) -> dict[str, WorkflowSummary | None]:
+    graph = store._graph
+    return {
+        root_id: _expected(graph, root_id)
+        for root_id in graph.root_ids
+        if root_id in graph.nodes
+    }
+
+
+class TestWorkflowSummaries:
+    @pytest.mark.parametrize("seed", range(12))
+    @pytest.mark.parametrize("kwargs", [{}, {"max_nodes": 30}])
+    def test_incremental_matches_recount(self, seed: int, kwargs: dict) -> None:
+        store = GraphStore(**kwargs)
+        events = _celery_like_events(seed)
+        for i, event in enumerate(events):
+            store.add_event(event)
+            if i % 9 == 0 or i == len(events) - 1:
+                graph = store._graph
+                assert _summaries(store) == {
+                    root_id: _expected(graph, root_id)
+                    for root_id in graph.root_ids
+                    if root_id in graph.nodes
+                }, (seed, i)
+
+    @pytest.mark.parametrize("seed", range(40))
+    @pytest.mark.parametrize("kwargs", [{}, {"max_nodes": 12}])
+    def test_chord_relinks_and_evictions_match_recount(
+        self, seed: int, kwargs: dict
+    ) -> None:
+        store = GraphStore(**kwargs)
+        for i, event in enumerate(_relinking_events(seed)):
+            store.add_event(event)
+            assert _summaries(store) == _recounted(store), (seed, i)
+
+    def test_header_moves_callback_under_chord(self) -> None:
+        store = GraphStore()
+        store.add_event(_event("m1", TaskState.PENDING, 0, group_id="g"))
+        store.add_event(_event("m2", TaskState.PENDING, 1, group_id="g"))
+        store.add_event(_event("cb", TaskState.SUCCESS, 2))
+        assert set(_summaries(store)) == {"group:g", "cb"}
+
+        # The header's parent is absent, so it does not climb to the CHORD
+        # it moves the callback under
+        store.add_event(
+            TaskEvent(
+                task_id="h",
+                name="tests.sample",
+                state=TaskState.STARTED,
+                timestamp=_BASE + timedelta(seconds=3),
+                parent_id="absent",
+                group_id="g",
+                chord_callback_id="cb",
+            )
+        )
+
+        summaries = _summaries(store)
+        assert summaries == _recounted(store)
+        assert summaries["group:g"] is not None
+        assert summaries["group:g"].node_count == 3
+
+    def test_states_span_and_failure(self) -> None:
+        store = GraphStore()
+        store.add_event(_event("r", TaskState.STARTED, 0))
+        store.add_event(_event("c1", TaskState.STARTED, 1, parent_id="r"))
+        store.add_event(_event("c2", TaskState.STARTED, 2, parent_id="r"))
+        store.add_event(_event("c1", TaskState.FAILURE, 5, parent_id="r"))
+        store.add_event(_event("r", TaskState.SUCCESS, 4))
+
+        summary = _summaries(store)["r"]
+        assert summary is not None
+        assert summary.node_count == 3
+        assert summary.state_counts == {
+            TaskState.SUCCESS: 1,
+            TaskState.STARTED: 1,
+            TaskState.FAILURE: 1,
+        }
+        assert summary.first_seen == _BASE
+        assert summary.last_updated == _BASE + timedelta(seconds=5)
+        assert summary.duration_ms == 5000
+        assert summary.has_failure
+
+    def test_late_parent_joins_orphans(self) -> None:
+        store = GraphStore()
+        store.add_event(_event("c", TaskState.SUCCESS, 3, root_id="r"))
+        assert _summaries(store)["c"] is not None
+        store.add_event(_event("r", TaskState.STARTED, 1))
+
+        summaries = _summaries(store)
+        assert list(summaries) == ["r"]
+        assert summaries["r"] is not None
+        assert summaries["r"].node_count == 2
+        assert summaries["r"].first_seen == _BASE + timedelta(seconds=1)
+
+    def test_group_root_takes_workflow_span(self) -> None:
+        store = GraphStore()
+        store.add_event(_event("early", TaskState.SUCCESS, 1))
+        for i in range(2):
+            store.add_event(_event(f"m{i}", TaskState.SUCCESS, 10 + i, group_id="g"))
+        store.add_event(_event("late", TaskState.SUCCESS, 5))
+
+        roots, total = store.get_root_workflows()
+        assert total == 3
+        assert [root.node.task_id for root in roots] == ["group:g", "late", "early"]
+        group = roots[0]
+        assert group.first_seen == _BASE + timedelta(seconds=10)
+        assert group.last_updated == _BASE + timedelta(seconds=11)
+        assert group.summary is not None
+        assert group.summary.node_count == 2
+
+        page, _ = store.get_root_workflows(before=(group.last_updated, "group:g"))
+        assert [root.node.task_id for root in page] == ["late", "early"]
+        dated, _ = store.get_root_workflows(from_date=_BASE + timedelta(seconds=8))
+        assert [root.node.task_id for root in dated] == ["group:g"]
+
+    def test_eviction_and_restore(self) -> None:
+        store = GraphStore(max_nodes=6)
+        for w in range(5):
+            store.add_event(_event(f"r{w}", TaskState.SUCCESS, w * 10))
+            store.add_event(
+                _event(f"r{w}-c", TaskState.SUCCESS, w * 10 + 1, parent_id=f"r{w}")
+            )
+        summaries = _summaries(store)
+        assert set(summaries) == {"r2", "r3", "r4"}
+        assert len(store._workflows) == 3
+
+        restored = GraphStore()
+        restored.restore_graph(store._graph)
+        assert _summaries(restored) == summaries
+
+
+def test_graphs_endpoint_lists_summaries() -> None:
+    store = GraphStore()
+    store.add_event(_event("r", TaskState.STARTED, 0))
+    store.add_event(_event("c", TaskState.FAILURE, 2, parent_id="r"))
+    for i in range(2):
+        store.add_event(_event(f"m{i}", TaskState.SUCCESS, 10 + i, group_id="g"))
+    app = FastAPI()
+    app.include_router(create_api_router(store))
+    client = TestClient(app)
+
+    data = client.get("/api/graphs").json()
+    assert [g["task_id"] for g in data["graphs"]] == ["group:g", "r"]
+    group, root = data["graphs"]
+    assert group["duration_ms"] == 1000
+    assert group["last_updated"] == "2024-01-01T00:00:11Z"
+    assert group["summary"]["node_count"] == 2
+    assert root["summary"] == {
+        "node_count": 2,
+        "state_counts": {"STARTED": 1, "FAILURE": 1},
+        "first_seen": "2024-01-01T00:00:00Z",
+        "last_updated": "2024-01-01T00:00:02Z",
+        "duration_ms": 2000,
+        "has_failure": True,
+    }
+
+    data = client.get("/api/graphs", params={"limit": 1}).json()
+    page = client.get("/api/graphs", params={"cursor": data["next_cursor"]}).json()
+    assert [g["task_id"] for g in page["graphs"]] == ["r"]